@@ -0,0 +1,143 @@
+"""SQLite storage latency across tuning and index presets.
+
+    uv run python benchmarks/storage.py --messages 2000 --reads 500
+
+Each preset gets a fresh database file. Reports p50/p95 per operation in ms.
+`legacy-indexes` re-adds the pre-migration index set to show its insert cost.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from pathlib import Path
+
+from cogency.lib.sqlite import DB, DEFAULT_TUNING, UNTUNED, SQLite, Tuning
+
+LEGACY_INDEXES = """
+    CREATE INDEX idx_messages_type ON messages(type);
+    CREATE INDEX idx_messages_user ON messages(user_id);
+    CREATE INDEX idx_messages_user_type ON messages(user_id, type, timestamp);
+    CREATE INDEX idx_events_conversation ON events(conversation_id, timestamp);
+    CREATE INDEX idx_profiles_user_latest ON profiles(user_id, version DESC);
+"""
+
+PRESETS: dict[str, tuple[Tuning, str]] = {
+    "untuned": (UNTUNED, ""),
+    "default": (DEFAULT_TUNING, ""),
+    "sync-full": (replace(DEFAULT_TUNING, synchronous="FULL"), ""),
+    "no-mmap": (replace(DEFAULT_TUNING, mmap_size=None), ""),
+    "small-cache": (replace(DEFAULT_TUNING, cache_size_kib=2 * 1024, cached_statements=16), ""),
+    "legacy-indexes": (DEFAULT_TUNING, LEGACY_INDEXES),
+}
+
+TYPES = ["user", "think", "call", "result"]  # Most rows in a real store aren't user messages
+WORDS = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dogs", "zebras", "graze"]
+
+
+def _text(i: int) -> str:
+    return " ".join(WORDS[(i + k) % len(WORDS)] for k in range(12)) + f" #{i}"
+
+
+async def _timed(samples: list[float], op: Callable[[], Awaitable[object]]) -> None:
+    start = time.perf_counter()
+    await op()
+    samples.append((time.perf_counter() - start) * 1000)
+
+
+async def run_preset(
+    directory: Path, tuning: Tuning, schema: str, messages: int, reads: int
+) -> dict[str, list[float]]:
+    db_path = str(directory / "store.db")
+    if schema:
+        with DB.connect(db_path) as db:
+            db.executescript(schema)
+    storage = SQLite(db_path, tuning=tuning)
+    results: dict[str, list[float]] = {
+        "write": [],
+        "write (x32 concurrent)": [],
+        "save_event": [],
+        "load_messages": [],
+        "load_messages (cursor)": [],
+        "count_user_messages": [],
+        "search_messages": [],
+        "load_latest_metric": [],
+    }
+    conversations = [f"conv-{i}" for i in range(max(messages // 100, 1))]
+
+    for i in range(messages):
+        conversation = conversations[i % len(conversations)]
+        await _timed(
+            results["write"],
+            lambda c=conversation, i=i: storage.save_message(
+                c, "user1", TYPES[i % len(TYPES)], _text(i)
+            ),
+        )
+        if i % 4 == 0:
+            await _timed(
+                results["save_event"],
+                lambda c=conversation: storage.save_event(c, "metric", '{"input": 1}'),
+            )
+
+    for start in range(0, messages, 32):
+        batch = range(start, min(start + 32, messages))
+        await _timed(
+            results["write (x32 concurrent)"],
+            lambda batch=batch: asyncio.gather(
+                *(storage.save_message("burst", "user2", "user", _text(i)) for i in batch)
+            ),
+        )
+
+    cursor = (await storage.load_messages(conversations[0], "user1", limit=1))[0]["message_id"]
+    for i in range(reads):
+        conversation = conversations[i % len(conversations)]
+        await _timed(
+            results["load_messages"],
+            lambda c=conversation: storage.load_messages(c, "user1", limit=50),
+        )
+        await _timed(
+            results["load_messages (cursor)"],
+            lambda: storage.load_messages(conversations[0], "user1", after_id=cursor),
+        )
+        await _timed(
+            results["count_user_messages"], lambda: storage.count_user_messages("user1", 0)
+        )
+        await _timed(
+            results["search_messages"],
+            lambda i=i: storage.search_messages(WORDS[i % len(WORDS)], "user1", None, 3),
+        )
+        await _timed(
+            results["load_latest_metric"],
+            lambda c=conversation: storage.load_latest_metric(c),
+        )
+    return results
+
+
+def _report(name: str, results: dict[str, list[float]]) -> None:
+    print(f"\n{name}")
+    for op, samples in results.items():
+        if not samples:
+            continue
+        quantiles = statistics.quantiles(samples, n=20) if len(samples) > 1 else samples * 19
+        print(f"  {op:<26} p50 {statistics.median(samples):8.3f} ms   p95 {quantiles[18]:8.3f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite storage latency across presets")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--preset", choices=sorted(PRESETS), action="append")
+    args = parser.parse_args()
+
+    for name in args.preset or PRESETS:
+        with tempfile.TemporaryDirectory() as directory:
+            tuning, schema = PRESETS[name]
+            results = await run_preset(Path(directory), tuning, schema, args.messages, args.reads)
+        _report(name, results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
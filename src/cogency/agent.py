@@ -88,6 +88,8 @@ class Agent:
         security: Security | None = None,
         debug: bool = False,
         notifications: NotificationSource | None = None,
+        tool_cache: bool = False,
+        process_pool: bool = False,
     ):
         if debug:
             logging.getLogger("cogency").setLevel(logging.DEBUG)
@@ -112,6 +114,8 @@ class Agent:
             security=final_security,
             debug=debug,
             notifications=notifications,
+            tool_cache=tool_cache,
+            process_pool=process_pool,
         )
 
         valid_modes = ["auto", "resume", "replay"]
@@ -139,10 +143,12 @@ class Agent:
             # Emit user event - first event in conversation turn
             yield UserEvent(type="user", content=query, timestamp=timestamp)
 
-            async for event in _select_mode_stream(
-                self.config.mode, self.config, query, user_id, conversation_id, stream
-            ):
-                yield event
+            # Background profile learning yields to in-flight turns
+            with context.foreground():
+                async for event in _select_mode_stream(
+                    self.config.mode, self.config, query, user_id, conversation_id, stream
+                ):
+                    yield event
 
             if self.config.profile:
                 context.learn(
@@ -7,6 +7,7 @@ eliminates stale state bugs.
 Public API:
 - assemble() - Complete context assembly (system + profile + conversation + task)
 - learn() - Profile learning from user patterns
+- foreground() - Mark an interactive turn so background learning yields to it
 
 Internal modules:
 - conversation.* - Event to message conversion
@@ -20,6 +21,6 @@ Agent flow:
 """
 
 from .assembly import assemble
-from .profile import learn, wait_for_background_tasks
+from .profile import foreground, learn, wait_for_background_tasks
 
-__all__ = ["assemble", "learn", "wait_for_background_tasks"]
+__all__ = ["assemble", "foreground", "learn", "wait_for_background_tasks"]
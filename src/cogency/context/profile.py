@@ -6,15 +6,26 @@ Why no embeddings?
 - Privacy: deletable, auditable format
 
 Triggers: every 5 messages or size > 2000 chars (compaction).
+
+Learning runs on a bounded background scheduler that coalesces per user and
+defers to interactive turns.
+
+Loaded profiles are cached in-process (LRU + TTL). Writes through save()/delete()
+invalidate the cache; writes that bypass them become visible after CACHE_TTL.
 """
 
 import asyncio
+import contextlib
+import functools
 import json
 import logging
 import time
-from typing import TYPE_CHECKING, Any
+from collections import OrderedDict
+from collections.abc import Generator
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, cast
 
-from cogency.core.protocols import parse_profile_dict
+from cogency.core.protocols import ParseError, parse_profile_dict
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +34,12 @@ if TYPE_CHECKING:
 
 DEFAULT_CADENCE = 5
 COMPACT_THRESHOLD = 2000
+CACHE_SIZE = 1024
+CACHE_TTL = 60.0
+MAX_WORKERS = 2
+MAX_PENDING = 1024
+MAX_DEFER = 5.0
+BATCH_SIZE = 8
 
 PROFILE_TEMPLATE = """Current: {profile}
 Messages: {user_messages}
@@ -30,6 +47,11 @@ Messages: {user_messages}
 Example: {{"who":"developer","style":"direct","focus":"AI projects","interests":"tech","misc":"likes cats, morning person"}}"""
 
 
+BATCH_PROFILE_TEMPLATE = """Update each profile below independently.
+{entries}
+Return one JSON object keyed by entry id, e.g. {{"u0": {{...}}, "u1": {{}}}}. Follow each entry's instruction. JSON only."""
+
+
 def prompt(profile: dict[str, Any], user_messages: list[str], compact: bool = False) -> str:
     """Generate profile learning prompt."""
     if compact:
@@ -45,20 +67,106 @@ def prompt(profile: dict[str, Any], user_messages: list[str], compact: bool = Fa
     )
 
 
+class ProfileCache:
+    """Bounded LRU of loaded profiles with per-entry TTL, keyed by (storage, user_id).
+
+    Entries hold a reference to their storage so an id() is never reused while cached.
+    """
+
+    def __init__(self, size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[int, str], tuple[Storage, float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+
+    def get(self, storage: "Storage", user_id: str) -> dict[str, Any] | None:
+        key = (id(storage), user_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        owner, expires_at, profile = entry
+        if owner is not storage or expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return dict(profile)
+
+    def put(self, storage: "Storage", user_id: str, profile: dict[str, Any]) -> None:
+        if self.size <= 0 or self.ttl <= 0:
+            return
+        key = (id(storage), user_id)
+        self._entries[key] = (storage, time.monotonic() + self.ttl, dict(profile))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, storage: "Storage", user_id: str) -> None:
+        self._entries.pop((id(storage), user_id), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+cache = ProfileCache()
+
+
+def batch_prompt(entries: list[tuple[dict[str, Any], list[str], bool]]) -> str:
+    """Pack several PROFILE_TEMPLATE payloads into one keyed request."""
+    sections = [
+        f"[u{index}]\n{prompt(current, messages, compact=compact)}"
+        for index, (current, messages, compact) in enumerate(entries)
+    ]
+    return BATCH_PROFILE_TEMPLATE.format(entries="\n\n".join(sections))
+
+
+@functools.cache
+def _default_storage() -> "Storage":
+    """One shared default store, so storage-less lookups share cache entries."""
+    from cogency.lib.sqlite import default_storage
+
+    return default_storage()
+
+
 async def get(user_id: str | None, storage: "Storage | None" = None) -> dict[str, Any] | None:
     if not user_id:
         return None
     if storage is None:
-        from cogency.lib.sqlite import default_storage
+        storage = _default_storage()
+
+    cached = cache.get(storage, user_id)
+    if cached is not None:
+        return cached
 
-        storage = default_storage()
     try:
-        return await storage.load_profile(user_id)
+        profile = await storage.load_profile(user_id)
     except Exception as e:
         if "unable to open database file" in str(e):
             return {}
         raise RuntimeError(f"Profile fetch failed for {user_id}: {e}") from e
 
+    cache.put(storage, user_id, profile)
+    return profile
+
+
+async def save(user_id: str, profile: dict[str, Any], *, storage: "Storage") -> None:
+    """Persist a profile version and invalidate the cached copy."""
+    try:
+        await storage.save_profile(user_id, profile)
+    finally:
+        cache.invalidate(storage, user_id)
+
+
+async def delete(user_id: str, *, storage: "Storage") -> int:
+    """Delete all profile versions and invalidate the cached copy."""
+    try:
+        return await storage.delete_profile(user_id)
+    finally:
+        cache.invalidate(storage, user_id)
+
 
 async def format(user_id: str | None, storage: "Storage | None" = None) -> str:
     try:
@@ -110,26 +218,216 @@ async def should_learn(
     return await _should_learn_with_profile(user_id, current, storage=storage, cadence=cadence)
 
 
-_background_tasks: set[asyncio.Task[Any]] = set()
+@dataclass
+class _Job:
+    user_id: str
+    storage: "Storage"
+    llm: "LLM"
+    cadence: int
+    enqueued_at: float
+
+
+class ProfileScheduler:
+    """Background profile learning with bounded workers and per-user coalescing.
+
+    - At most `workers` learning jobs run at once; extra submissions queue.
+    - One pending job per (storage, user): resubmits coalesce into the queued job.
+    - Jobs yield to interactive turns (see foreground()) for up to `max_defer` seconds.
+    - Queue is bounded by `max_pending`; new users are dropped when full (backpressure).
+    - Ready jobs sharing an LLM are learned together, up to `batch_size` per call.
+    """
+
+    def __init__(
+        self,
+        workers: int = MAX_WORKERS,
+        max_pending: int = MAX_PENDING,
+        max_defer: float = MAX_DEFER,
+        batch_size: int = BATCH_SIZE,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_defer = max_defer
+        self.batch_size = batch_size
+        self._reset(None)
+
+    def _reset(self, loop: asyncio.AbstractEventLoop | None) -> None:
+        self._loop = loop
+        self._pending: OrderedDict[tuple[int, str], _Job] = OrderedDict()
+        self._running: set[tuple[int, str]] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._foreground = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._counters = dict.fromkeys(
+            (
+                "submitted",
+                "coalesced",
+                "dropped",
+                "completed",
+                "failed",
+                "batches",
+                "peak_pending",
+            ),
+            0,
+        )
 
+    def _bind(self) -> asyncio.AbstractEventLoop | None:
+        """Attach to the running loop; state from a previous loop is discarded."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        if loop is not self._loop:
+            self._reset(loop)
+        return loop
+
+    def submit(
+        self, user_id: str, *, storage: "Storage", llm: "LLM", cadence: int = DEFAULT_CADENCE
+    ) -> bool:
+        """Queue a learning job. Returns False if dropped (no loop or queue full)."""
+        loop = self._bind()
+        if loop is None:
+            return False
+
+        key = (id(storage), user_id)
+        job = _Job(user_id, storage, llm, cadence, time.monotonic())
+        self._counters["submitted"] += 1
+
+        if key in self._pending:
+            self._pending[key] = replace(job, enqueued_at=self._pending[key].enqueued_at)
+            self._counters["coalesced"] += 1
+            return True
 
-def _task_done_callback(task: asyncio.Task[Any]) -> None:
-    _background_tasks.discard(task)
-    if task.cancelled():
-        return
-    if exc := task.exception():
-        logger.warning(f"Background profile learning failed: {exc}")
+        if len(self._pending) >= self.max_pending:
+            self._counters["dropped"] += 1
+            logger.debug(f"Profile learning queue full, dropping {user_id}")
+            return False
+
+        self._pending[key] = job
+        self._counters["peak_pending"] = max(self._counters["peak_pending"], len(self._pending))
+        self._spawn(loop)
+        return True
+
+    def _spawn(self, loop: asyncio.AbstractEventLoop) -> None:
+        while len(self._tasks) < min(self.workers, len(self._pending)):
+            task = loop.create_task(self._work())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _next(self, llm: "LLM | None" = None) -> tuple[tuple[int, str], _Job] | None:
+        for key, job in self._pending.items():
+            if key not in self._running and (llm is None or job.llm is llm):
+                del self._pending[key]
+                return key, job
+        return None
+
+    def _take_batch(
+        self, first: tuple[tuple[int, str], _Job]
+    ) -> list[tuple[tuple[int, str], _Job]]:
+        """Add ready jobs sharing the first job's LLM, up to batch_size."""
+        batch = [first]
+        while len(batch) < self.batch_size and (item := self._next(first[1].llm)):
+            self._running.add(item[0])
+            batch.append(item)
+        return batch
+
+    async def _yield_to_foreground(self, job: _Job) -> None:
+        remaining = job.enqueued_at + self.max_defer - time.monotonic()
+        if self._idle.is_set() or remaining <= 0:
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._idle.wait(), timeout=remaining)
+
+    def _record(self, result: bool | BaseException) -> None:
+        if isinstance(result, BaseException):
+            self._counters["failed"] += 1
+            logger.warning(f"Background profile learning failed: {result}")
+        else:
+            self._counters["completed"] += 1
+
+    async def _run(self, batch: list[tuple[tuple[int, str], _Job]]) -> None:
+        if len(batch) == 1:
+            job = batch[0][1]
+            try:
+                result: bool | BaseException = await learn_async(
+                    job.user_id, storage=job.storage, llm=job.llm, cadence=job.cadence
+                )
+            except Exception as exc:
+                result = exc
+            self._record(result)
+            return
+
+        self._counters["batches"] += 1
+        users = [(job.user_id, job.storage, job.cadence) for _, job in batch]
+        try:
+            results = await learn_batch(users, llm=batch[0][1].llm)
+        except Exception as exc:
+            results = [exc] * len(batch)
+        for result in results:
+            self._record(result)
+
+    async def _work(self) -> None:
+        while first := self._next():
+            self._running.add(first[0])
+            batch = [first]
+            try:
+                await self._yield_to_foreground(first[1])
+                batch = self._take_batch(first)
+                await self._run(batch)
+            finally:
+                for key, _ in batch:
+                    self._running.discard(key)
+
+    @contextlib.contextmanager
+    def foreground(self) -> Generator[None, None, None]:
+        """Mark an interactive turn in progress; learning waits while any are active."""
+        self._bind()
+        self._foreground += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._foreground -= 1
+            if self._foreground <= 0:
+                self._foreground = 0
+                self._idle.set()
+
+    async def drain(self, timeout: float = 10.0) -> bool:
+        """Wait until queued and running jobs finish. Returns False on timeout."""
+        if self._bind() is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while self._tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.wait(set(self._tasks), timeout=remaining)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """Queue depth and lifetime counters for backpressure monitoring."""
+        return {
+            **self._counters,
+            "pending": len(self._pending),
+            "running": len(self._running),
+            "workers": len(self._tasks),
+        }
+
+
+scheduler = ProfileScheduler()
+
+
+def foreground() -> contextlib.AbstractContextManager[None]:
+    return scheduler.foreground()
 
 
 async def wait_for_background_tasks(timeout: float = 10.0) -> None:
     """Wait for pending profile learning tasks to complete."""
-    if not _background_tasks:
-        return
-    tasks = list(_background_tasks)
-    try:
-        await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=timeout)
-    except TimeoutError:
-        logger.warning(f"Timeout waiting for {len(tasks)} background profile tasks")
+    if not await scheduler.drain(timeout):
+        stats = scheduler.stats()
+        logger.warning(
+            f"Timeout waiting for {stats['pending'] + stats['running']} background profile tasks"
+        )
 
 
 def learn(
@@ -143,29 +441,21 @@ def learn(
     if not profile_enabled or not user_id or not llm:
         return
 
-    try:
-        loop = asyncio.get_running_loop()
-        task = loop.create_task(
-            learn_async(
-                user_id,
-                storage=storage,
-                llm=llm,
-                cadence=cadence,
-            )
-        )
-        _background_tasks.add(task)
-        task.add_done_callback(_task_done_callback)
-    except RuntimeError:
-        pass
+    scheduler.submit(user_id, storage=storage, llm=llm, cadence=cadence)
 
 
-async def learn_async(
-    user_id: str,
-    *,
-    storage: "Storage",
-    llm: "LLM",
-    cadence: int = DEFAULT_CADENCE,
-) -> bool:
+@dataclass
+class _Pending:
+    """A user that crossed the learning threshold, with inputs loaded."""
+
+    user_id: str
+    storage: "Storage"
+    current: dict[str, Any]
+    messages: list[str]
+    compact: bool
+
+
+async def _prepare(user_id: str, *, storage: "Storage", cadence: int) -> _Pending | None:
     current = await get(user_id, storage) or {
         "who": "",
         "style": "",
@@ -177,33 +467,104 @@ async def learn_async(
     last_learned = current.get("_meta", {}).get("last_learned_at", 0)
 
     if not await _should_learn_with_profile(user_id, current, storage=storage, cadence=cadence):
-        return False
+        return None
 
     limit = cadence * 2
 
     message_texts = await storage.load_user_messages(user_id, last_learned, limit)
 
     if not message_texts:
-        return False
+        return None
 
     logger.debug(f"🧠 LEARNING: {len(message_texts)} new messages for {user_id}")
 
-    # Check size and update
     compact = len(json.dumps(current)) > COMPACT_THRESHOLD
-    updated = await update_profile(current, message_texts, llm, compact=compact)
+    return _Pending(user_id, storage, current, message_texts, compact)
+
 
-    if updated and updated != current:
+async def _apply(pending: _Pending, updated: dict[str, Any] | None) -> bool:
+    if updated and updated != pending.current:
         updated["_meta"] = {
             "last_learned_at": time.time(),
-            "messages_processed": len(message_texts),
+            "messages_processed": len(pending.messages),
         }
-        await storage.save_profile(user_id, updated)
+        await save(pending.user_id, updated, storage=pending.storage)
         logger.debug(f"💾 SAVED: {len(json.dumps(updated))} chars")
         return True
 
     return False
 
 
+async def learn_async(
+    user_id: str,
+    *,
+    storage: "Storage",
+    llm: "LLM",
+    cadence: int = DEFAULT_CADENCE,
+) -> bool:
+    pending = await _prepare(user_id, storage=storage, cadence=cadence)
+    if pending is None:
+        return False
+
+    updated = await update_profile(pending.current, pending.messages, llm, compact=pending.compact)
+    return await _apply(pending, updated)
+
+
+async def learn_batch(
+    users: "list[tuple[str, Storage, int]]", *, llm: "LLM"
+) -> list[bool | BaseException]:
+    """Learn several users with one LLM call. Users the batch can't resolve fall back
+    to individual update_profile calls. Results align with `users`; errors are returned."""
+    prepared = await asyncio.gather(
+        *(
+            _prepare(user_id, storage=storage, cadence=cadence)
+            for user_id, storage, cadence in users
+        ),
+        return_exceptions=True,
+    )
+    ready = [p for p in prepared if isinstance(p, _Pending)]
+
+    updates: dict[int, dict[str, Any] | None] = {}
+    if len(ready) > 1:
+        try:
+            updates = await update_profiles(
+                [(p.current, p.messages, p.compact) for p in ready], llm
+            )
+        except Exception as e:
+            logger.debug(f"Batch profile update failed, falling back: {e}")
+
+    async def finish(index: int, pending: _Pending) -> bool:
+        if index in updates:
+            updated = updates[index]
+        else:
+            updated = await update_profile(
+                pending.current, pending.messages, llm, compact=pending.compact
+            )
+        return await _apply(pending, updated)
+
+    finished = iter(
+        await asyncio.gather(*(finish(i, p) for i, p in enumerate(ready)), return_exceptions=True)
+    )
+    results: list[bool | BaseException] = []
+    for p in prepared:
+        if isinstance(p, _Pending):
+            results.append(next(finished))
+        else:
+            results.append(p if isinstance(p, BaseException) else False)
+    return results
+
+
+def _resolve_update(raw: object, compact: bool) -> dict[str, Any] | None:
+    parsed = parse_profile_dict(raw)
+    if compact or parsed:
+        return dict(parsed)
+    return None
+
+
+def _strip_json(result: str) -> str:
+    return result.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+
+
 async def update_profile(
     current: dict[str, Any], user_messages: list[str], llm: "LLM", compact: bool = False
 ) -> dict[str, Any] | None:
@@ -215,19 +576,58 @@ async def update_profile(
         return current if compact else None
 
     # Parse JSON (strip common markdown)
-    clean = result.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+    clean = _strip_json(result)
 
     try:
         raw: object = json.loads(clean)
-        parsed = parse_profile_dict(raw)
-        if compact or parsed:
-            return dict(parsed)
+        return _resolve_update(raw, compact)
     except json.JSONDecodeError as e:
         raise RuntimeError(f"JSON parse error during profile update: {result[:50]}...") from e
     except Exception as e:
         raise RuntimeError(f"Invalid profile format: {e}") from e
 
-    return current if compact else None
 
+async def update_profiles(
+    entries: list[tuple[dict[str, Any], list[str], bool]], llm: "LLM"
+) -> dict[int, dict[str, Any] | None]:
+    """Update several profiles in one call. Entries are (current, messages, compact).
 
-__all__ = ["format", "get", "learn"]
+    Returns updates keyed by entry index; entries missing or malformed in the
+    response are omitted so callers can retry them individually.
+    """
+    prompt_text = batch_prompt(entries)
+    result = await llm.generate([{"role": "user", "content": prompt_text}])
+    if not result:
+        return {}
+
+    try:
+        raw: object = json.loads(_strip_json(result))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+
+    keyed = cast("dict[str, object]", raw)  # JSON boundary cast
+    updates: dict[int, dict[str, Any] | None] = {}
+    for index, (_, _, compact) in enumerate(entries):
+        key = f"u{index}"
+        if key not in keyed:
+            continue
+        try:
+            updates[index] = _resolve_update(keyed[key], compact)
+        except ParseError:
+            continue
+    return updates
+
+
+__all__ = [
+    "cache",
+    "delete",
+    "foreground",
+    "format",
+    "get",
+    "learn",
+    "learn_batch",
+    "save",
+    "scheduler",
+]
@@ -0,0 +1,129 @@
+"""Per-conversation cache for idempotent tool results.
+
+An entry is keyed by tool name and canonical args, and is valid while:
+- The stat fingerprint (mtime, size) of every path argument is unchanged
+- Its TTL, if the tool declares one (web tools), hasn't passed
+- No mutating tool has run in the conversation since the call started
+
+A directory's fingerprint changes only when its direct entries change, so an
+edit deeper in the tree by another process can go unseen. Edits made through the
+agent's own mutating tools always invalidate.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+from .errors import ToolError
+from .protocols import ToolResult
+from .security import resolve_file
+
+if TYPE_CHECKING:
+    from .config import Access
+
+MAX_ENTRIES = 256  # Per conversation
+MAX_CONVERSATIONS = 64
+WEB_TTL = 300.0  # Seconds a scrape or search result is reused
+
+Fingerprint = tuple[tuple[str, int, int] | tuple[str, None, None], ...]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    result: ToolResult
+    fingerprint: Fingerprint
+    expires: float | None
+
+
+def fingerprint(paths: Iterable[str], access: "Access", sandbox_dir: str) -> Fingerprint | None:
+    """(path, mtime_ns, size) per path; a missing path is fingerprinted as absent.
+
+    None when a path can't be resolved: the call will fail and isn't cached.
+    """
+    prints: list[tuple[str, int, int] | tuple[str, None, None]] = []
+    for path in paths:
+        try:
+            resolved = resolve_file(path, access, sandbox_dir)
+        except ToolError:
+            return None
+        try:
+            stat = resolved.stat()
+        except OSError:
+            prints.append((str(resolved), None, None))
+        else:
+            prints.append((str(resolved), stat.st_mtime_ns, stat.st_size))
+    return tuple(prints)
+
+
+class ResultCache:
+    def __init__(
+        self, *, max_entries: int = MAX_ENTRIES, max_conversations: int = MAX_CONVERSATIONS
+    ):
+        self.max_entries = max_entries
+        self.max_conversations = max_conversations
+        self._entries: OrderedDict[str, OrderedDict[str, _Entry]] = OrderedDict()
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @staticmethod
+    def key(tool_name: str, args: Mapping[str, Any]) -> str:
+        return json.dumps([tool_name, args], sort_keys=True, default=str)
+
+    def generation(self, conversation_id: str) -> int:
+        return self._generations.get(conversation_id, 0)
+
+    def get(self, conversation_id: str, key: str, fingerprint: Fingerprint) -> ToolResult | None:
+        entries = self._entries.get(conversation_id)
+        entry = entries.get(key) if entries is not None else None
+        if entry is None or entries is None:
+            self.stats["misses"] += 1
+            return None
+        if entry.fingerprint != fingerprint or (
+            entry.expires is not None and entry.expires <= time.monotonic()
+        ):
+            del entries[key]
+            self.stats["misses"] += 1
+            return None
+        entries.move_to_end(key)
+        self._entries.move_to_end(conversation_id)
+        self.stats["hits"] += 1
+        return replace(entry.result)  # Callers may mutate results
+
+    def put(
+        self,
+        conversation_id: str,
+        key: str,
+        result: ToolResult,
+        fingerprint: Fingerprint,
+        *,
+        ttl: float | None,
+        generation: int,
+    ) -> None:
+        """Store unless a mutating tool ran after the call started (generation moved)."""
+        if generation != self.generation(conversation_id):
+            return
+        entries = self._entries.get(conversation_id)
+        if entries is None:
+            entries = self._entries[conversation_id] = OrderedDict()
+            while len(self._entries) > self.max_conversations:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(conversation_id)
+        expires = time.monotonic() + ttl if ttl is not None else None
+        entries[key] = _Entry(replace(result), fingerprint, expires)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def invalidate(self, conversation_id: str) -> None:
+        self._generations[conversation_id] = self.generation(conversation_id) + 1
+        self._generations.move_to_end(conversation_id)
+        while len(self._generations) > self.max_conversations:
+            self._generations.popitem(last=False)
+        if self._entries.pop(conversation_id, None) is not None:
+            self.stats["invalidations"] += 1
+
+
+__all__ = ["WEB_TTL", "ResultCache", "fingerprint"]
@@ -1,8 +1,11 @@
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
 from typing import Literal
 
+from .cache import ResultCache
+from .limiter import SHELL_GRACE, ToolLimiter
 from .protocols import LLM, HistoryTransform, NotificationSource, Storage, Tool
+from .registry import ToolRegistry
 
 # Security access levels for file and shell operations
 Access = Literal["sandbox", "project", "system"]
@@ -17,6 +20,19 @@ class Execution:
     shell_timeout: int
     sandbox_dir: str
     access: Access
+    limiter: ToolLimiter | None = None  # None runs every call at once, without timeouts
+    cache: ResultCache | None = None  # Results of idempotent tools, per conversation
+    process_pool: bool = False  # Run cpu_bound tools in worker processes
+    registry: ToolRegistry = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        context = {
+            "storage": self.storage,
+            "sandbox_dir": self.sandbox_dir,
+            "access": self.access,
+            "timeout": self.shell_timeout,
+        }
+        object.__setattr__(self, "registry", ToolRegistry(self.tools, context))
 
 
 @dataclass(frozen=True)
@@ -27,6 +43,24 @@ class Security:
     sandbox_dir: str = ".cogency/sandbox"  # Sandbox directory (ignored unless access="sandbox")
     shell_timeout: int = 30  # Shell command timeout in seconds
     api_timeout: float = 30.0  # HTTP/LLM call timeout
+    tool_timeout: float | None = 120.0  # Default per-call timeout for non-shell tools
+    tool_timeouts: Mapping[str, float | None] = field(
+        default_factory=dict[str, float | None]
+    )  # Per-tool overrides
+    max_concurrent_tools: int | None = 8  # Calls in flight across all batches of an agent
+    tool_concurrency: Mapping[str, int] = field(
+        default_factory=lambda: {"scrape": 4, "search": 2}
+    )  # Per-tool caps
+
+    def limiter(self) -> ToolLimiter:
+        # Shell has its own timeout; the limiter only backstops it
+        timeouts = {"shell": self.shell_timeout + SHELL_GRACE, **self.tool_timeouts}
+        return ToolLimiter(
+            max_concurrent=self.max_concurrent_tools,
+            concurrency=self.tool_concurrency,
+            timeout=self.tool_timeout,
+            timeouts=timeouts,
+        )
 
 
 @dataclass(frozen=True)
@@ -58,15 +92,27 @@ class Config:
     profile_cadence: int = 5  # Messages between profile learning
     debug: bool = False  # Debug logging to .cogency/debug/
     notifications: NotificationSource | None = None
+    tool_cache: bool = False  # Reuse idempotent tool results within a conversation
+    process_pool: bool = False  # Opt in: run cpu_bound tools in shared worker processes
 
-    @property
-    def execution(self) -> Execution:
-        """Return cohesive execution dependencies for downstream consumers."""
+    # Built once: the tool registry and limiter are shared by every turn
+    _execution: Execution = field(init=False, repr=False, compare=False)
 
-        return Execution(
+    def __post_init__(self) -> None:
+        execution = Execution(
             storage=self.storage,
             tools=tuple(self.tools),
             shell_timeout=self.security.shell_timeout,
             sandbox_dir=self.security.sandbox_dir,
             access=self.security.access,
+            limiter=self.security.limiter(),
+            cache=ResultCache() if self.tool_cache else None,
+            process_pool=self.process_pool,
         )
+        object.__setattr__(self, "_execution", execution)
+
+    @property
+    def execution(self) -> Execution:
+        """Return cohesive execution dependencies for downstream consumers."""
+
+        return self._execution
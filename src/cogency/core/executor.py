@@ -1,7 +1,13 @@
 import asyncio
+from dataclasses import replace
+from typing import Any
 
+from .cache import fingerprint
 from .config import Execution
-from .protocols import ToolCall, ToolResult
+from .pool import run_cpu_bound
+from .protocols import Tool, ToolCall, ToolResult
+from .registry import Binding
+from .schedule import schedule
 
 
 async def execute_tool(
@@ -13,24 +19,59 @@ async def execute_tool(
 ) -> ToolResult:
     tool_name = call.name
 
-    tool = next((t for t in execution.tools if t.name == tool_name), None)
-    if not tool:
+    binding = execution.registry.get(tool_name)
+    if binding is None:
         return ToolResult(outcome=f"Tool '{tool_name}' not registered", error=True)
 
-    args = dict(call.args)
+    args = binding.kwargs(call.args, conversation_id, user_id)
+    cache = execution.cache
+    if cache is None or not (binding.idempotent or binding.mutates):
+        return await _limited(execution, binding, args)
 
-    args["storage"] = execution.storage
-    args["sandbox_dir"] = execution.sandbox_dir
-    args["access"] = execution.access
-    args["conversation_id"] = conversation_id
+    if binding.mutates:
+        try:
+            return await _limited(execution, binding, args)
+        finally:
+            cache.invalidate(conversation_id)
 
-    if tool_name == "shell":
-        args["timeout"] = execution.shell_timeout
-    if user_id:
-        args["user_id"] = user_id
+    prints = fingerprint(binding.path_args(call.args), execution.access, execution.sandbox_dir)
+    if prints is None:
+        return await _limited(execution, binding, args)
 
+    key = cache.key(tool_name, call.args)
+    cached = cache.get(conversation_id, key, prints)
+    if cached is not None:
+        return cached
+    generation = cache.generation(conversation_id)
+    result = await _limited(execution, binding, args)
+    if not result.error:
+        cache.put(conversation_id, key, result, prints, ttl=binding.ttl, generation=generation)
+    return result
+
+
+async def _limited(execution: Execution, binding: Binding, args: dict[str, Any]) -> ToolResult:
+    tool, offload = binding.tool, binding.cpu_bound and execution.process_pool
+    limiter = execution.limiter
+    if limiter is None:
+        return await _run(tool, args, offload)
+
+    timeout = limiter.timeout_for(tool.name, mutates=binding.mutates)
+    async with limiter.slot(tool.name):
+        # Cancels the straggler on expiry, so its slot frees for the next call
+        try:
+            async with asyncio.timeout(timeout):
+                return await _run(tool, args, offload)
+        except TimeoutError:  # Tool errors, its own timeouts included, are caught by _run
+            limiter.stats["timeouts"] += 1
+            outcome = f"Tool '{tool.name}' timed out after {timeout:g}s"
+            if binding.mutates:
+                outcome += "; it may still be running, and its changes may be partly applied"
+            return ToolResult(outcome=outcome, error=True)
+
+
+async def _run(tool: Tool, args: dict[str, Any], offload: bool) -> ToolResult:
     try:
-        return await tool.execute(**args)
+        return await (run_cpu_bound(tool, args) if offload else tool.execute(**args))
     except Exception as e:
         return ToolResult(outcome=f"Tool execution failed: {e!s}", error=True)
 
@@ -42,20 +83,41 @@ async def execute_tools(
     user_id: str,
     conversation_id: str,
 ) -> list[ToolResult]:
-    """Parallel execution, order preserved. Failures don't block siblings."""
+    """Parallel execution, order preserved. Failures don't block siblings.
+
+    Identical read-only calls run once; calls that conflict on a path run in
+    batch order (see `schedule`). Concurrency caps and timeouts come from
+    `execution.limiter`; calls over a cap wait for a slot in arrival order.
+    """
     if not calls:
         return []
 
-    tasks = [
-        execute_tool(
-            call,
+    steps = schedule(calls, execution)
+    tasks: dict[int, asyncio.Task[ToolResult]] = {}
+
+    async def run(index: int) -> ToolResult:
+        if steps[index].after:
+            await asyncio.wait([tasks[j] for j in steps[index].after])
+        return await execute_tool(
+            calls[index],
             execution=execution,
             user_id=user_id,
             conversation_id=conversation_id,
         )
-        for call in calls
+
+    for index, step in enumerate(steps):
+        if step.leader is None:
+            tasks[index] = asyncio.ensure_future(run(index))
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()  # No-op once done; stops stragglers if this batch is cancelled
+
+    return [
+        replace(tasks[index if step.leader is None else step.leader].result())
+        for index, step in enumerate(steps)
     ]
-    return list(await asyncio.gather(*tasks))
 
 
 __all__ = ["execute_tools"]
@@ -0,0 +1,92 @@
+"""Tool concurrency limits and timeouts, shared by every batch run under one Config.
+
+- A global cap on calls in flight, plus optional per-tool caps
+- A per-tool timeout; a call that overruns is cancelled and reported as an error.
+  The default timeout skips mutating tools, which only time out when configured
+- Queue depth metrics: calls waiting for a slot now, and the peak seen
+
+A call takes its per-tool slot before the global one, so a tool waiting on its
+own cap never holds a global slot that another tool could use.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator, Mapping
+
+SHELL_GRACE = 5.0  # Shell enforces its own timeout; the limiter is only the backstop
+
+
+class ToolLimiter:
+    def __init__(
+        self,
+        *,
+        max_concurrent: int | None = None,
+        concurrency: Mapping[str, int] | None = None,
+        timeout: float | None = None,
+        timeouts: Mapping[str, float | None] | None = None,
+    ):
+        for name, cap in {"*": max_concurrent, **(concurrency or {})}.items():
+            if cap is not None and cap < 1:
+                raise ValueError(f"Concurrency for {name} must be >= 1, got {cap}")
+        self.max_concurrent = max_concurrent
+        self.concurrency = dict(concurrency or {})
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+
+        # Semaphores bind to the loop that first waits on them; rebuilt per loop
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._global: asyncio.Semaphore | None = None
+        self._per_tool: dict[str, asyncio.Semaphore] = {}
+
+        self.queued = 0
+        self.running = 0
+        self.stats = {"calls": 0, "timeouts": 0, "peak_queued": 0, "peak_running": 0}
+
+    def timeout_for(self, tool_name: str, *, mutates: bool = False) -> float | None:
+        """Per-tool timeout, else the default. Mutating tools only get an explicit one:
+        expiry stops the wait, not a write already running in a thread or worker."""
+        if mutates:
+            return self.timeouts.get(tool_name)
+        return self.timeouts.get(tool_name, self.timeout)
+
+    def _semaphores(self, tool_name: str) -> list[asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.max_concurrent) if self.max_concurrent else None
+            self._per_tool = {}
+
+        semaphores: list[asyncio.Semaphore] = []
+        cap = self.concurrency.get(tool_name)
+        if cap is not None:
+            semaphores.append(self._per_tool.setdefault(tool_name, asyncio.Semaphore(cap)))
+        if self._global is not None:
+            semaphores.append(self._global)
+        return semaphores
+
+    @contextlib.asynccontextmanager
+    async def slot(self, tool_name: str) -> AsyncGenerator[None, None]:
+        """Hold the tool's slots for the duration of the block."""
+        semaphores = self._semaphores(tool_name)
+        waiting = any(semaphore.locked() for semaphore in semaphores)
+        async with contextlib.AsyncExitStack() as stack:
+            if waiting:
+                self.queued += 1
+                self.stats["peak_queued"] = max(self.stats["peak_queued"], self.queued)
+            try:
+                for semaphore in semaphores:
+                    await stack.enter_async_context(semaphore)
+            finally:
+                if waiting:
+                    self.queued -= 1
+
+            self.running += 1
+            self.stats["calls"] += 1
+            self.stats["peak_running"] = max(self.stats["peak_running"], self.running)
+            try:
+                yield
+            finally:
+                self.running -= 1
+
+
+__all__ = ["SHELL_GRACE", "ToolLimiter"]
@@ -0,0 +1,115 @@
+"""Worker processes for CPU-bound tools (`@tool(..., cpu_bound=True)`).
+
+One spawn-context ProcessPoolExecutor is shared by every agent in the process,
+started on first use. A call ships the tool by reference (module and name), its
+validated args and the caller's working directory; the worker imports the tool
+and runs it there. Only params and context the tool names explicitly are sent,
+so a `**kwargs` catch-all never drags unpicklable storage across.
+
+The call runs inline instead when the tool isn't importable by reference (for
+example, defined inside a function) or the pool can't take it. If the worker
+fails mid-call, a read-only tool reruns inline; a mutating tool returns an
+error, since the worker may already have written. A timeout stops waiting for
+the result but cannot interrupt the worker mid-call.
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+
+from .protocols import Tool, ToolResult
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _reset(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _reference(tool: Tool) -> tuple[str, str] | None:
+    module, name = getattr(tool, "module", None), getattr(tool, "qualname", None)
+    if not isinstance(module, str) or not isinstance(name, str):
+        return None
+    if getattr(sys.modules.get(module), name, None) is not tool:
+        return None  # Not reachable by import in a fresh interpreter
+    return module, name
+
+
+def _work(module: str, name: str, cwd: str, kwargs: dict[str, Any]) -> ToolResult:
+    os.chdir(cwd)
+    tool = getattr(importlib.import_module(module), name)
+    try:
+        return asyncio.run(tool.execute(**kwargs))
+    except Exception as e:
+        # Returned, not raised: a raise here would make the caller rerun it inline
+        return ToolResult(outcome=f"Tool execution failed: {e!s}", error=True)
+
+
+async def run_cpu_bound(tool: Tool, kwargs: dict[str, Any]) -> ToolResult:
+    """Run tool.execute(**kwargs) in a worker process, or inline as a fallback."""
+    reference = _reference(tool)
+    if reference is None:
+        return await tool.execute(**kwargs)
+
+    explicit = getattr(tool, "explicit", frozenset[str]())
+    shipped = {k: v for k, v in kwargs.items() if k in tool.schema or k in explicit}
+    pool = _executor()
+    try:
+        future = pool.submit(_work, *reference, str(Path.cwd()), shipped)
+    except RuntimeError:  # Shut down or broken
+        _reset(pool)
+        return await tool.execute(**kwargs)
+
+    try:
+        return await asyncio.wrap_future(future)  # Cancelling also cancels a job not yet started
+    except BrokenProcessPool:
+        _reset(pool)
+        return await _fallback(tool, kwargs, "tool worker died")
+    except Exception:
+        # Args or result didn't pickle, or the tool wouldn't import in the worker
+        logger.debug("Process pool failed for %s", tool.name, exc_info=True)
+        return await _fallback(tool, kwargs, "process pool failed")
+
+
+async def _fallback(tool: Tool, kwargs: dict[str, Any], reason: str) -> ToolResult:
+    """Rerun inline, unless the tool mutates: the worker may already have written."""
+    if getattr(tool, "mutates", False) is True:
+        logger.warning("%s during %s; not rerunning a mutating tool", reason, tool.name)
+        return ToolResult(
+            outcome=f"Tool '{tool.name}' did not complete ({reason}). "
+            "Its changes may be partly applied; check before retrying.",
+            error=True,
+        )
+    logger.warning("%s during %s; running inline", reason, tool.name)
+    return await tool.execute(**kwargs)
+
+
+__all__ = ["MAX_WORKERS", "run_cpu_bound"]
@@ -159,6 +159,9 @@ class Storage(Protocol):
         include: list[str] | None = None,
         exclude: list[str] | None = None,
         limit: int | None = None,
+        *,
+        after_id: str | None = None,
+        after_timestamp: float | None = None,
     ) -> list[dict[str, Any]]: ...
     async def save_event(
         self, conversation_id: str, type: str, content: str, timestamp: float | None = None
@@ -323,6 +326,7 @@ class ToolParam:
     le: int | float | None = None
     min_length: int | None = None
     max_length: int | None = None
+    path: bool = False  # Filesystem path; cached results are checked against its mtime/size
 
 
 @runtime_checkable
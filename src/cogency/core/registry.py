@@ -0,0 +1,115 @@
+"""Name → tool lookup with each tool's context injection resolved up front.
+
+The executor injects context (storage, sandbox_dir, access, timeout,
+conversation_id, user_id) into tool calls. Which of these a tool receives is
+decided once here, from its signature, rather than per call:
+
+- Named parameters are always injected
+- A `**kwargs` catch-all receives all context except `timeout`, which only
+  tools that name it (or `shell`) get
+
+Scheduling hints (`idempotent`, `mutates`, `ttl`, `paths`, `cpu_bound`) are read from the tool's
+attributes the same way; `@tool` sets them, class-based tools may.
+"""
+
+import inspect
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, cast
+
+from .protocols import Tool
+
+CONTEXT = ("storage", "sandbox_dir", "access", "timeout", "conversation_id", "user_id")
+
+
+def accepted_context(tool: Tool) -> frozenset[str]:
+    """Context names the tool takes. `@tool` tools declare theirs as `accepts`."""
+    declared = getattr(tool, "accepts", None)
+    if isinstance(declared, frozenset):
+        return cast("frozenset[str]", declared)
+    try:
+        parameters = inspect.signature(tool.execute).parameters.values()
+    except (TypeError, ValueError):
+        parameters = ()
+    return context_from(parameters, shell=tool.name == "shell")
+
+
+def context_from(parameters: Iterable[inspect.Parameter], *, shell: bool = False) -> frozenset[str]:
+    parameters = list(parameters)
+    named = {p.name for p in parameters if p.kind is not inspect.Parameter.VAR_KEYWORD}
+    accepts = named.intersection(CONTEXT)
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters):
+        accepts.update(name for name in CONTEXT if name != "timeout")
+    if shell:
+        accepts.add("timeout")
+    return frozenset(accepts)
+
+
+def _flag(tool: Tool, name: str) -> bool:
+    return getattr(tool, name, False) is True
+
+
+@dataclass(frozen=True)
+class Binding:
+    """A tool plus the context it receives: fixed values and per-call flags."""
+
+    tool: Tool
+    fixed: Mapping[str, Any]
+    conversation_id: bool
+    user_id: bool
+    idempotent: bool = False
+    mutates: bool = False
+    ttl: float | None = None
+    paths: tuple[str, ...] = ()
+    cpu_bound: bool = False
+
+    def kwargs(self, args: Mapping[str, Any], conversation_id: str, user_id: str) -> dict[str, Any]:
+        kwargs = {**args, **self.fixed}
+        if self.conversation_id:
+            kwargs["conversation_id"] = conversation_id
+        if self.user_id and user_id:
+            kwargs["user_id"] = user_id
+        return kwargs
+
+    def path_args(self, args: Mapping[str, Any]) -> list[str]:
+        """Values of the path params, falling back to schema defaults."""
+        values = (args.get(p, self.tool.schema.get(p, {}).get("default")) for p in self.paths)
+        return [value for value in values if isinstance(value, str)]
+
+
+class ToolRegistry(Mapping[str, Binding]):
+    """Immutable registry. On duplicate names the first tool wins."""
+
+    def __init__(self, tools: Iterable[Tool], context: Mapping[str, Any]):
+        bindings: dict[str, Binding] = {}
+        for tool in tools:
+            if tool.name in bindings:
+                continue
+            accepts = accepted_context(tool)
+            ttl = getattr(tool, "ttl", None)
+            paths = getattr(tool, "paths", ())
+            bindings[tool.name] = Binding(
+                tool=tool,
+                fixed=MappingProxyType({k: v for k, v in context.items() if k in accepts}),
+                conversation_id="conversation_id" in accepts,
+                user_id="user_id" in accepts,
+                idempotent=_flag(tool, "idempotent"),
+                mutates=_flag(tool, "mutates"),
+                cpu_bound=_flag(tool, "cpu_bound"),
+                ttl=float(ttl) if isinstance(ttl, int | float) else None,
+                paths=tuple(cast("tuple[str, ...]", paths)) if isinstance(paths, tuple) else (),
+            )
+        self._bindings = MappingProxyType(bindings)
+
+    def __getitem__(self, name: str) -> Binding:
+        return self._bindings[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._bindings)
+
+    def __len__(self) -> int:
+        return len(self._bindings)
+
+
+__all__ = ["CONTEXT", "Binding", "ToolRegistry", "accepted_context"]
@@ -0,0 +1,88 @@
+"""Batch planning: coalesce duplicate reads, order calls that conflict on a path.
+
+For each call in an `<execute>` batch, in order:
+- An idempotent, non-mutating call identical to an earlier one (same tool and
+  args) reuses that call's result instead of running again
+- A call waits for every earlier call it conflicts with. Two calls conflict
+  when either mutates and they touch the same path, or one path contains the
+  other. A mutating tool with no path params (`shell`, `replace`) touches
+  everything, so it waits for all earlier calls and all later calls wait for it
+
+Everything else runs concurrently, as before.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .cache import ResultCache
+from .config import Execution
+from .errors import ToolError
+from .protocols import ToolCall
+from .security import resolve_file
+
+
+@dataclass
+class Step:
+    leader: int | None = None  # Earlier identical call whose result this one reuses
+    after: list[int] = field(default_factory=list[int])  # Earlier calls to wait for
+
+
+@dataclass(frozen=True)
+class _Touch:
+    mutates: bool
+    paths: tuple[Path, ...] | None  # None touches everything
+
+
+def _overlaps(a: Path, b: Path) -> bool:
+    return a == b or a in b.parents or b in a.parents
+
+
+def _conflicts(a: _Touch, b: _Touch) -> bool:
+    if not (a.mutates or b.mutates):
+        return False
+    if a.paths is None or b.paths is None:
+        return True
+    return any(_overlaps(x, y) for x in a.paths for y in b.paths)
+
+
+def _touch(call: ToolCall, execution: Execution) -> _Touch:
+    binding = execution.registry.get(call.name)
+    if binding is None:
+        return _Touch(mutates=False, paths=())  # Fails fast as unregistered
+    paths: list[Path] = []
+    for value in binding.path_args(call.args):
+        try:
+            paths.append(resolve_file(value, execution.access, execution.sandbox_dir))
+        except ToolError:
+            continue  # The call rejects the path itself
+    if binding.mutates and not binding.paths:
+        return _Touch(mutates=True, paths=None)
+    return _Touch(mutates=binding.mutates, paths=tuple(paths))
+
+
+def schedule(calls: Sequence[ToolCall], execution: Execution) -> list[Step]:
+    touches = [_touch(call, execution) for call in calls]
+    steps = [Step() for _ in calls]
+    seen: dict[str, int] = {}  # Dedup key -> first call still valid to share
+
+    for i, call in enumerate(calls):
+        touch = touches[i]
+        binding = execution.registry.get(call.name)
+        if binding is not None and binding.idempotent and not binding.mutates:
+            key = ResultCache.key(call.name, call.args)
+            if key in seen:
+                steps[i].leader = seen[key]
+                continue
+            seen[key] = i
+
+        steps[i].after = [
+            j for j in range(i) if steps[j].leader is None and _conflicts(touches[j], touch)
+        ]
+        if touch.mutates:
+            # Later duplicates must see this write, not share a result from before it
+            seen = {k: j for k, j in seen.items() if not _conflicts(touches[j], touch)}
+    return steps
+
+
+__all__ = ["Step", "schedule"]
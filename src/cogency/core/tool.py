@@ -7,6 +7,7 @@ from typing import Annotated, Any, cast, get_args, get_origin
 
 from .errors import ToolError
 from .protocols import Tool, ToolParam, ToolResult
+from .registry import context_from
 
 TYPE_MAP = {str: "string", int: "integer", float: "float", bool: "boolean"}
 
@@ -117,7 +118,23 @@ def _validate_args(schema: dict[str, Any], args: dict[str, Any]) -> None:
         raise ToolError("; ".join(errors), validation_failed=True)
 
 
-def tool(desc: str):
+def tool(
+    desc: str,
+    *,
+    idempotent: bool = False,
+    mutates: bool = False,
+    ttl: float | None = None,
+    cpu_bound: bool = False,
+):
+    """Make a Tool from an async function taking a params dataclass.
+
+    idempotent: same args give the same result while the `path` params are
+    unchanged, so results may be cached (for `ttl` seconds, if set).
+    mutates: the tool changes the workspace; running it invalidates cached results.
+    cpu_bound: the executor runs it in a worker process (see core.pool). The
+    function must be defined at module level; params and result must pickle.
+    """
+
     def decorator(func: Callable[..., Any]) -> Tool:
         sig = inspect.signature(func)
         params_arg = next(iter(sig.parameters.values()))
@@ -129,11 +146,29 @@ def tool(desc: str):
         tool_name = func.__name__.lower()
         tool_schema = _build_schema(params_type)
         param_names = {f.name for f in fields(params_type)}
+        path_params = tuple(
+            f.name for f in fields(params_type) if (p := _tool_param(f.type)) and p.path
+        )
+        is_idempotent, is_mutating, cache_ttl, is_cpu_bound = idempotent, mutates, ttl, cpu_bound
+        # Context the function takes besides params; the registry injects only these
+        extra = list(sig.parameters.values())[1:]
+        context = context_from(extra, shell=tool_name == "shell")
+        named = frozenset(p.name for p in extra if p.kind is not inspect.Parameter.VAR_KEYWORD)
 
         class FunctionTool(Tool):
             name = tool_name
             description = desc
             schema = tool_schema
+            accepts = context
+            paths = path_params
+            idempotent = is_idempotent
+            mutates = is_mutating
+            ttl = cache_ttl
+            cpu_bound = is_cpu_bound
+            explicit = named
+            # Import reference for worker processes: the module attribute holding this tool
+            module = func.__module__
+            qualname = func.__name__
 
             async def execute(self, **kwargs: Any) -> ToolResult:
                 tool_params: dict[str, Any] = {k: v for k, v in kwargs.items() if k in param_names}
@@ -0,0 +1,48 @@
+"""Incremental conversation reads on top of `Storage.load_messages` cursors."""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from cogency.core.protocols import Storage
+
+PAGE_SIZE = 500
+
+
+async def iter_messages(
+    storage: Storage,
+    conversation_id: str,
+    user_id: str,
+    *,
+    after_id: str | None = None,
+    after_timestamp: float | None = None,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    page_size: int = PAGE_SIZE,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield a conversation's messages oldest first, `page_size` rows per storage read.
+
+    Each row carries its message_id; pass the last one back as `after_id` to resume.
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be >= 1, got {page_size}")
+    if after_id is None and after_timestamp is None:
+        after_timestamp = float("-inf")  # A cursor makes limit page forward from the start
+
+    while True:
+        page = await storage.load_messages(
+            conversation_id,
+            user_id,
+            include,
+            exclude,
+            page_size,
+            after_id=after_id,
+            after_timestamp=after_timestamp,
+        )
+        for row in page:
+            yield row
+        if len(page) < page_size:
+            return
+        after_id, after_timestamp = page[-1]["message_id"], None
+
+
+__all__ = ["iter_messages"]
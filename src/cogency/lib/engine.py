@@ -0,0 +1,284 @@
+"""SQLite engine: dedicated threads that own their connections, driven from asyncio.
+
+- One writer thread per database file. Writes queued together commit in a single
+  transaction (one savepoint per job), so a burst of saves shares one fsync.
+- Up to `readers` reader threads, started on demand. Reads never wait behind writes.
+- Results come back through asyncio futures; the default executor is not used.
+
+Threads exit after `idle_timeout` seconds without work and restart on the next
+request. `:memory:` engines keep a single connection (reads go to the writer) and
+never idle out, since closing the connection would drop the database.
+"""
+
+import asyncio
+import contextlib
+import logging
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, ClassVar, Generic, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+READERS = 2
+IDLE_TIMEOUT = 10.0  # Seconds a thread waits for work before exiting
+WRITE_BATCH = 64  # Max queued writes committed in one transaction
+
+
+@dataclass(eq=False)
+class _Job(Generic[T]):
+    fn: Callable[[sqlite3.Connection], T]
+    loop: asyncio.AbstractEventLoop
+    future: "asyncio.Future[T]"
+    atomic: bool = True
+
+
+_STOP: Any = object()
+
+
+def _settle(job: _Job[Any], result: Any = None, error: BaseException | None = None) -> None:
+    def _set() -> None:
+        if job.future.done():
+            return  # Caller was cancelled; the work itself still ran
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    with contextlib.suppress(RuntimeError):  # Loop closed while the job ran
+        job.loop.call_soon_threadsafe(_set)
+
+
+def _run(conn: sqlite3.Connection, job: _Job[Any]) -> tuple[Any, BaseException | None]:
+    conn.row_factory = None  # Jobs may set their own
+    try:
+        return job.fn(conn), None
+    except Exception as e:
+        return None, e
+
+
+class Engine:
+    """Per-file SQLite threads. Use `Engine.for_path`; jobs receive a connection."""
+
+    _engines: ClassVar[dict[str, "Engine"]] = {}
+    _registry_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: str,
+        connect: Callable[[str], sqlite3.Connection],
+        *,
+        readers: int = READERS,
+        idle_timeout: float | None = IDLE_TIMEOUT,
+        optimize_every: int | None = None,
+    ):
+        self.db_path = db_path
+        self._connect = connect
+        self._memory = db_path == ":memory:"
+        self._readers = 0 if self._memory else max(readers, 1)
+        self._idle_timeout = None if self._memory else idle_timeout
+        self._optimize_every = optimize_every
+
+        self._lock = threading.Lock()
+        self._writes: queue.SimpleQueue[_Job[Any]] = queue.SimpleQueue()
+        self._reads: queue.SimpleQueue[_Job[Any]] = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+        self._reader_threads = 0
+        self._idle_readers = 0
+        self._closed = False
+
+        self.stats = {"writes": 0, "reads": 0, "commits": 0, "peak_batch": 0, "optimizes": 0}
+
+    @classmethod
+    def for_path(
+        cls, db_path: str, connect: Callable[[str], sqlite3.Connection], **options: Any
+    ) -> "Engine":
+        """Shared engine per file. `:memory:` gets a private one (owner must close it).
+
+        Options apply when the engine is created; later callers share it as is.
+        """
+        if db_path == ":memory:":
+            return cls(db_path, connect, **options)
+        with cls._registry_lock:
+            engine = cls._engines.get(db_path)
+            if engine is None or engine._closed:
+                engine = cls._engines[db_path] = cls(db_path, connect, **options)
+            return engine
+
+    async def write(self, fn: Callable[[sqlite3.Connection], T], *, atomic: bool = True) -> T:
+        """Run fn on the writer. atomic=False runs it alone, outside a transaction (VACUUM)."""
+        return await self._submit(fn, write=True, atomic=atomic)
+
+    async def read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        return await self._submit(fn, write=self._memory, atomic=True)
+
+    async def _submit(
+        self, fn: Callable[[sqlite3.Connection], T], *, write: bool, atomic: bool
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        job = _Job(fn, loop, loop.create_future(), atomic)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Engine for {self.db_path} is closed")
+            if write:
+                self._writes.put(job)
+                if self._writer is None:
+                    self._writer = self._start(self._write_loop)
+            else:
+                self._reads.put(job)
+                if (
+                    self._reads.qsize() > self._idle_readers
+                    and self._reader_threads < self._readers
+                ):
+                    self._reader_threads += 1
+                    self._start(self._read_loop)
+        return await job.future
+
+    def _start(self, target: Callable[[], None]) -> threading.Thread:
+        thread = threading.Thread(
+            target=target, name=f"cogency-sqlite{target.__name__}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _next(self, jobs: "queue.SimpleQueue[_Job[Any]]", *, reader: bool) -> _Job[Any] | None:
+        """Block for the next job. None means the thread should exit."""
+        while True:
+            try:
+                return jobs.get(timeout=self._idle_timeout)
+            except queue.Empty:
+                # Retire under the lock so a concurrent submit starts a fresh thread
+                with self._lock:
+                    if not jobs.empty():
+                        continue
+                    if reader:
+                        self._reader_threads -= 1
+                        self._idle_readers -= 1
+                    else:
+                        self._writer = None
+                    return None
+
+    def _open(
+        self, jobs: "queue.SimpleQueue[_Job[Any]]", *, reader: bool
+    ) -> sqlite3.Connection | None:
+        try:
+            conn = self._connect(self.db_path)
+        except Exception as e:
+            # Fail what's queued rather than leaving callers waiting on a dead thread
+            with self._lock:
+                while not jobs.empty():
+                    job = jobs.get_nowait()
+                    if job is not _STOP:
+                        _settle(job, error=e)
+                if reader:
+                    self._reader_threads -= 1
+                else:
+                    self._writer = None
+            return None
+        conn.isolation_level = None  # Transactions are explicit; reads see the latest commit
+        return conn
+
+    def _write_loop(self) -> None:
+        conn = self._open(self._writes, reader=False)
+        if conn is None:
+            return
+        carry: _Job[Any] | None = None
+        try:
+            while True:
+                job = carry if carry is not None else self._next(self._writes, reader=False)
+                carry = None
+                if job is None or job is _STOP:
+                    return
+                if not job.atomic:
+                    self.stats["writes"] += 1
+                    _settle(job, *_run(conn, job))
+                    continue
+
+                batch = [job]
+                while len(batch) < WRITE_BATCH:
+                    try:
+                        queued = self._writes.get_nowait()
+                    except queue.Empty:
+                        break
+                    if queued is _STOP or not queued.atomic:
+                        carry = queued  # Handled after this commit
+                        break
+                    batch.append(queued)
+                self._commit(conn, batch)
+                if self._optimize_every and self.stats["commits"] % self._optimize_every == 0:
+                    self._optimize(conn)
+        finally:
+            if self._optimize_every:
+                self._optimize(conn)  # Recommended before closing a connection that wrote
+            conn.close()
+
+    def _optimize(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            logger.debug("PRAGMA optimize failed for %s", self.db_path, exc_info=True)
+        else:
+            self.stats["optimizes"] += 1
+
+    def _commit(self, conn: sqlite3.Connection, batch: list[_Job[Any]]) -> None:
+        """One transaction for the batch; a failing job rolls back only its savepoint."""
+        outcomes: list[tuple[Any, BaseException | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for job in batch:
+                conn.execute("SAVEPOINT job")
+                result, error = _run(conn, job)
+                if error is not None:
+                    conn.execute("ROLLBACK TO job")
+                conn.execute("RELEASE job")
+                outcomes.append((result, error))
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            outcomes = [(None, e)] * len(batch)
+
+        self.stats["writes"] += len(batch)
+        self.stats["commits"] += 1
+        self.stats["peak_batch"] = max(self.stats["peak_batch"], len(batch))
+        for job, (result, error) in zip(batch, outcomes, strict=True):
+            _settle(job, result, error)
+
+    def _read_loop(self) -> None:
+        conn = self._open(self._reads, reader=True)
+        if conn is None:
+            return
+        try:
+            while True:
+                with self._lock:
+                    self._idle_readers += 1
+                job = self._next(self._reads, reader=True)
+                if job is None:
+                    return  # Retired; counters already updated
+                with self._lock:
+                    self._idle_readers -= 1
+                    if job is _STOP:
+                        self._reader_threads -= 1
+                        return
+                    self.stats["reads"] += 1
+                _settle(job, *_run(conn, job))
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        """Stop threads once queued work finishes. Later submits raise."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._writer is not None:
+                self._writes.put(_STOP)
+            for _ in range(self._reader_threads):
+                self._reads.put(_STOP)
+
+
+__all__ = ["Engine"]
@@ -0,0 +1,269 @@
+"""Shared async HTTP fetching for web tools: pooled client, per-host limits, disk cache.
+
+- One httpx.AsyncClient per event loop, with keep-alive connections reused
+  across calls and tools
+- At most PER_HOST requests in flight to any one host
+- Bodies are streamed and abandoned past MAX_FETCH_BYTES (ResponseTooLarge)
+- Responses cached on disk under CACHE_DIR. Within CACHE_TTL a cached body is
+  served without touching the network; after that the request is revalidated
+  with If-None-Match / If-Modified-Since, and a 304 refreshes the entry
+- Cache files are written to a temp file and renamed into place, and the meta
+  records the body's digest, so a crash or two racing writers can't pair one
+  response's validators with another's body
+- Entries idle past CACHE_MAX_AGE are evicted, then the oldest until the cache
+  fits CACHE_MAX_BYTES; sweeps run at most every SWEEP_INTERVAL seconds
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import weakref
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(".cogency/cache/http")
+CACHE_TTL = 15 * 60.0  # Seconds a cached response is served without revalidating
+PER_HOST = 4
+TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30.0)
+MAX_FETCH_BYTES = 20 * 1024 * 1024  # Larger responses are refused
+MAX_BODY = 5 * 1024 * 1024  # Bytes; larger responses are fetched but not cached
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_MAX_AGE = 7 * 24 * 3600.0  # Seconds since an entry was last stored or revalidated
+SWEEP_INTERVAL = 60.0
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; cogency)"}
+
+
+@dataclass(frozen=True)
+class Response:
+    url: str
+    status: int
+    text: str
+    cached: bool = False  # Served from disk, fresh or revalidated
+
+
+class ResponseTooLarge(httpx.HTTPError):
+    """The response body exceeded MAX_FETCH_BYTES; nothing past the limit was read."""
+
+
+@dataclass
+class _LoopState:
+    client: httpx.AsyncClient
+    hosts: dict[str, asyncio.Semaphore]
+
+
+# Clients and semaphores bind to their loop; keyed weakly so closed loops drop out
+_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    state = _states.get(loop)
+    if state is None or state.client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=TIMEOUT, limits=LIMITS, headers=HEADERS, follow_redirects=True
+        )
+        state = _states[loop] = _LoopState(client, {})
+    return state
+
+
+def _host_limit(state: _LoopState, url: str) -> asyncio.Semaphore:
+    host = urlparse(url).netloc.lower()
+    return state.hosts.setdefault(host, asyncio.Semaphore(PER_HOST))
+
+
+def _paths(url: str, directory: Path) -> tuple[Path, Path]:
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return directory / f"{digest}.json", directory / f"{digest}.body"
+
+
+def _digest(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _load(url: str, directory: Path) -> tuple[dict[str, object], str] | None:
+    meta_path, body_path = _paths(url, directory)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        body = body_path.read_text(encoding="utf-8")
+    except (OSError, ValueError):
+        return None
+    if meta.get("url") != url or meta.get("digest") != _digest(body):
+        return None  # Interrupted or interleaved write: treat as a miss
+    return meta, body
+
+
+def _write_atomic(path: Path, data: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        Path(tmp).replace(path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _store(url: str, directory: Path, meta: Mapping[str, object], body: str | None) -> None:
+    meta_path, body_path = _paths(url, directory)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        if body is not None:
+            _write_atomic(body_path, body)
+            meta = {**meta, "digest": _digest(body)}
+        _write_atomic(meta_path, json.dumps({**meta, "url": url}))
+    except OSError:
+        logger.debug("HTTP cache write failed for %s", url, exc_info=True)
+        return
+    _maybe_sweep(directory)
+
+
+_sweep_lock = threading.Lock()
+_last_sweep: dict[Path, float] = {}
+
+
+def _maybe_sweep(directory: Path) -> None:
+    now = time.monotonic()
+    with _sweep_lock:
+        if now - _last_sweep.get(directory, float("-inf")) < SWEEP_INTERVAL:
+            return
+        _last_sweep[directory] = now
+    try:
+        sweep(directory)
+    except OSError:
+        logger.debug("HTTP cache sweep failed for %s", directory, exc_info=True)
+
+
+def sweep(
+    directory: Path | None = None, *, max_bytes: int | None = None, max_age: float | None = None
+) -> int:
+    """Evict stale entries, then the least recently stored until under max_bytes.
+
+    Returns entries removed.
+    """
+    directory = CACHE_DIR if directory is None else directory
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    max_age = CACHE_MAX_AGE if max_age is None else max_age
+
+    entries: dict[str, list[os.stat_result]] = {}
+    orphan_cutoff = time.time() - SWEEP_INTERVAL  # Temp files a crashed writer left
+    with os.scandir(directory) as it:
+        for entry in it:
+            stem, _, kind = entry.name.rpartition(".")
+            with contextlib.suppress(OSError):
+                if entry.name.startswith("."):
+                    if kind == "tmp" and entry.stat().st_mtime < orphan_cutoff:
+                        Path(entry.path).unlink(missing_ok=True)
+                elif kind in ("json", "body"):
+                    entries.setdefault(stem, []).append(entry.stat())
+
+    # An entry's age is its newest file: a 304 refreshes only the meta
+    ranked = sorted(
+        (max(s.st_mtime for s in stats), sum(s.st_size for s in stats), stem)
+        for stem, stats in entries.items()
+    )
+    total = sum(size for _, size, _ in ranked)
+    cutoff = time.time() - max_age
+    removed = 0
+    for mtime, size, stem in ranked:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        for suffix in (".json", ".body"):  # Meta first: a lone body is never served
+            (directory / f"{stem}{suffix}").unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+async def fetch(url: str, *, cache_dir: Path | None = None, ttl: float | None = None) -> Response:
+    """GET url through the shared client and disk cache. Raises httpx.HTTPError on failure."""
+    directory = CACHE_DIR if cache_dir is None else cache_dir
+    ttl = CACHE_TTL if ttl is None else ttl
+    cached = await asyncio.to_thread(_load, url, directory)
+
+    headers: dict[str, str] = {}
+    if cached is not None:
+        meta, body = cached
+        fetched_at = meta.get("fetched_at")
+        if isinstance(fetched_at, int | float) and time.time() - fetched_at < ttl:
+            return Response(url, 200, body, cached=True)
+        if isinstance(etag := meta.get("etag"), str):
+            headers["If-None-Match"] = etag
+        if isinstance(modified := meta.get("last_modified"), str):
+            headers["If-Modified-Since"] = modified
+
+    state = _state()
+    async with (
+        _host_limit(state, url),
+        state.client.stream("GET", url, headers=headers) as response,
+    ):
+        if response.status_code == 304 and cached is not None:
+            meta, body = cached
+            refreshed = {**meta, "fetched_at": time.time()}
+            await asyncio.to_thread(_store, url, directory, refreshed, None)
+            return Response(url, 200, body, cached=True)
+
+        response.raise_for_status()
+        content = await _read_capped(response, url)
+
+    text = content.decode(response.encoding or "utf-8", errors="replace")
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    if len(content) <= MAX_BODY and "no-store" not in response.headers.get("Cache-Control", ""):
+        meta = {"fetched_at": time.time(), **validators}
+        await asyncio.to_thread(_store, url, directory, meta, text)
+    return Response(str(response.url), response.status_code, text)
+
+
+async def _read_capped(response: httpx.Response, url: str) -> bytes:
+    too_large = f"Response from {url} exceeds {MAX_FETCH_BYTES} bytes"
+    declared = response.headers.get("Content-Length", "")
+    if declared.isdigit() and int(declared) > MAX_FETCH_BYTES:
+        raise ResponseTooLarge(too_large)
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        size += len(chunk)
+        if size > MAX_FETCH_BYTES:
+            raise ResponseTooLarge(too_large)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def close() -> None:
+    """Close the running loop's client (the next fetch opens a new one)."""
+    state = _states.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        with contextlib.suppress(Exception):
+            await state.client.aclose()
+
+
+__all__ = [
+    "CACHE_DIR",
+    "CACHE_MAX_AGE",
+    "CACHE_MAX_BYTES",
+    "CACHE_TTL",
+    "MAX_FETCH_BYTES",
+    "PER_HOST",
+    "Response",
+    "ResponseTooLarge",
+    "close",
+    "fetch",
+    "sweep",
+]
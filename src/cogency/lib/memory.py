@@ -0,0 +1,292 @@
+"""In-memory storage: dicts and lists, no durability.
+
+For stateless API workers, tests and benchmarks. Layout:
+- Per-conversation append-only message and event lists (timestamp order)
+- Per-user index of 'user' messages for counts, loads and search
+- Versioned profiles per user
+
+`max_conversations` bounds memory: the least recently written conversation is
+evicted whole (messages and events), like retention expiring a conversation.
+"""
+
+import bisect
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from cogency.core.protocols import MessageMatch, parse_metric_data_dict, parse_profile_dict
+
+from .sqlite import PROFILE_VERSIONS
+from .uuid7 import uuid7
+
+
+@dataclass(frozen=True)
+class _Message:
+    message_id: str
+    conversation_id: str
+    user_id: str
+    type: str
+    content: str
+    timestamp: float
+
+
+@dataclass
+class _Conversation:
+    messages: list[_Message] = field(default_factory=list[_Message])
+    events: list[tuple[float, str, str, str]] = field(
+        default_factory=list[tuple[float, str, str, str]]
+    )  # (timestamp, type, content, event_id)
+
+
+def _insert(rows: list[Any], row: Any, timestamp: float) -> None:
+    """Append, or insert in place when a caller supplies an out-of-order timestamp."""
+    if not rows or _timestamp(rows[-1]) <= timestamp:
+        rows.append(row)
+    else:
+        rows.insert(bisect.bisect_right(rows, timestamp, key=_timestamp), row)
+
+
+def _timestamp(row: _Message | tuple[float, str, str, str]) -> float:
+    return row.timestamp if isinstance(row, _Message) else row[0]
+
+
+class MemoryStorage:
+    """Storage held in process memory. Not shared across processes; lost on exit."""
+
+    def __init__(
+        self,
+        *,
+        max_conversations: int | None = None,
+        profile_versions: int | None = PROFILE_VERSIONS,
+    ):
+        if max_conversations is not None and max_conversations < 1:
+            raise ValueError(f"max_conversations must be >= 1, got {max_conversations}")
+        self.max_conversations = max_conversations
+        self.profile_versions = profile_versions
+
+        self._conversations: OrderedDict[str, _Conversation] = OrderedDict()
+        self._user_messages: dict[str, list[_Message]] = {}
+        self._by_id: dict[str, _Message] = {}
+        self._profiles: dict[str, list[dict[str, Any]]] = {}
+
+    def _conversation(self, conversation_id: str) -> _Conversation:
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            conversation = self._conversations[conversation_id] = _Conversation()
+            self._evict()
+        else:
+            self._conversations.move_to_end(conversation_id)
+        return conversation
+
+    def _evict(self) -> None:
+        if self.max_conversations is None:
+            return
+        while len(self._conversations) > self.max_conversations:
+            conversation_id, conversation = self._conversations.popitem(last=False)
+            for message in conversation.messages:
+                del self._by_id[message.message_id]
+            for user_id in {m.user_id for m in conversation.messages if m.type == "user"}:
+                remaining = [
+                    m
+                    for m in self._user_messages.get(user_id, [])
+                    if m.conversation_id != conversation_id
+                ]
+                if remaining:
+                    self._user_messages[user_id] = remaining
+                else:
+                    self._user_messages.pop(user_id, None)
+
+    async def save_message(
+        self,
+        conversation_id: str,
+        user_id: str,
+        type: str,
+        content: str,
+        timestamp: float | None = None,
+    ) -> str:
+        if timestamp is None:
+            timestamp = time.time()
+
+        message = _Message(uuid7(), conversation_id, user_id, type, content, timestamp)
+        _insert(self._conversation(conversation_id).messages, message, timestamp)
+        self._by_id[message.message_id] = message
+        if user_id and type == "user":
+            _insert(self._user_messages.setdefault(user_id, []), message, timestamp)
+        return message.message_id
+
+    async def save_event(
+        self, conversation_id: str, type: str, content: str, timestamp: float | None = None
+    ) -> str:
+        if timestamp is None:
+            timestamp = time.time()
+
+        event_id = uuid7()
+        event = (timestamp, type, content, event_id)
+        _insert(self._conversation(conversation_id).events, event, timestamp)
+        return event_id
+
+    async def save_request(
+        self,
+        conversation_id: str,
+        user_id: str,
+        messages: str,
+        response: str | None = None,
+        timestamp: float | None = None,
+    ) -> str:
+        content = json.dumps({"messages": messages, "response": response})
+        return await self.save_event(conversation_id, "request", content, timestamp)
+
+    async def load_requests(self, conversation_id: str) -> list[dict[str, Any]]:
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            return []
+        requests: list[dict[str, Any]] = []
+        for timestamp, type, content, event_id in conversation.events:
+            if type == "request":
+                payload = json.loads(content)
+                requests.append(
+                    {
+                        "event_id": event_id,
+                        "messages": payload["messages"],
+                        "response": payload["response"],
+                        "timestamp": timestamp,
+                    }
+                )
+        return requests
+
+    async def load_messages(
+        self,
+        conversation_id: str,
+        user_id: str,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        limit: int | None = None,
+        *,
+        after_id: str | None = None,
+        after_timestamp: float | None = None,
+    ) -> list[dict[str, Any]]:
+        if after_id is not None and after_timestamp is not None:
+            raise ValueError("Pass after_id or after_timestamp, not both")
+
+        conversation = self._conversations.get(conversation_id)
+        rows = conversation.messages if conversation is not None else []
+
+        forward = after_id is not None or after_timestamp is not None
+        if after_id is not None:
+            rows = rows[self._after(rows, conversation_id, after_id) :]
+        elif after_timestamp is not None:
+            rows = rows[bisect.bisect_right(rows, after_timestamp, key=_timestamp) :]
+
+        if user_id:
+            rows = [m for m in rows if m.user_id == user_id]
+        if include:
+            rows = [m for m in rows if m.type in include]
+        elif exclude:
+            rows = [m for m in rows if m.type not in exclude]
+        if limit is not None:
+            if forward:
+                rows = rows[:limit]
+            else:
+                rows = rows[-limit:] if limit > 0 else []
+
+        return [
+            {
+                "message_id": m.message_id,
+                "type": m.type,
+                "content": m.content,
+                "timestamp": m.timestamp,
+            }
+            for m in rows
+        ]
+
+    def _after(self, rows: list[_Message], conversation_id: str, after_id: str) -> int:
+        """Index just past the cursor message."""
+        cursor = self._by_id.get(after_id)
+        if cursor is None or cursor.conversation_id != conversation_id:
+            raise ValueError(f"Unknown message cursor: {after_id}")
+        start = bisect.bisect_left(rows, cursor.timestamp, key=_timestamp)
+        return rows.index(cursor, start) + 1
+
+    async def save_profile(self, user_id: str, profile: dict[str, Any]) -> None:
+        versions = self._profiles.setdefault(user_id, [])
+        # Round-trip through JSON so later mutation of the caller's dict isn't stored
+        versions.append(json.loads(json.dumps(profile)))
+        if self.profile_versions is not None:
+            del versions[: -max(self.profile_versions, 1)]
+
+    async def load_profile(self, user_id: str) -> dict[str, Any]:
+        versions = self._profiles.get(user_id)
+        if not versions:
+            return {}
+        return dict(parse_profile_dict(json.loads(json.dumps(versions[-1]))))
+
+    async def delete_profile(self, user_id: str) -> int:
+        return len(self._profiles.pop(user_id, []))
+
+    async def count_user_messages(self, user_id: str, since_timestamp: float = 0) -> int:
+        rows = self._user_messages.get(user_id, [])
+        return len(rows) - bisect.bisect_right(rows, since_timestamp, key=_timestamp)
+
+    async def load_user_messages(
+        self, user_id: str, since_timestamp: float = 0, limit: int | None = None
+    ) -> list[str]:
+        rows = self._user_messages.get(user_id, [])
+        start = bisect.bisect_right(rows, since_timestamp, key=_timestamp)
+        end = len(rows) if limit is None else start + limit
+        return [m.content for m in rows[start:end]]
+
+    async def load_latest_metric(self, conversation_id: str) -> dict[str, Any] | None:
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None:
+            return None
+        for _, type, content, _ in reversed(conversation.events):
+            if type == "metric" and content:
+                return dict(parse_metric_data_dict(json.loads(content)))
+        return None
+
+    async def load_messages_by_conversation_id(
+        self, conversation_id: str, limit: int
+    ) -> list[dict[str, Any]]:
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None or limit <= 0:
+            return []
+
+        rows: list[dict[str, Any]] = []
+        for message in reversed(conversation.messages):
+            if message.type == "user":
+                rows.append({"timestamp": message.timestamp, "content": message.content})
+                if len(rows) == limit:
+                    break
+        return rows
+
+    async def search_messages(
+        self, query: str, user_id: str, exclude_conversation_id: str | None, limit: int = 3
+    ) -> list[MessageMatch]:
+        keywords = query.lower().split()
+        if not keywords:
+            return []
+
+        scored: list[tuple[int, float, _Message]] = []
+        for message in self._user_messages.get(user_id, []):
+            if exclude_conversation_id and message.conversation_id == exclude_conversation_id:
+                continue
+            lowered = message.content.lower()
+            # Same relevance as SQLite: characters covered by keyword occurrences
+            score = sum(lowered.count(keyword) * len(keyword) for keyword in keywords)
+            if score:
+                scored.append((score, message.timestamp, message))
+
+        scored.sort(key=lambda row: (row[0], row[1]), reverse=True)
+        return [
+            MessageMatch(
+                content=message.content,
+                timestamp=message.timestamp,
+                conversation_id=message.conversation_id,
+            )
+            for _, _, message in scored[:limit]
+        ]
+
+
+__all__ = ["MemoryStorage"]
@@ -0,0 +1,239 @@
+"""Retention for messages and events: TTL expiry, optional archival, batched deletes.
+
+Conversations expire as a unit once their newest message is older than
+`messages_ttl`, so active history is never trimmed. A stale conversation is
+deleted oldest-first in batches and re-checked before each one, so if it is
+resumed mid-delete, the rest is kept. Events expire per row, with per-type
+TTLs overriding `events_ttl`.
+
+Archived rows are appended to gzip JSONL files partitioned by month
+(`messages-2025-01.jsonl.gz`). Every batch commits in its own short
+transaction, so retention never holds the write lock for long.
+"""
+
+import asyncio
+import gzip
+import json
+import sqlite3
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .sqlite import DB, decode_content, drop_user_stats, references, release_blobs
+
+RETENTION_BATCH = 500
+
+_MESSAGE_COLUMNS = ("message_id", "conversation_id", "user_id", "type", "content", "timestamp")
+_EVENT_COLUMNS = ("event_id", "conversation_id", "type", "content", "timestamp")
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """TTLs in seconds. None keeps rows forever."""
+
+    messages_ttl: float | None = None
+    events_ttl: float | None = None
+    event_ttls: Mapping[str, float | None] = field(default_factory=dict[str, float | None])
+    archive_dir: str | None = None  # None deletes without archiving
+    batch_size: int = RETENTION_BATCH
+
+
+def _partition(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=UTC).strftime("%Y-%m")
+
+
+def _archive(archive_dir: str, table: str, rows: list[dict[str, Any]]) -> None:
+    partitions: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        partitions.setdefault(_partition(row["timestamp"]), []).append(row)
+
+    directory = Path(archive_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    for month, batch in partitions.items():
+        # Appending adds a gzip member; readers see one continuous stream
+        with gzip.open(directory / f"{table}-{month}.jsonl.gz", "at", encoding="utf-8") as f:
+            f.writelines(json.dumps(row) + "\n" for row in batch)
+
+
+def read_archive(path: str | Path) -> list[dict[str, Any]]:
+    """Load archived rows from a .jsonl.gz partition."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _decoded(
+    db: sqlite3.Connection, columns: tuple[str, ...], row: Sequence[Any]
+) -> dict[str, Any]:
+    """Row as an archive record: stored content is decoded, the encoding dropped."""
+    record = dict(zip(columns, row[:-1], strict=True))
+    record["content"] = decode_content(db, record["content"], row[-1])
+    return record
+
+
+def _expire_conversations(db_path: str, policy: RetentionPolicy, cutoff: float) -> dict[str, int]:
+    stats = {"conversations": 0, "messages": 0, "blobs": 0}
+    while True:
+        with DB.connect(db_path) as db:
+            expired = [
+                row[0]
+                for row in db.execute(
+                    "SELECT conversation_id FROM messages GROUP BY conversation_id HAVING MAX(timestamp) < ? LIMIT ?",
+                    (cutoff, policy.batch_size),
+                )
+            ]
+        if not expired:
+            return stats
+
+        for conversation_id in expired:
+            removed, blobs = _drop_conversation(db_path, conversation_id, cutoff, policy)
+            stats["messages"] += removed
+            stats["conversations"] += bool(removed)
+            stats["blobs"] += blobs
+
+
+def _release(db: sqlite3.Connection, batch: list[Any]) -> int:
+    """Release the blobs and prompt chains deleted rows (content, encoding last) held."""
+    refs = [references(row[-3], row[-1]) for row in batch]
+    blobs = [blob for blob, _ in refs if blob is not None]
+    return release_blobs(db, blobs, [head for _, head in refs if head is not None])
+
+
+def _drop_conversation(
+    db_path: str, conversation_id: str, cutoff: float, policy: RetentionPolicy
+) -> tuple[int, int]:
+    """Delete a stale conversation oldest-first, `batch_size` messages per transaction.
+
+    Returns (messages, blobs) removed.
+    """
+    removed = blobs = 0
+    while True:
+        with DB.connect(db_path) as db:
+            # Check, select and delete under one write lock: selected as stale
+            # earlier, a conversation resumed since keeps what's left of it
+            db.execute("BEGIN IMMEDIATE")
+            newest = db.execute(
+                "SELECT MAX(timestamp) FROM messages WHERE conversation_id = ?",
+                (conversation_id,),
+            ).fetchone()[0]
+            if newest is None or newest >= cutoff:
+                return removed, blobs
+
+            batch = db.execute(
+                f"SELECT rowid, {', '.join(_MESSAGE_COLUMNS)}, encoding FROM messages WHERE conversation_id = ? ORDER BY timestamp LIMIT ?",
+                (conversation_id, policy.batch_size),
+            ).fetchall()
+            rows: list[dict[str, Any]] = (
+                [_decoded(db, _MESSAGE_COLUMNS, row[1:]) for row in batch]
+                if policy.archive_dir
+                else []
+            )
+            drop_user_stats(db, [(row[3], row[6]) for row in batch if row[4] == "user"])
+            db.executemany("DELETE FROM messages WHERE rowid = ?", [(row[0],) for row in batch])
+            blobs += _release(db, batch)
+
+        # Archived once committed: a failed commit is retried without duplicates
+        if policy.archive_dir:
+            _archive(policy.archive_dir, "messages", rows)
+        removed += len(batch)
+        if len(batch) < policy.batch_size:
+            return removed, blobs
+
+
+def _delete_events(
+    db_path: str, where: str, params: tuple[Any, ...], policy: RetentionPolicy
+) -> tuple[int, int]:
+    """Delete matching events in batches. Returns (events, blobs) removed."""
+    removed = blobs = 0
+    while True:
+        with DB.connect(db_path) as db:
+            cursor = db.execute(
+                f"SELECT rowid, {', '.join(_EVENT_COLUMNS)}, encoding FROM events WHERE {where} LIMIT ?",
+                (*params, policy.batch_size),
+            )
+            batch = cursor.fetchall()
+            rows: list[dict[str, Any]] = (
+                [_decoded(db, _EVENT_COLUMNS, row[1:]) for row in batch]
+                if policy.archive_dir
+                else []
+            )
+            db.executemany("DELETE FROM events WHERE rowid = ?", [(row[0],) for row in batch])
+            blobs += _release(db, batch)
+
+        if policy.archive_dir and rows:
+            _archive(policy.archive_dir, "events", rows)
+        removed += len(batch)
+        if len(batch) < policy.batch_size:
+            return removed, blobs
+
+
+def _expire_events(db_path: str, policy: RetentionPolicy, now: float) -> tuple[int, int]:
+    rules: list[tuple[str, tuple[Any, ...]]] = [
+        ("type = ? AND timestamp < ?", (event_type, now - ttl))
+        for event_type, ttl in policy.event_ttls.items()
+        if ttl is not None
+    ]
+    if policy.events_ttl is not None:
+        overridden = list(policy.event_ttls)
+        where = "timestamp < ?"
+        if overridden:
+            where += f" AND type NOT IN ({','.join('?' for _ in overridden)})"
+        rules.append((where, (now - policy.events_ttl, *overridden)))
+
+    removed = blobs = 0
+    for where, params in rules:
+        events, released = _delete_events(db_path, where, params, policy)
+        removed += events
+        blobs += released
+    return removed, blobs
+
+
+def apply_retention_sync(
+    policy: RetentionPolicy, db_path: str = ".cogency/store.db", *, now: float | None = None
+) -> dict[str, int]:
+    """Expire, archive and delete rows per policy. Returns counts removed."""
+    now = time.time() if now is None else now
+    stats = {"conversations": 0, "messages": 0, "events": 0, "blobs": 0}
+
+    if policy.messages_ttl is not None:
+        stats.update(_expire_conversations(db_path, policy, now - policy.messages_ttl))
+    stats["events"], blobs = _expire_events(db_path, policy, now)
+    stats["blobs"] += blobs
+    return stats
+
+
+async def apply_retention(
+    policy: RetentionPolicy, db_path: str = ".cogency/store.db", *, now: float | None = None
+) -> dict[str, int]:
+    return await asyncio.to_thread(apply_retention_sync, policy, db_path, now=now)
+
+
+def clear_events(
+    conversation_id: str,
+    db_path: str = ".cogency/store.db",
+    *,
+    types: list[str] | None = None,
+    batch_size: int = RETENTION_BATCH,
+) -> int:
+    """Delete a conversation's events (optionally only some types) in batches.
+
+    Blobs and prompt links only those events referenced are reclaimed too.
+    """
+    where = "conversation_id = ?"
+    params: tuple[Any, ...] = (conversation_id,)
+    if types:
+        where += f" AND type IN ({','.join('?' for _ in types)})"
+        params = (conversation_id, *types)
+    removed, _ = _delete_events(db_path, where, params, RetentionPolicy(batch_size=batch_size))
+    return removed
+
+
+__all__ = [
+    "RetentionPolicy",
+    "apply_retention",
+    "apply_retention_sync",
+    "clear_events",
+    "read_archive",
+]
@@ -0,0 +1,174 @@
+"""Sharded SQLite storage: N database files, one WAL writer lock each.
+
+Routing:
+- Conversation data (messages, events, requests, metrics) by conversation_id
+- Profiles by user_id
+- User-wide queries (counts, user messages, search) fan out and merge
+
+Shard assignment uses a stable hash, so the shard count is fixed for a store's
+lifetime; changing it requires re-partitioning the files.
+"""
+
+import asyncio
+import hashlib
+import heapq
+from pathlib import Path
+from typing import Any
+
+from cogency.core.protocols import MessageMatch
+
+from .sqlite import SQLite
+
+DEFAULT_SHARDS = 4
+
+
+def shard_index(key: str, shards: int) -> int:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+class ShardedSQLite:
+    """Storage over `shards` SQLite files in `directory` (store-0.db ...)."""
+
+    def __init__(
+        self,
+        directory: str = ".cogency/shards",
+        shards: int = DEFAULT_SHARDS,
+        **sqlite_options: Any,
+    ):
+        if shards < 1:
+            raise ValueError(f"shards must be >= 1, got {shards}")
+        self.directory = str(Path(directory).resolve())
+        self.shards = [
+            SQLite(str(Path(self.directory) / f"store-{i}.db"), **sqlite_options)
+            for i in range(shards)
+        ]
+
+    def for_conversation(self, conversation_id: str) -> SQLite:
+        return self.shards[shard_index(conversation_id, len(self.shards))]
+
+    def for_user(self, user_id: str) -> SQLite:
+        return self.shards[shard_index(user_id, len(self.shards))]
+
+    async def save_message(
+        self,
+        conversation_id: str,
+        user_id: str,
+        type: str,
+        content: str,
+        timestamp: float | None = None,
+    ) -> str:
+        return await self.for_conversation(conversation_id).save_message(
+            conversation_id, user_id, type, content, timestamp
+        )
+
+    async def save_event(
+        self, conversation_id: str, type: str, content: str, timestamp: float | None = None
+    ) -> str:
+        return await self.for_conversation(conversation_id).save_event(
+            conversation_id, type, content, timestamp
+        )
+
+    async def save_request(
+        self,
+        conversation_id: str,
+        user_id: str,
+        messages: str,
+        response: str | None = None,
+        timestamp: float | None = None,
+    ) -> str:
+        return await self.for_conversation(conversation_id).save_request(
+            conversation_id, user_id, messages, response, timestamp
+        )
+
+    async def load_requests(self, conversation_id: str) -> list[dict[str, Any]]:
+        return await self.for_conversation(conversation_id).load_requests(conversation_id)
+
+    async def load_messages(
+        self,
+        conversation_id: str,
+        user_id: str,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        limit: int | None = None,
+        *,
+        after_id: str | None = None,
+        after_timestamp: float | None = None,
+    ) -> list[dict[str, Any]]:
+        return await self.for_conversation(conversation_id).load_messages(
+            conversation_id,
+            user_id,
+            include,
+            exclude,
+            limit,
+            after_id=after_id,
+            after_timestamp=after_timestamp,
+        )
+
+    async def load_latest_metric(self, conversation_id: str) -> dict[str, Any] | None:
+        return await self.for_conversation(conversation_id).load_latest_metric(conversation_id)
+
+    async def load_messages_by_conversation_id(
+        self, conversation_id: str, limit: int
+    ) -> list[dict[str, Any]]:
+        return await self.for_conversation(conversation_id).load_messages_by_conversation_id(
+            conversation_id, limit
+        )
+
+    async def save_profile(self, user_id: str, profile: dict[str, Any]) -> None:
+        home = self.for_user(user_id)
+        await home.save_profile(user_id, profile)
+
+        # The user's messages live on every shard; move their watermarks too
+        learned_at = profile.get("_meta", {}).get("last_learned_at")
+        if isinstance(learned_at, int | float):
+            await asyncio.gather(
+                *(
+                    shard._set_watermark(user_id, learned_at)
+                    for shard in self.shards
+                    if shard is not home
+                )
+            )
+
+    async def load_profile(self, user_id: str) -> dict[str, Any]:
+        return await self.for_user(user_id).load_profile(user_id)
+
+    async def delete_profile(self, user_id: str) -> int:
+        home = self.for_user(user_id)
+        deleted = await home.delete_profile(user_id)
+        await asyncio.gather(
+            *(shard._set_watermark(user_id, None) for shard in self.shards if shard is not home)
+        )
+        return deleted
+
+    async def count_user_messages(self, user_id: str, since_timestamp: float = 0) -> int:
+        counts = await asyncio.gather(
+            *(shard.count_user_messages(user_id, since_timestamp) for shard in self.shards)
+        )
+        return sum(counts)
+
+    async def load_user_messages(
+        self, user_id: str, since_timestamp: float = 0, limit: int | None = None
+    ) -> list[str]:
+        per_shard = await asyncio.gather(
+            *(shard._load_user_messages(user_id, since_timestamp, limit) for shard in self.shards)
+        )
+        merged = heapq.merge(*per_shard, key=lambda row: row[0])
+        contents = [content for _, content in merged]
+        return contents if limit is None else contents[:limit]
+
+    async def search_messages(
+        self, query: str, user_id: str, exclude_conversation_id: str | None, limit: int = 3
+    ) -> list[MessageMatch]:
+        per_shard = await asyncio.gather(
+            *(
+                shard._search_messages(query, user_id, exclude_conversation_id, limit)
+                for shard in self.shards
+            )
+        )
+        scored = [row for rows in per_shard for row in rows]
+        scored.sort(key=lambda row: (row[0], row[1].timestamp), reverse=True)
+        return [match for _, match in scored[:limit]]
+
+
+__all__ = ["ShardedSQLite", "shard_index"]
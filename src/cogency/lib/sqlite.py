@@ -1,47 +1,101 @@
-import asyncio
+import contextlib
+import functools
+import hashlib
 import json
 import sqlite3
+import threading
 import time
-from collections.abc import Callable
+import weakref
+import zlib
+from collections.abc import Callable, Generator, Iterable
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, ClassVar, TypeVar
+from typing import Any, ClassVar, cast
 
+from cogency.core.errors import StorageError
 from cogency.core.protocols import MessageMatch, parse_metric_data_dict, parse_profile_dict
 
+from .engine import Engine
 from .resilience import retry
 from .uuid7 import uuid7
 
 DB_TIMEOUT_SECONDS = 5.0
-
-T = TypeVar("T")
-
-
-async def _run_sync(fn: Callable[[], T]) -> T:
-    return await asyncio.to_thread(fn)
+PROFILE_VERSIONS = 5  # Profile versions kept per user
+PRUNE_BATCH = 100  # Rows removed per incremental retention pass
+MIGRATION_BATCH = 500  # Rows per backfill transaction
+COMPRESS_THRESHOLD = 4 * 1024  # Bytes; smaller content stays plain text
+BLOB_THRESHOLD = 64 * 1024  # Bytes; larger content is stored once in blobs, by hash
+
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORE = {"DEFAULT", "FILE", "MEMORY"}
+
+
+@dataclass(frozen=True)
+class Tuning:
+    """Per-connection pragmas and caches. None leaves SQLite's default."""
+
+    synchronous: str | None = "NORMAL"  # Under WAL: durable across app crashes, not power loss
+    cache_size_kib: int | None = 16 * 1024
+    mmap_size: int | None = 256 * 1024 * 1024
+    temp_store: str | None = "MEMORY"
+    cached_statements: int = 256  # Prepared statements kept per connection
+    optimize_every: int | None = 1000  # Writer commits between PRAGMA optimize runs
+
+    def __post_init__(self):
+        if self.synchronous is not None and self.synchronous.upper() not in _SYNCHRONOUS:
+            raise ValueError(f"synchronous must be one of {sorted(_SYNCHRONOUS)}")
+        if self.temp_store is not None and self.temp_store.upper() not in _TEMP_STORE:
+            raise ValueError(f"temp_store must be one of {sorted(_TEMP_STORE)}")
+
+    def pragmas(self) -> list[str]:
+        pragmas: list[str] = []
+        if self.synchronous is not None:
+            pragmas.append(f"PRAGMA synchronous={self.synchronous.upper()}")
+        if self.cache_size_kib is not None:
+            pragmas.append(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+        if self.mmap_size is not None:
+            pragmas.append(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        if self.temp_store is not None:
+            pragmas.append(f"PRAGMA temp_store={self.temp_store.upper()}")
+        return pragmas
+
+
+DEFAULT_TUNING = Tuning()
+# sqlite3 module defaults, for comparison
+UNTUNED = Tuning(
+    synchronous=None,
+    cache_size_kib=None,
+    mmap_size=None,
+    temp_store=None,
+    cached_statements=128,
+    optimize_every=None,
+)
 
 
 class DB:
-    _initialized_paths: ClassVar[dict[str, float]] = {}
-    _CACHE_TTL: ClassVar[float] = 3600.0
+    _initialized_paths: ClassVar[set[str]] = set()
+    _init_lock: ClassVar[threading.Lock] = threading.Lock()
 
     @classmethod
-    def connect(cls, db_path: str):
+    def connect(cls, db_path: str, tuning: Tuning | None = None):
         is_memory = db_path == ":memory:"
 
-        if not is_memory:
-            path = Path(db_path)
-            path_str = str(path)
-            now = time.time()
-
-            cached_time = cls._initialized_paths.get(path_str)
-            if cached_time is None or (now - cached_time) > cls._CACHE_TTL:
-                path.parent.mkdir(parents=True, exist_ok=True)
-                if not path.exists():
-                    path.touch(exist_ok=True)
-                cls._init_schema(path)
-                cls._initialized_paths[path_str] = now
-
-        conn = sqlite3.connect(db_path, timeout=DB_TIMEOUT_SECONDS)
+        if not is_memory and str(Path(db_path)) not in cls._initialized_paths:
+            # Schema and migrations are checked once per process per file
+            with cls._init_lock:
+                path = Path(db_path)
+                if str(path) not in cls._initialized_paths:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    if not path.exists():
+                        path.touch(exist_ok=True)
+                    cls._init_schema(path)
+                    cls._initialized_paths.add(str(path))
+
+        conn = sqlite3.connect(
+            db_path,
+            timeout=DB_TIMEOUT_SECONDS,
+            cached_statements=tuning.cached_statements if tuning else 128,
+        )
 
         if is_memory:
             cls._init_schema_memory(conn)
@@ -55,17 +109,26 @@ class DB:
                         raise
                     time.sleep(0.1 * (i + 1))
 
+        if tuning is not None:
+            for pragma in tuning.pragmas():
+                conn.execute(pragma)
+
         return conn
 
     @classmethod
     def _init_schema_memory(cls, conn: sqlite3.Connection):
         conn.executescript(cls._schema_sql())
+        migrate(conn)
 
     @classmethod
     def _init_schema(cls, db_path: Path):
-        with sqlite3.connect(str(db_path)) as db:
+        db = sqlite3.connect(str(db_path), timeout=DB_TIMEOUT_SECONDS)
+        try:
             db.execute("PRAGMA journal_mode=WAL")
             db.executescript(cls._schema_sql())
+            migrate(db)
+        finally:
+            db.close()
 
     @staticmethod
     def _schema_sql() -> str:
@@ -76,23 +139,25 @@ class DB:
                 user_id TEXT,
                 type TEXT NOT NULL,
                 content TEXT NOT NULL,
-                timestamp REAL NOT NULL
+                timestamp REAL NOT NULL,
+                encoding TEXT  -- NULL: plain text; 'zlib': compressed; 'blob': content is a blobs.hash
             );
 
+            -- Conversation reads, cursors, retention
             CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages(conversation_id, timestamp);
-            CREATE INDEX IF NOT EXISTS idx_messages_type ON messages(type);
-            CREATE INDEX IF NOT EXISTS idx_messages_user ON messages(user_id);
-            CREATE INDEX IF NOT EXISTS idx_messages_user_type ON messages(user_id, type, timestamp);
+            -- User-wide reads (counts, learning, search) only ever ask for type = 'user'
+            CREATE INDEX IF NOT EXISTS idx_messages_user_timeline ON messages(user_id, timestamp) WHERE type = 'user';
 
             CREATE TABLE IF NOT EXISTS events (
                 event_id TEXT PRIMARY KEY,
                 conversation_id TEXT NOT NULL,
                 type TEXT NOT NULL,
                 content TEXT NOT NULL,
-                timestamp REAL NOT NULL
+                timestamp REAL NOT NULL,
+                encoding TEXT
             );
 
-            CREATE INDEX IF NOT EXISTS idx_events_conversation ON events(conversation_id, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_events_conversation_type ON events(conversation_id, type, timestamp);
 
             CREATE TABLE IF NOT EXISTS profiles (
                 user_id TEXT NOT NULL,
@@ -103,20 +168,541 @@ class DB:
                 PRIMARY KEY (user_id, version)
             );
 
-            CREATE INDEX IF NOT EXISTS idx_profiles_user_latest ON profiles(user_id, version DESC);
             CREATE INDEX IF NOT EXISTS idx_profiles_cleanup ON profiles(created_at);
+
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            );
+
+            -- Request prompts: each link is (parent link, message blob)
+            CREATE TABLE IF NOT EXISTS prompt_links (
+                hash TEXT PRIMARY KEY,
+                parent TEXT,
+                message TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at REAL NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS user_stats (
+                user_id TEXT PRIMARY KEY,
+                message_count INTEGER NOT NULL,
+                learned_at REAL NOT NULL DEFAULT 0,
+                learned_count INTEGER NOT NULL DEFAULT 0
+            );
         """
 
 
+def _profile_learned_at(db: sqlite3.Connection, user_id: str) -> float:
+    """The latest profile's _meta.last_learned_at, or 0 if it has none."""
+    row = db.execute(
+        """
+        SELECT CASE WHEN json_valid(data) THEN json_extract(data, '$._meta.last_learned_at') END
+        FROM profiles WHERE user_id = ? ORDER BY version DESC LIMIT 1
+        """,
+        (user_id,),
+    ).fetchone()
+    value = row[0] if row else None
+    return value if isinstance(value, int | float) else 0
+
+
+def _seed_user_stats(db: sqlite3.Connection, user_id: str, learned_at: float | None = None) -> None:
+    """(Re)build a user's counters from messages. One index range scan.
+
+    Without `learned_at` the watermark comes from the user's latest profile, so a
+    first seed or rebuild keeps count_user_messages on its O(1) path.
+    """
+    if learned_at is None:
+        learned_at = _profile_learned_at(db, user_id)
+    db.execute(
+        """
+        INSERT OR REPLACE INTO user_stats (user_id, message_count, learned_at, learned_count)
+        SELECT ?, COUNT(*), ?, COALESCE(SUM(timestamp <= ?), 0)
+        FROM messages WHERE user_id = ? AND type = 'user'
+        """,
+        (user_id, learned_at, learned_at, user_id),
+    )
+
+
+def _bump_user_stats(db: sqlite3.Connection, user_id: str, timestamp: float) -> None:
+    cursor = db.execute(
+        """
+        UPDATE user_stats
+        SET message_count = message_count + 1,
+            learned_count = learned_count + (? <= learned_at)
+        WHERE user_id = ?
+        """,
+        (timestamp, user_id),
+    )
+    if cursor.rowcount == 0:
+        _seed_user_stats(db, user_id)
+
+
+def drop_user_stats(db: sqlite3.Connection, removed: list[tuple[str, float]]) -> None:
+    """Undo _bump_user_stats for deleted user messages, given as (user_id, timestamp).
+
+    The learned watermark stays, so count_user_messages keeps its O(1) path.
+    """
+    db.executemany(
+        """
+        UPDATE user_stats
+        SET message_count = message_count - 1,
+            learned_count = learned_count - (? <= learned_at)
+        WHERE user_id = ?
+        """,
+        [(timestamp, user_id) for user_id, timestamp in removed],
+    )
+
+
+def _mark_learned(db: sqlite3.Connection, user_id: str, learned_at: float) -> None:
+    """Move the learned watermark so count_user_messages(user_id, learned_at) is O(1)."""
+    _seed_user_stats(db, user_id, learned_at)
+
+
+def _encode(
+    db: sqlite3.Connection, content: str, compress_at: int | None, blob_at: int | None
+) -> tuple[str | bytes, str | None]:
+    """Content as stored, with its encoding. Identical large payloads share one blob."""
+    raw = content.encode("utf-8")
+    if blob_at is not None and len(raw) >= blob_at:
+        return _put_blob(db, raw), "blob"
+    if compress_at is not None and len(raw) >= compress_at:
+        packed = zlib.compress(raw)
+        if len(packed) < len(raw):
+            return packed, "zlib"
+    return content, None
+
+
+def _put_blob(db: sqlite3.Connection, raw: bytes) -> str:
+    digest = hashlib.sha256(raw).hexdigest()
+    # Usually present (replayed prompt prefixes): a primary key lookup skips compressing
+    if db.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone() is None:
+        db.execute(
+            "INSERT OR IGNORE INTO blobs (hash, data, size, created_at) VALUES (?, ?, ?, ?)",
+            (digest, zlib.compress(raw), len(raw), time.time()),
+        )
+    return digest
+
+
+def _chain_prompt(db: sqlite3.Connection, messages: str) -> tuple[str, int] | None:
+    """Store a serialized prompt as hash-linked message blobs; returns (head, length).
+
+    Each link hashes its parent plus one message, so replay iterations that share a
+    prefix share its links and blobs. None when the prompt isn't a JSON list that
+    re-serializes byte-for-byte; callers then store it whole.
+    """
+    try:
+        parsed: object = json.loads(messages)
+    except ValueError:
+        return None
+    if not isinstance(parsed, list) or not parsed:
+        return None
+    parts = [json.dumps(message) for message in cast("list[object]", parsed)]
+    if "[" + ", ".join(parts) + "]" != messages:
+        return None
+
+    head = ""
+    for part in parts:
+        message = _put_blob(db, part.encode("utf-8"))
+        link = hashlib.sha256(f"{head}:{message}".encode()).hexdigest()
+        db.execute(
+            "INSERT OR IGNORE INTO prompt_links (hash, parent, message) VALUES (?, ?, ?)",
+            (link, head or None, message),
+        )
+        head = link
+    return head, len(parts)
+
+
+def _rebuild_prompt(db: sqlite3.Connection, head: str, length: int) -> str:
+    rows = db.execute(
+        """
+        WITH RECURSIVE walk(hash, parent, message, depth) AS (
+            SELECT hash, parent, message, 0 FROM prompt_links WHERE hash = ?
+            UNION ALL
+            SELECT l.hash, l.parent, l.message, w.depth + 1
+            FROM prompt_links l JOIN walk w ON l.hash = w.parent
+        )
+        SELECT b.data FROM walk w JOIN blobs b ON b.hash = w.message ORDER BY w.depth DESC
+        """,
+        (head,),
+    ).fetchall()
+    if len(rows) != length:
+        raise StorageError(f"Prompt chain {head!r} is incomplete ({len(rows)}/{length})")
+    return "[" + ", ".join(zlib.decompress(row[0]).decode("utf-8") for row in rows) + "]"
+
+
+def decode_content(db: sqlite3.Connection, content: str | bytes, encoding: str | None) -> str:
+    if encoding is None:
+        return content if isinstance(content, str) else content.decode("utf-8")
+    if encoding == "zlib" and isinstance(content, bytes):
+        return zlib.decompress(content).decode("utf-8")
+    if encoding == "blob":
+        row = db.execute("SELECT data FROM blobs WHERE hash = ?", (content,)).fetchone()
+        if row is None:
+            raise StorageError(f"Missing blob {content!r}")
+        return zlib.decompress(row[0]).decode("utf-8")
+    if encoding == "chain" and isinstance(content, str):
+        ref = json.loads(content)
+        messages = _rebuild_prompt(db, ref["head"], ref["length"])
+        return json.dumps({"messages": messages, "response": ref["response"]})
+    raise StorageError(f"Unknown content encoding {encoding!r}")
+
+
+def references(content: str | bytes, encoding: str | None) -> tuple[str | None, str | None]:
+    """(blob hash, prompt chain head) a stored row points at, for release_blobs."""
+    if encoding == "blob" and isinstance(content, str):
+        return content, None
+    if encoding == "chain" and isinstance(content, str):
+        head = json.loads(content).get("head")
+        return None, head if isinstance(head, str) else None
+    return None, None
+
+
+def release_blobs(db: sqlite3.Connection, blobs: Iterable[str], heads: Iterable[str]) -> int:
+    """Reclaim what deleted rows referenced, once nothing else does. Returns blobs removed.
+
+    Costs index lookups per released hash, not a pass over the database. Walks
+    each chain from its head towards the root, deleting links that no event
+    names as head and no link extends, and stops at the first one still in use.
+    """
+    candidates = set(blobs)
+    for head in set(heads):
+        link: str | None = head
+        while link is not None:
+            in_use = db.execute(
+                """
+                SELECT 1 FROM events
+                WHERE encoding = 'chain' AND json_extract(content, '$.head') = ?
+                UNION ALL
+                SELECT 1 FROM prompt_links WHERE parent = ?
+                LIMIT 1
+                """,
+                (link, link),
+            ).fetchone()
+            row = db.execute(
+                "SELECT parent, message FROM prompt_links WHERE hash = ?", (link,)
+            ).fetchone()
+            if in_use is not None or row is None:
+                break
+            db.execute("DELETE FROM prompt_links WHERE hash = ?", (link,))
+            candidates.add(row[1])
+            link = row[0]
+
+    removed = 0
+    for blob in candidates:
+        removed += db.execute(
+            """
+            DELETE FROM blobs WHERE hash = ?1
+            AND NOT EXISTS (SELECT 1 FROM messages WHERE encoding = 'blob' AND content = ?1)
+            AND NOT EXISTS (SELECT 1 FROM events WHERE encoding = 'blob' AND content = ?1)
+            AND NOT EXISTS (SELECT 1 FROM prompt_links WHERE message = ?1)
+            """,
+            (blob,),
+        ).rowcount
+    return removed
+
+
+def collect_blobs(db: sqlite3.Connection) -> int:
+    """Delete prompt links and blobs nothing references. Returns blobs removed.
+
+    A full mark-and-sweep for maintenance; deletes release what they referenced
+    through release_blobs instead.
+    """
+    db.execute(
+        """
+        DELETE FROM prompt_links WHERE hash NOT IN (
+            WITH RECURSIVE live(hash) AS (
+                SELECT json_extract(content, '$.head') FROM events WHERE encoding = 'chain'
+                UNION
+                SELECT l.parent FROM prompt_links l JOIN live ON l.hash = live.hash
+                WHERE l.parent IS NOT NULL
+            )
+            SELECT hash FROM live WHERE hash IS NOT NULL
+        )
+        """
+    )
+    return db.execute(
+        """
+        DELETE FROM blobs
+        WHERE hash NOT IN (SELECT content FROM messages WHERE encoding = 'blob')
+        AND hash NOT IN (SELECT content FROM events WHERE encoding = 'blob')
+        AND hash NOT IN (SELECT message FROM prompt_links)
+        """
+    ).rowcount
+
+
+def _prune_profiles(
+    db: sqlite3.Connection,
+    *,
+    keep_versions: int | None,
+    max_age: float | None,
+    user_id: str | None = None,
+    limit: int = PRUNE_BATCH,
+) -> int:
+    """Delete old profile versions. A user's latest version is always kept."""
+    removed = 0
+    if keep_versions is not None and user_id is not None:
+        latest = db.execute(
+            "SELECT MAX(version) FROM profiles WHERE user_id = ?", (user_id,)
+        ).fetchone()[0]
+        if latest is not None:
+            removed += db.execute(
+                "DELETE FROM profiles WHERE user_id = ? AND version <= ?",
+                (user_id, latest - max(keep_versions, 1)),
+            ).rowcount
+
+    if max_age is not None:
+        # idx_profiles_cleanup drives the scan; LIMIT keeps each pass short
+        removed += db.execute(
+            """
+            DELETE FROM profiles WHERE rowid IN (
+                SELECT p.rowid FROM profiles p
+                WHERE p.created_at < ?
+                AND p.version < (SELECT MAX(q.version) FROM profiles q WHERE q.user_id = p.user_id)
+                LIMIT ?
+            )
+            """,
+            (time.time() - max_age, limit),
+        ).rowcount
+    return removed
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema step. Statements must be idempotent (IF EXISTS / IF NOT EXISTS).
+
+    `backfill(db, batch)` migrates up to `batch` rows and returns how many it touched;
+    it runs in its own short transaction until it returns fewer than `batch`, so it
+    must be resumable after a crash or alongside another process doing the same.
+    """
+
+    version: int
+    name: str
+    statements: tuple[str, ...] = ()
+    backfill: Callable[[sqlite3.Connection, int], int] | None = None
+    columns: tuple[tuple[str, str, str], ...] = ()  # (table, column, declaration), added if missing
+
+
+def _backfill_user_stats(db: sqlite3.Connection, batch: int) -> int:
+    users = [
+        row[0]
+        for row in db.execute(
+            """
+            SELECT DISTINCT user_id FROM messages
+            WHERE type = 'user' AND user_id IS NOT NULL AND user_id != ''
+            AND user_id NOT IN (SELECT user_id FROM user_stats)
+            LIMIT ?
+            """,
+            (batch,),
+        )
+    ]
+    for user_id in users:
+        _seed_user_stats(db, user_id)
+    return len(users)
+
+
+# Ordered steps, applied to every file once. _schema_sql creates the latest tables
+# for new files; indexes on columns added later live only here, since _schema_sql
+# also runs against old files before their columns exist.
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        1,
+        "query-driven indexes",
+        (
+            "DROP INDEX IF EXISTS idx_messages_type",
+            "DROP INDEX IF EXISTS idx_messages_user",
+            "DROP INDEX IF EXISTS idx_messages_user_type",
+            "DROP INDEX IF EXISTS idx_events_conversation",
+            "DROP INDEX IF EXISTS idx_profiles_user_latest",
+        ),
+    ),
+    Migration(2, "seed user_stats", backfill=_backfill_user_stats),
+    Migration(
+        3,
+        "content encoding",
+        (
+            # Partial indexes: only blob references, so blob collection stays cheap
+            "CREATE INDEX IF NOT EXISTS idx_messages_blob ON messages(content) WHERE encoding = 'blob'",
+            "CREATE INDEX IF NOT EXISTS idx_events_blob ON events(content) WHERE encoding = 'blob'",
+        ),
+        columns=(("messages", "encoding", "TEXT"), ("events", "encoding", "TEXT")),
+    ),
+    Migration(
+        4,
+        "blob release lookups",
+        (
+            # release_blobs checks a handful of hashes per delete through these
+            "CREATE INDEX IF NOT EXISTS idx_events_chain_head ON events(json_extract(content, '$.head')) WHERE encoding = 'chain'",
+            "CREATE INDEX IF NOT EXISTS idx_prompt_links_parent ON prompt_links(parent)",
+            "CREATE INDEX IF NOT EXISTS idx_prompt_links_message ON prompt_links(message)",
+        ),
+    ),
+)
+
+
+def _applied(db: sqlite3.Connection, version: int) -> bool:
+    return (
+        db.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone()
+        is not None
+    )
+
+
+def _record(db: sqlite3.Connection, migration: Migration) -> None:
+    db.execute(
+        "INSERT OR IGNORE INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+        (migration.version, migration.name, time.time()),
+    )
+
+
+@contextlib.contextmanager
+def _transaction(db: sqlite3.Connection) -> Generator[None, None, None]:
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+
+def _apply(db: sqlite3.Connection, migration: Migration, batch_size: int) -> None:
+    with _transaction(db):
+        for table, column, declaration in migration.columns:
+            existing = {row[1] for row in db.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+        for statement in migration.statements:
+            db.execute(statement)
+
+    if migration.backfill is not None:
+        while True:
+            with _transaction(db):
+                done = migration.backfill(db, batch_size)
+            if done < batch_size:
+                break
+
+
+def migrate(
+    db: sqlite3.Connection,
+    migrations: tuple[Migration, ...] = MIGRATIONS,
+    *,
+    batch_size: int = MIGRATION_BATCH,
+) -> list[int]:
+    """Apply pending migrations in order. Returns the versions applied by this call."""
+    previous = db.isolation_level
+    db.isolation_level = None  # Explicit, short transactions
+    try:
+        applied: list[int] = []
+        for migration in migrations:
+            if _applied(db, migration.version):
+                continue
+            _apply(db, migration, batch_size)
+            _record(db, migration)
+            applied.append(migration.version)
+        return applied
+    finally:
+        db.isolation_level = previous
+
+
+# Canonical SQL per query shape: equal shapes produce identical text, so the
+# connection's statement cache reuses the prepared statement.
+
+
+@functools.cache
+def _placeholders(count: int) -> str:
+    return ",".join("?" * count)
+
+
+@functools.cache
+def _load_messages_sql(
+    by_user: bool, types: int, exclude: bool, cursor: str | None, limited: bool
+) -> str:
+    query = "SELECT message_id, type, content, timestamp, encoding FROM messages WHERE conversation_id = ?"
+    if by_user:
+        query += " AND user_id = ?"
+    if types:
+        query += f" AND type {'NOT IN' if exclude else 'IN'} ({_placeholders(types)})"
+
+    if cursor == "id":
+        # Row-value comparison keeps idx_messages_conversation as a range scan
+        query += " AND (timestamp, message_id) > (?, ?) ORDER BY timestamp, message_id"
+    elif cursor == "timestamp":
+        query += " AND timestamp > ? ORDER BY timestamp, message_id"
+    else:
+        query += " ORDER BY timestamp DESC, message_id DESC"
+
+    if limited:
+        query += " LIMIT ?"
+    return query
+
+
+@functools.cache
+def _search_sql(keywords: int, exclude_conversation: bool) -> str:
+    relevance = " + ".join(
+        ["(LENGTH(content) - LENGTH(REPLACE(LOWER(content), ?, '')))"] * keywords
+    )
+    exclude_clause = "AND conversation_id != ?" if exclude_conversation else ""
+    like_clause = " OR ".join(["LOWER(content) LIKE ?"] * keywords)
+    return f"""
+        SELECT content, timestamp, conversation_id,
+               ({relevance}) as relevance_score
+        FROM messages
+        WHERE type = 'user'
+        AND user_id = ?
+        {exclude_clause}
+        AND ({like_clause})
+        ORDER BY relevance_score DESC, timestamp DESC
+        LIMIT ?
+    """
+
+
 class SQLite:
-    """SQLite storage. WAL mode, thread-safe (new connection per op)."""
+    """SQLite storage. WAL mode; one writer thread and a small reader pool per file.
 
-    def __init__(self, db_path: str = ".cogency/store.db"):
+    Profile retention runs on write: keep the last `profile_versions` per user and,
+    if `profile_max_age` (seconds) is set, prune older versions in small batches.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ".cogency/store.db",
+        *,
+        profile_versions: int | None = PROFILE_VERSIONS,
+        profile_max_age: float | None = None,
+        tuning: Tuning = DEFAULT_TUNING,
+        compress_threshold: int | None = COMPRESS_THRESHOLD,
+        blob_threshold: int | None = BLOB_THRESHOLD,
+    ):
         # Preserve :memory: as-is without path resolution
         if db_path == ":memory:":
             self.db_path = ":memory:"
         else:
             self.db_path = str(Path(db_path).resolve())
+        self.profile_versions = profile_versions
+        self.profile_max_age = profile_max_age
+
+        self.tuning = tuning
+        self.compress_threshold = compress_threshold
+        self.blob_threshold = blob_threshold
+
+        # The first SQLite opened on a file sets the engine's tuning
+        self._engine = Engine.for_path(
+            self.db_path,
+            functools.partial(DB.connect, tuning=tuning),
+            optimize_every=tuning.optimize_every,
+        )
+        if self.db_path == ":memory:":
+            # Private in-memory database lives as long as this instance
+            weakref.finalize(self, self._engine.close)
+
+    def _encode(self, db: sqlite3.Connection, content: str) -> tuple[str | bytes, str | None]:
+        return _encode(db, content, self.compress_threshold, self.blob_threshold)
 
     @retry(attempts=3, base_delay=0.1)
     async def save_message(
@@ -132,14 +718,17 @@ class SQLite:
 
         message_id = uuid7()
 
-        def _sync_save() -> None:
-            with DB.connect(self.db_path) as db:
-                db.execute(
-                    "INSERT INTO messages (message_id, conversation_id, user_id, type, content, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
-                    (message_id, conversation_id, user_id, type, content, timestamp),
-                )
-
-        await _run_sync(_sync_save)
+        def _sync_save(db: sqlite3.Connection) -> None:
+            # User messages stay plain: search matches them with LIKE
+            stored, encoding = (content, None) if type == "user" else self._encode(db, content)
+            db.execute(
+                "INSERT INTO messages (message_id, conversation_id, user_id, type, content, timestamp, encoding) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (message_id, conversation_id, user_id, type, stored, timestamp, encoding),
+            )
+            if user_id and type == "user":
+                _bump_user_stats(db, user_id, timestamp)
+
+        await self._engine.write(_sync_save)
         return message_id
 
     @retry(attempts=3, base_delay=0.1)
@@ -151,14 +740,14 @@ class SQLite:
 
         event_id = uuid7()
 
-        def _sync_save() -> None:
-            with DB.connect(self.db_path) as db:
-                db.execute(
-                    "INSERT INTO events (event_id, conversation_id, type, content, timestamp) VALUES (?, ?, ?, ?, ?)",
-                    (event_id, conversation_id, type, content, timestamp),
-                )
+        def _sync_save(db: sqlite3.Connection) -> None:
+            stored, encoding = self._encode(db, content)
+            db.execute(
+                "INSERT INTO events (event_id, conversation_id, type, content, timestamp, encoding) VALUES (?, ?, ?, ?, ?, ?)",
+                (event_id, conversation_id, type, stored, timestamp, encoding),
+            )
 
-        await _run_sync(_sync_save)
+        await self._engine.write(_sync_save)
         return event_id
 
     @retry(attempts=3, base_delay=0.1)
@@ -175,17 +764,49 @@ class SQLite:
 
         event_id = uuid7()
 
-        def _sync_save() -> None:
-            content = json.dumps({"messages": messages, "response": response})
-            with DB.connect(self.db_path) as db:
-                db.execute(
-                    "INSERT INTO events (event_id, conversation_id, type, content, timestamp) VALUES (?, ?, ?, ?, ?)",
-                    (event_id, conversation_id, "request", content, timestamp),
+        def _sync_save(db: sqlite3.Connection) -> None:
+            chain = _chain_prompt(db, messages)
+            if chain is not None:
+                head, length = chain
+                stored: str | bytes = json.dumps(
+                    {"head": head, "length": length, "response": response}
                 )
-
-        await _run_sync(_sync_save)
+                encoding = "chain"
+            else:
+                content = json.dumps({"messages": messages, "response": response})
+                stored, encoding = self._encode(db, content)
+            db.execute(
+                "INSERT INTO events (event_id, conversation_id, type, content, timestamp, encoding) VALUES (?, ?, ?, ?, ?, ?)",
+                (event_id, conversation_id, "request", stored, timestamp, encoding),
+            )
+
+        await self._engine.write(_sync_save)
         return event_id
 
+    @retry(attempts=3, base_delay=0.1)
+    async def load_requests(self, conversation_id: str) -> list[dict[str, Any]]:
+        """Request snapshots in order, with prompts rebuilt exactly as saved."""
+
+        def _sync_load(db: sqlite3.Connection) -> list[dict[str, Any]]:
+            rows = db.execute(
+                "SELECT event_id, content, encoding, timestamp FROM events WHERE conversation_id = ? AND type = 'request' ORDER BY timestamp",
+                (conversation_id,),
+            ).fetchall()
+            requests: list[dict[str, Any]] = []
+            for event_id, content, encoding, timestamp in rows:
+                payload = json.loads(decode_content(db, content, encoding))
+                requests.append(
+                    {
+                        "event_id": event_id,
+                        "messages": payload["messages"],
+                        "response": payload["response"],
+                        "timestamp": timestamp,
+                    }
+                )
+            return requests
+
+        return await self._engine.read(_sync_load)
+
     @retry(attempts=3, base_delay=0.1)
     async def load_messages(
         self,
@@ -194,212 +815,295 @@ class SQLite:
         include: list[str] | None = None,
         exclude: list[str] | None = None,
         limit: int | None = None,
+        *,
+        after_id: str | None = None,
+        after_timestamp: float | None = None,
     ) -> list[dict[str, Any]]:
-        def _sync_load() -> list[dict[str, Any]]:
-            with DB.connect(self.db_path) as db:
-                db.row_factory = sqlite3.Row
+        """Conversation in (timestamp, message_id) order.
 
-                query = "SELECT type, content, timestamp FROM messages WHERE conversation_id = ?"
-                params: list[Any] = [conversation_id]
+        Without a cursor, `limit` keeps the newest rows. With `after_id` (exclusive) or
+        `after_timestamp`, rows after the cursor are returned and `limit` pages forward.
+        """
+        if after_id is not None and after_timestamp is not None:
+            raise ValueError("Pass after_id or after_timestamp, not both")
+
+        cursor: str | None = None
+        if after_id is not None:
+            cursor = "id"
+        elif after_timestamp is not None:
+            cursor = "timestamp"
+        types = include or exclude or []  # include wins when both are given
+        query = _load_messages_sql(
+            bool(user_id), len(types), not include, cursor, limit is not None
+        )
+        params: list[Any] = [conversation_id, *([user_id] if user_id else []), *types]
+        if after_timestamp is not None:
+            params.append(after_timestamp)
+        limit_params: list[Any] = [] if limit is None else [limit]
+
+        def _sync_load(db: sqlite3.Connection) -> list[dict[str, Any]]:
+            db.row_factory = sqlite3.Row
+
+            cursor_params: list[Any] = []
+            if after_id is not None:
+                row = db.execute(
+                    "SELECT timestamp FROM messages WHERE message_id = ? AND conversation_id = ?",
+                    (after_id, conversation_id),
+                ).fetchone()
+                if row is None:
+                    raise ValueError(f"Unknown message cursor: {after_id}")
+                cursor_params = [row[0], after_id]
+
+            rows = db.execute(query, [*params, *cursor_params, *limit_params]).fetchall()
+            ordered = rows if cursor else reversed(rows)
+            return [
+                {
+                    "message_id": row["message_id"],
+                    "type": row["type"],
+                    "content": decode_content(db, row["content"], row["encoding"]),
+                    "timestamp": row["timestamp"],
+                }
+                for row in ordered
+            ]
+
+        return await self._engine.read(_sync_load)
 
-                if user_id:
-                    query += " AND user_id = ?"
-                    params.append(user_id)
+    async def save_profile(self, user_id: str, profile: dict[str, Any]) -> None:
+        profile_json = json.dumps(profile)
 
-                if include:
-                    placeholders = ",".join("?" for _ in include)
-                    query += f" AND type IN ({placeholders})"
-                    params.extend(include)
-                elif exclude:
-                    placeholders = ",".join("?" for _ in exclude)
-                    query += f" AND type NOT IN ({placeholders})"
-                    params.extend(exclude)
+        def _sync_save(db: sqlite3.Connection) -> None:
+            current_version = (
+                db.execute(
+                    "SELECT MAX(version) FROM profiles WHERE user_id = ?", (user_id,)
+                ).fetchone()[0]
+                or 0
+            )
 
-                query += " ORDER BY timestamp DESC"
+            db.execute(
+                "INSERT INTO profiles (user_id, version, data, created_at, char_count) VALUES (?, ?, ?, ?, ?)",
+                (user_id, current_version + 1, profile_json, time.time(), len(profile_json)),
+            )
 
-                if limit is not None:
-                    query += " LIMIT ?"
-                    params.append(limit)
+            learned_at = profile.get("_meta", {}).get("last_learned_at")
+            if isinstance(learned_at, int | float):
+                _mark_learned(db, user_id, learned_at)
 
-                rows = db.execute(query, params).fetchall()
-                return [
-                    {"type": row["type"], "content": row["content"], "timestamp": row["timestamp"]}
-                    for row in reversed(rows)
-                ]
+            _prune_profiles(
+                db,
+                keep_versions=self.profile_versions,
+                max_age=self.profile_max_age,
+                user_id=user_id,
+            )
 
-        return await _run_sync(_sync_load)
+        await self._engine.write(_sync_save)
 
-    async def save_profile(self, user_id: str, profile: dict[str, Any]) -> None:
-        def _sync_save() -> None:
-            with DB.connect(self.db_path) as db:
-                current_version = (
-                    db.execute(
-                        "SELECT MAX(version) FROM profiles WHERE user_id = ?", (user_id,)
-                    ).fetchone()[0]
-                    or 0
-                )
+    async def _set_watermark(self, user_id: str, learned_at: float | None) -> None:
+        """Move the learned watermark, or drop the counters when learned_at is None."""
 
-                next_version = current_version + 1
-                profile_json = json.dumps(profile)
-                char_count = len(profile_json)
+        def _sync_set(db: sqlite3.Connection) -> None:
+            if learned_at is None:
+                db.execute("DELETE FROM user_stats WHERE user_id = ?", (user_id,))
+            else:
+                _mark_learned(db, user_id, learned_at)
 
-                db.execute(
-                    "INSERT INTO profiles (user_id, version, data, created_at, char_count) VALUES (?, ?, ?, ?, ?)",
-                    (user_id, next_version, profile_json, time.time(), char_count),
-                )
+        await self._engine.write(_sync_set)
+
+    async def prune_profiles(self) -> int:
+        """Apply profile_max_age across all users until no expired versions remain."""
+
+        def _sync_prune(db: sqlite3.Connection) -> int:
+            return _prune_profiles(db, keep_versions=None, max_age=self.profile_max_age)
+
+        total = 0
+        while True:
+            # One short transaction per batch so foreground writes interleave
+            removed = await self._engine.write(_sync_prune)
+            total += removed
+            if removed < PRUNE_BATCH:
+                return total
+
+    async def optimize(self) -> None:
+        """Refresh planner statistics and checkpoint the WAL."""
+
+        def _sync_optimize(db: sqlite3.Connection) -> None:
+            db.execute("PRAGMA optimize")
+            db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
-        await _run_sync(_sync_save)
+        await self._engine.write(_sync_optimize, atomic=False)
+
+    async def vacuum(self) -> None:
+        """Rebuild the database file to reclaim space freed by retention."""
+
+        def _sync_vacuum(db: sqlite3.Connection) -> None:
+            db.execute("VACUUM")
+
+        await self._engine.write(_sync_vacuum, atomic=False)
 
     @retry(attempts=3, base_delay=0.1)
     async def load_profile(self, user_id: str) -> dict[str, Any]:
-        def _sync_load() -> dict[str, Any]:
-            with DB.connect(self.db_path) as db:
-                row = db.execute(
-                    "SELECT data FROM profiles WHERE user_id = ? ORDER BY version DESC LIMIT 1",
-                    (user_id,),
-                ).fetchone()
-                if row:
-                    raw: object = json.loads(row[0])
-                    parsed = parse_profile_dict(raw)
-                    return dict(parsed)
-                return {}
-
-        return await _run_sync(_sync_load)
+        def _sync_load(db: sqlite3.Connection) -> dict[str, Any]:
+            row = db.execute(
+                "SELECT data FROM profiles WHERE user_id = ? ORDER BY version DESC LIMIT 1",
+                (user_id,),
+            ).fetchone()
+            if row:
+                raw: object = json.loads(row[0])
+                parsed = parse_profile_dict(raw)
+                return dict(parsed)
+            return {}
+
+        return await self._engine.read(_sync_load)
 
     @retry(attempts=3, base_delay=0.1)
     async def load_user_messages(
         self, user_id: str, since_timestamp: float = 0, limit: int | None = None
     ) -> list[str]:
-        def _sync_load() -> list[str]:
-            with DB.connect(self.db_path) as db:
-                query = "SELECT content FROM messages WHERE user_id = ? AND type = 'user' AND timestamp > ? ORDER BY timestamp ASC"
-                params: list[Any] = [user_id, since_timestamp]
+        rows = await self._load_user_messages(user_id, since_timestamp, limit)
+        return [content for _, content in rows]
+
+    async def _load_user_messages(
+        self, user_id: str, since_timestamp: float, limit: int | None
+    ) -> list[tuple[float, str]]:
+        def _sync_load(db: sqlite3.Connection) -> list[tuple[float, str]]:
+            query = "SELECT timestamp, content FROM messages WHERE user_id = ? AND type = 'user' AND timestamp > ? ORDER BY timestamp ASC"
+            params: list[Any] = [user_id, since_timestamp]
 
-                if limit is not None:
-                    query += " LIMIT ?"
-                    params.append(limit)
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
 
-                rows = db.execute(query, params).fetchall()
-                return [row[0] for row in rows]
+            rows = db.execute(query, params).fetchall()
+            return [(row[0], row[1]) for row in rows]
 
-        return await _run_sync(_sync_load)
+        return await self._engine.read(_sync_load)
 
     @retry(attempts=3, base_delay=0.1)
     async def count_user_messages(self, user_id: str, since_timestamp: float = 0) -> int:
-        def _sync_count() -> int:
-            with DB.connect(self.db_path) as db:
-                return db.execute(
-                    "SELECT COUNT(*) FROM messages WHERE user_id = ? AND type = 'user' AND timestamp > ?",
-                    (user_id, since_timestamp),
-                ).fetchone()[0]
-
-        return await _run_sync(_sync_count)
+        """O(1) lookup in user_stats when since_timestamp is the learned watermark."""
+
+        def _sync_count(db: sqlite3.Connection, seed: bool) -> int | None:
+            query = (
+                "SELECT message_count, learned_at, learned_count FROM user_stats WHERE user_id = ?"
+            )
+            row = db.execute(query, (user_id,)).fetchone()
+            if row is None:
+                if not seed:
+                    return None
+                _seed_user_stats(db, user_id)
+                row = db.execute(query, (user_id,)).fetchone()
+
+            message_count, learned_at, learned_count = row
+            if since_timestamp == learned_at:
+                return message_count - learned_count
+
+            return db.execute(
+                "SELECT COUNT(*) FROM messages WHERE user_id = ? AND type = 'user' AND timestamp > ?",
+                (user_id, since_timestamp),
+            ).fetchone()[0]
+
+        count = await self._engine.read(lambda db: _sync_count(db, seed=False))
+        if count is None:
+            # Missing counters are seeded on the writer
+            count = await self._engine.write(lambda db: _sync_count(db, seed=True))
+        return count or 0
 
     @retry(attempts=3, base_delay=0.1)
     async def delete_profile(self, user_id: str) -> int:
-        def _sync_delete() -> int:
-            with DB.connect(self.db_path) as db:
-                cursor = db.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,))
-                return cursor.rowcount
+        def _sync_delete(db: sqlite3.Connection) -> int:
+            cursor = db.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,))
+            db.execute("DELETE FROM user_stats WHERE user_id = ?", (user_id,))
+            return cursor.rowcount
 
-        return await _run_sync(_sync_delete)
+        return await self._engine.write(_sync_delete)
 
     @retry(attempts=3, base_delay=0.1)
     async def load_latest_metric(self, conversation_id: str) -> dict[str, Any] | None:
-        def _sync_load() -> dict[str, Any] | None:
-            with DB.connect(self.db_path) as db:
-                row = db.execute(
-                    "SELECT content FROM events WHERE conversation_id = ? AND type = 'metric' ORDER BY timestamp DESC LIMIT 1",
-                    (conversation_id,),
-                ).fetchone()
-                if row and row[0]:
-                    raw: object = json.loads(row[0])
-                    parsed = parse_metric_data_dict(raw)
-                    return dict(parsed)
-                return None
-
-        return await _run_sync(_sync_load)
+        def _sync_load(db: sqlite3.Connection) -> dict[str, Any] | None:
+            row = db.execute(
+                "SELECT content, encoding FROM events WHERE conversation_id = ? AND type = 'metric' ORDER BY timestamp DESC LIMIT 1",
+                (conversation_id,),
+            ).fetchone()
+            if row and row[0]:
+                raw: object = json.loads(decode_content(db, row[0], row[1]))
+                parsed = parse_metric_data_dict(raw)
+                return dict(parsed)
+            return None
+
+        return await self._engine.read(_sync_load)
 
     @retry(attempts=3, base_delay=0.1)
     async def load_messages_by_conversation_id(
         self, conversation_id: str, limit: int
     ) -> list[dict[str, Any]]:
-        def _sync_load() -> list[dict[str, Any]]:
-            with DB.connect(self.db_path) as db:
-                db.row_factory = sqlite3.Row
-                rows = db.execute(
-                    """
-                    SELECT timestamp, content FROM messages
-                    WHERE conversation_id = ? AND type = 'user'
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                    """,
-                    (conversation_id, limit),
-                ).fetchall()
-                return [{"timestamp": row["timestamp"], "content": row["content"]} for row in rows]
-
-        return await _run_sync(_sync_load)
+        def _sync_load(db: sqlite3.Connection) -> list[dict[str, Any]]:
+            db.row_factory = sqlite3.Row
+            rows = db.execute(
+                """
+                SELECT timestamp, content FROM messages
+                WHERE conversation_id = ? AND type = 'user'
+                ORDER BY timestamp DESC
+                LIMIT ?
+                """,
+                (conversation_id, limit),
+            ).fetchall()
+            return [{"timestamp": row["timestamp"], "content": row["content"]} for row in rows]
+
+        return await self._engine.read(_sync_load)
 
     @retry(attempts=3, base_delay=0.1)
     async def search_messages(
         self, query: str, user_id: str, exclude_conversation_id: str | None, limit: int = 3
     ) -> list[MessageMatch]:
-        def _sync_search() -> list[MessageMatch]:
-            with DB.connect(self.db_path) as db:
-                keywords = query.lower().split()
-                like_patterns = [f"%{keyword}%" for keyword in keywords]
-
-                exclude_clause = ""
-                params: list[str] = []
-
-                if exclude_conversation_id:
-                    exclude_clause = "AND conversation_id != ?"
-                    params.append(exclude_conversation_id)
-
-                like_clause = " OR ".join("LOWER(content) LIKE ?" for _ in like_patterns)
-                params.extend(like_patterns)
-
-                relevance_parts: list[str] = []
-                score_params: list[str] = []
-                for keyword in keywords:
-                    relevance_parts.append(
-                        "(LENGTH(content) - LENGTH(REPLACE(LOWER(content), ?, '')))"
-                    )
-                    score_params.append(keyword)
-
-                relevance_score = " + ".join(relevance_parts)
-
-                query_sql = f"""
-                    SELECT content, timestamp, conversation_id,
-                           ({relevance_score}) as relevance_score
-                    FROM messages
-                    WHERE type = 'user'
-                    AND user_id = ?
-                    {exclude_clause}
-                    AND ({like_clause})
-                    ORDER BY relevance_score DESC, timestamp DESC
-                    LIMIT ?
-                """
-                final_params: list[str | int] = [*score_params, user_id, *params]
-                final_params.append(limit)
-
-                rows = db.execute(query_sql, final_params).fetchall()
-
-                return [
+        scored = await self._search_messages(query, user_id, exclude_conversation_id, limit)
+        return [match for _, match in scored]
+
+    async def _search_messages(
+        self, query: str, user_id: str, exclude_conversation_id: str | None, limit: int
+    ) -> list[tuple[int, MessageMatch]]:
+        """Matches with their relevance score (keyword occurrence count)."""
+        keywords = query.lower().split()
+        if not keywords:
+            return []
+        query_sql = _search_sql(len(keywords), bool(exclude_conversation_id))
+        final_params: list[str | int] = [*keywords, user_id]
+        if exclude_conversation_id:
+            final_params.append(exclude_conversation_id)
+        final_params.extend(f"%{keyword}%" for keyword in keywords)
+        final_params.append(limit)
+
+        def _sync_search(db: sqlite3.Connection) -> list[tuple[int, MessageMatch]]:
+            rows = db.execute(query_sql, final_params).fetchall()
+            return [
+                (
+                    row[3],
                     MessageMatch(
                         content=row[0],
                         timestamp=row[1],
                         conversation_id=row[2],
-                    )
-                    for row in rows
-                ]
+                    ),
+                )
+                for row in rows
+            ]
 
-        return await _run_sync(_sync_search)
+        return await self._engine.read(_sync_search)
 
 
 def clear_messages(conversation_id: str, db_path: str = ".cogency/store.db") -> None:
     with DB.connect(db_path) as db:
+        # Counters are rebuilt lazily for affected users
+        db.execute(
+            "DELETE FROM user_stats WHERE user_id IN (SELECT DISTINCT user_id FROM messages WHERE conversation_id = ?)",
+            (conversation_id,),
+        )
+        blobs = [
+            row[0]
+            for row in db.execute(
+                "SELECT content FROM messages WHERE conversation_id = ? AND encoding = 'blob'",
+                (conversation_id,),
+            )
+        ]
         db.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
+        release_blobs(db, blobs, ())
 
 
 def default_storage(db_path: str = ".cogency/store.db") -> SQLite:
@@ -10,7 +10,9 @@ from cogency.core.tool import tool
 
 @dataclass
 class EditParams:
-    file: Annotated[str, ToolParam(description="File path to edit (relative to project root)")]
+    file: Annotated[
+        str, ToolParam(description="File path to edit (relative to project root)", path=True)
+    ]
     old: Annotated[
         str, ToolParam(description="Text to replace (must match exactly, including whitespace)")
     ]
@@ -24,7 +26,11 @@ def _compute_diff(file: str, old: str, new: str) -> str:
     return "".join(diff)
 
 
-@tool("Edit file by replacing text. Exact match (old) must be unique in file.")
+@tool(
+    "Edit file by replacing text. Exact match (old) must be unique in file.",
+    mutates=True,
+    cpu_bound=True,
+)
 @safe_execute
 async def edit(
     params: EditParams,
@@ -37,7 +37,9 @@ class FindParams:
     content: Annotated[str | None, ToolParam(description="Text content to search for in files")] = (
         None
     )
-    path: Annotated[str, ToolParam(description="Root search path (relative to project root)")] = "."
+    path: Annotated[
+        str, ToolParam(description="Root search path (relative to project root)", path=True)
+    ] = "."
 
 
 def _matches_pattern(filename: str, pattern: str) -> bool:
@@ -148,7 +150,7 @@ def _resolve_search_paths(
     return search_path, workspace_root
 
 
-@tool("Find files by name pattern or search file contents.")
+@tool("Find files by name pattern or search file contents.", idempotent=True, cpu_bound=True)
 @safe_execute
 async def find(
     params: FindParams,
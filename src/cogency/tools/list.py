@@ -1,4 +1,7 @@
+import asyncio
 import fnmatch
+import os
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Annotated, Any
@@ -14,6 +17,9 @@ from cogency.core.tool import tool
 # - Depth 4+: Excessive output, usually includes generated/vendor dirs
 # Trade-off: Readability vs completeness for typical project navigation
 DEFAULT_TREE_DEPTH = 3
+# Output caps: a huge tree would otherwise be persisted and resent every turn
+MAX_DIR_ENTRIES = 200  # Per directory; the rest are summarized as "... N not shown"
+MAX_TOTAL_ENTRIES = 1000
 DEFAULT_IGNORED_DIRS = [
     "node_modules",
     ".venv",
@@ -31,58 +37,71 @@ DEFAULT_IGNORED_DIRS = [
 @dataclass
 class ListParams:
     path: Annotated[
-        str, ToolParam(description="Directory path to list (relative to project root)")
+        str, ToolParam(description="Directory path to list (relative to project root)", path=True)
     ] = "."
     pattern: Annotated[
         str | None, ToolParam(description="Filter filenames by pattern (e.g., '*.py')")
     ] = None
 
 
-def _build_tree(
-    path: Path,
-    pattern: str,
-    depth: int,
-    *,
-    stats: dict[str, int],
-    current_depth: int = 0,
-    prefix: str = "",
-) -> list[str]:
-    lines: list[str] = []
-
-    if current_depth >= depth:
-        return lines
+def _walk(path: Path, pattern: str, depth: int, prefix: str = "") -> Iterator[tuple[str, str]]:
+    """Yield (kind, line) in tree order; kind is "dir", "file" or "more".
 
+    One scandir per directory: DirEntry carries the type info, so entries are
+    not stat'ed again to sort or classify. Lazy, so the caller stops the walk.
+    """
+    if depth <= 0:
+        return
+    dirs: list[os.DirEntry[str]] = []
+    files: list[os.DirEntry[str]] = []
     try:
-        items = sorted(path.iterdir(), key=lambda x: (x.is_file(), x.name))
-
-        for item in items:
-            if item.name.startswith(".") or item.name in DEFAULT_IGNORED_DIRS:
-                continue
-
-            if item.is_dir():
-                stats["dirs"] += 1
-                lines.append(f"{prefix}{item.name}/")
-                sub_lines = _build_tree(
-                    item,
-                    pattern,
-                    depth,
-                    stats=stats,
-                    current_depth=current_depth + 1,
-                    prefix=prefix + "  ",
-                )
-                lines.extend(sub_lines)
-
-            elif item.is_file() and fnmatch.fnmatch(item.name, pattern):
-                stats["files"] += 1
-                lines.append(f"{prefix}{item.name}")
-
-    except PermissionError:
-        pass
-
-    return lines
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or entry.name in DEFAULT_IGNORED_DIRS:
+                    continue
+                if entry.is_dir():
+                    dirs.append(entry)
+                elif entry.is_file() and fnmatch.fnmatch(entry.name, pattern):
+                    files.append(entry)
+    except OSError:
+        return
+
+    dirs.sort(key=lambda e: e.name)
+    files.sort(key=lambda e: e.name)
+    shown_dirs = dirs[:MAX_DIR_ENTRIES]
+    shown_files = files[: MAX_DIR_ENTRIES - len(shown_dirs)]
+    for entry in shown_dirs:
+        yield "dir", f"{prefix}{entry.name}/"
+        yield from _walk(Path(entry.path), pattern, depth - 1, prefix + "  ")
+    for entry in shown_files:
+        yield "file", f"{prefix}{entry.name}"
+
+    hidden_dirs, hidden_files = len(dirs) - len(shown_dirs), len(files) - len(shown_files)
+    if hidden_dirs or hidden_files:
+        yield "more", f"{prefix}... {_count(hidden_dirs, hidden_files)} not shown"
+
+
+def _count(dirs: int, files: int) -> str:
+    parts = [f"{dirs} {'dir' if dirs == 1 else 'dirs'}"] if dirs else []
+    if files:
+        parts.append(f"{files} {'file' if files == 1 else 'files'}")
+    return ", ".join(parts)
+
+
+def _build_tree(path: Path, pattern: str, depth: int) -> tuple[list[str], dict[str, int], bool]:
+    """Lines, listed counts, and whether the walk stopped at MAX_TOTAL_ENTRIES."""
+    lines: list[str] = []
+    stats = {"files": 0, "dirs": 0}
+    for kind, line in _walk(path, pattern, depth):
+        if kind != "more":
+            if stats["files"] + stats["dirs"] >= MAX_TOTAL_ENTRIES:
+                return lines, stats, True
+            stats[f"{kind}s"] += 1
+        lines.append(line)
+    return lines, stats, False
 
 
-@tool("List files in tree view (depth 3). Pattern filters filenames.")
+@tool("List files in tree view (depth 3). Pattern filters filenames.", idempotent=True)
 @safe_execute
 async def ls(
     params: ListParams,
@@ -104,9 +123,9 @@ async def ls(
     if not target.exists():
         return ToolResult(outcome=f"Directory '{params.path}' does not exist", error=True)
 
-    stats = {"files": 0, "dirs": 0}
-
-    tree_lines = _build_tree(target, pattern, depth=DEFAULT_TREE_DEPTH, stats=stats)
+    tree_lines, stats, truncated = await asyncio.to_thread(
+        _build_tree, target, pattern, DEFAULT_TREE_DEPTH
+    )
 
     if not tree_lines:
         return ToolResult(outcome="Listed 0 items", content="No files found")
@@ -120,4 +139,10 @@ async def ls(
     else:
         outcome = f"Listed {stats['files']} {'file' if stats['files'] == 1 else 'files'}"
 
+    if truncated:
+        outcome += " (truncated)"
+        content += (
+            f"\n[Listing stopped at {MAX_TOTAL_ENTRIES} entries."
+            " Narrow with a subdirectory path or a pattern.]"
+        )
     return ToolResult(outcome=outcome, content=f"Contents:\n{content}")
@@ -1,3 +1,18 @@
+"""File reads. Paged reads seek through an mmap using a cached line index.
+
+The index keeps the byte offset of every INDEX_STRIDE-th line, keyed by
+(path, mtime, size), so page N costs a seek plus at most a stride of newline
+scans instead of a pass over everything before it. Whole-file reads over
+MAX_READ_BYTES return the head and tail with a hint to page. Budgets count the
+numbered output, so line prefixes and hints never push a read past the cap.
+"""
+
+import asyncio
+import codecs
+import mmap
+import threading
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Annotated, Any
@@ -7,30 +22,191 @@ from cogency.core.protocols import ToolParam, ToolResult
 from cogency.core.security import resolve_file, safe_execute
 from cogency.core.tool import tool
 
+INDEX_STRIDE = 1024  # Lines between index checkpoints
+INDEX_CACHE = 32  # Files whose index is kept
+MAX_READ_BYTES = 1024 * 1024  # Whole-file and open-ended reads beyond this are cut
+TEXT_SAMPLE = 8192  # Bytes checked for binary content at each end of a large file
+HEAD_LINES = 200
+TAIL_LINES = 50
+
 
 @dataclass
 class ReadParams:
-    file: Annotated[str, ToolParam(description="File path to read (relative to project root)")]
+    file: Annotated[
+        str, ToolParam(description="File path to read (relative to project root)", path=True)
+    ]
     start: Annotated[int, ToolParam(description="Starting line number (0-indexed)", ge=0)] = 0
     lines: Annotated[
         int | None, ToolParam(description="Number of lines to read", ge=1, le=10000)
     ] = None
 
 
-def _read_lines(file_path: Path, start: int, lines: int | None = None) -> str:
-    result_lines: list[str] = []
-    with file_path.open(encoding="utf-8") as f:
-        for line_num, line in enumerate(f, 0):
-            if line_num < start:
-                continue
-            if lines and len(result_lines) >= lines:
-                break
-            result_lines.append(f"{line_num}: {line.rstrip(chr(10))}")
+@dataclass(frozen=True)
+class _Index:
+    checkpoints: "array[int]"  # Byte offset of every INDEX_STRIDE-th line
+    lines: int
+
+
+_indexes: OrderedDict[tuple[str, int, int], _Index] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _build_index(mm: mmap.mmap) -> _Index:
+    checkpoints = array("q", [0])
+    newlines, pos = 0, 0
+    while (pos := mm.find(b"\n", pos)) != -1:
+        newlines += 1
+        pos += 1
+        if newlines % INDEX_STRIDE == 0:
+            checkpoints.append(pos)
+    trailing = len(mm) > 0 and mm[-1:] != b"\n"
+    return _Index(checkpoints, newlines + trailing)
+
+
+def _index(path: Path, mm: mmap.mmap) -> _Index:
+    """Line index for the file, cached while its mtime and size are unchanged."""
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _indexes_lock:
+        if (index := _indexes.get(key)) is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = _build_index(mm)
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > INDEX_CACHE:
+            _indexes.popitem(last=False)
+    return index
+
+
+def _offset(mm: mmap.mmap, index: _Index, line: int) -> int:
+    """Byte offset where `line` starts: a checkpoint, then at most a stride of finds."""
+    pos = index.checkpoints[line // INDEX_STRIDE]
+    for _ in range(line % INDEX_STRIDE):
+        pos = mm.find(b"\n", pos) + 1
+    return pos
+
+
+def _numbered(mm: mmap.mmap, start: int, begin: int, end: int) -> list[str]:
+    # A cut can split a character; strict decoding still rejects binary files up front
+    text = mm[begin:end].decode("utf-8", errors="replace")
+    # Split on "\n" only, as the index does: splitlines() also breaks on \f, \u2028 etc.
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return [f"{start + i}: {line.removesuffix(chr(13))}" for i, line in enumerate(lines)]
+
+
+def _cut(mm: mmap.mmap, begin: int, end: int, limit: int) -> int:
+    """End of the span, pulled back to a line boundary if it runs past `limit` bytes."""
+    if end - begin <= limit:
+        return end
+    return mm.rfind(b"\n", begin, begin + limit) + 1 or begin + limit
+
+
+def _fit(numbered: list[str], limit: int, *, tail: bool = False) -> list[str]:
+    """The most lines (from the end if `tail`) whose joined output fits in `limit` bytes.
+
+    At least one line is kept; its raw bytes were already cut to fit beside its prefix.
+    """
+    used, kept = 0, 0
+    for line in reversed(numbered) if tail else numbered:
+        used += len(line.encode()) + 1
+        if used > limit and kept:
+            break
+        kept += 1
+    return numbered[len(numbered) - kept :] if tail else numbered[:kept]
+
+
+def _read_lines(mm: mmap.mmap, index: _Index, start: int, lines: int | None) -> tuple[str, int]:
+    if start >= index.lines:
+        return "", 0
+    begin = _offset(mm, index, start)
+    stop = index.lines if lines is None else min(start + lines, index.lines)
+    end = _offset(mm, index, stop) if stop < index.lines else len(mm)
+    # Leave room for the truncation note and the widest line number
+    limit = MAX_READ_BYTES - len(_truncated(index.lines)) - 1
+    cut = _cut(mm, begin, end, limit - len(f"{stop}: "))
+    numbered = _fit(_numbered(mm, start, begin, cut), limit)
+    count = len(numbered)
+    if cut < end or start + count < stop:
+        numbered.append(_truncated(start + count))
+    return "\n".join(numbered), count
+
+
+def _truncated(resume: int) -> str:
+    return f"[Truncated at {MAX_READ_BYTES} bytes. Continue with start={resume}]"
+
+
+def _hint(size: int, lines: int, head: int, tail_start: int | None) -> str:
+    tail = f" and {tail_start}-{lines - 1}" if tail_start is not None else ""
+    return (
+        f"[File is {size} bytes, {lines} lines; showing lines 0-{head - 1}{tail}. "
+        "Use start/lines to read the rest.]"
+    )
+
+
+def _head_and_tail(mm: mmap.mmap, index: _Index, size: int) -> str:
+    # Head and tail split what the widest hint leaves; prefixes come out of each half
+    budget = (MAX_READ_BYTES - len(_hint(size, index.lines, index.lines, index.lines)) - 2) // 2
+    prefix = len(f"{index.lines}: ")
+    head_lines = min(HEAD_LINES, index.lines)
+    head_end = _offset(mm, index, head_lines) if head_lines < index.lines else size
+    head = _fit(_numbered(mm, 0, 0, _cut(mm, 0, head_end, budget - prefix)), budget)
+
+    tail_start = max(index.lines - TAIL_LINES, len(head))
+    tail: list[str] = []
+    if tail_start < index.lines:
+        begin = _offset(mm, index, tail_start)
+        raw = budget - prefix
+        if size - begin > raw:  # Long lines: keep only the last full lines that fit
+            begin = mm.find(b"\n", size - raw) + 1 or size - raw
+            tail_start = index.lines - mm[begin:].count(b"\n") - (mm[-1:] != b"\n")
+        tail = _fit(_numbered(mm, tail_start, begin, size), budget, tail=True)
+        tail_start = index.lines - len(tail)
+
+    hint = _hint(size, index.lines, len(head), tail_start if tail else None)
+    return "\n".join([*head, hint, *tail])
+
+
+def _check_text(mm: mmap.mmap) -> None:
+    """Reject binary files before slicing, where decoding is lenient.
+
+    Only TEXT_SAMPLE bytes at each end are checked; binary data confined to the
+    middle of a large file is still read, decoded leniently.
+    """
+    tail = mm[max(len(mm) - TEXT_SAMPLE, TEXT_SAMPLE) :]
+    skip = 0
+    while skip < min(3, len(tail)) and 0x80 <= tail[skip] < 0xC0:  # Split first character
+        skip += 1
+    for sample in (mm[:TEXT_SAMPLE], tail[skip:]):
+        codecs.getincrementaldecoder("utf-8")().decode(sample)  # Tolerates a split last character
+        if b"\x00" in sample:
+            raise UnicodeDecodeError(
+                "utf-8", sample, sample.index(b"\x00"), len(sample), "NUL byte"
+            )
+
+
+def _read_file(path: Path, start: int, lines: int | None) -> tuple[str, int]:
+    """Content and line count. Small whole-file reads stay plain text."""
+    size = path.stat().st_size
+    paged = start > 0 or lines is not None
+    if size == 0:
+        return "", 0
+    if not paged and size <= MAX_READ_BYTES:
+        with path.open(encoding="utf-8") as f:
+            content = f.read()
+        return content, content.count("\n") + (not content.endswith("\n"))
 
-    return "\n".join(result_lines)
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _check_text(mm)
+        index = _index(path, mm)
+        if paged:
+            return _read_lines(mm, index, start, lines)
+        return _head_and_tail(mm, index, size), index.lines
 
 
-@tool("Read file. Use start/lines for pagination on large files.")
+@tool("Read file. Use start/lines for pagination on large files.", idempotent=True)
 @safe_execute
 async def read(
     params: ReadParams,
@@ -56,15 +232,10 @@ async def read(
                 error=True,
             )
 
-        if params.start > 0 or params.lines is not None:
-            content = _read_lines(file_path, params.start, params.lines)
-            line_count = len(content.splitlines())
-            outcome = f"Read {params.file} ({line_count} lines)"
-        else:
-            with file_path.open(encoding="utf-8") as f:
-                content = f.read()
-            line_count = len(content.splitlines())
-            outcome = f"Read {params.file} ({line_count} lines)"
+        content, line_count = await asyncio.to_thread(
+            _read_file, file_path, params.start, params.lines
+        )
+        outcome = f"Read {params.file} ({line_count} lines)"
 
         return ToolResult(outcome=outcome, content=content)
 
@@ -1,7 +1,22 @@
+"""Find-and-replace across files in two phases.
+
+1. Scan: matched files are read and their replacements computed in memory, in
+   parallel. Unchanged files are dropped here; nothing is written.
+2. Commit: each changed file is written to a temp file beside it and swapped in
+   with os.replace. If a write fails, files already committed are restored from
+   their in-memory originals, so no .bak copies are made.
+"""
+
+import asyncio
 import difflib
+import os
 import re
 import shutil
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Annotated, Any
 
@@ -11,6 +26,8 @@ from cogency.core.protocols import ToolParam, ToolResult
 from cogency.core.security import resolve_file, safe_execute
 from cogency.core.tool import tool
 
+SCAN_WORKERS = 8
+
 
 @dataclass
 class ReplaceParams:
@@ -44,12 +61,38 @@ def _compute_diff(file: str, old: str, new: str) -> str:
     return "".join(diff)
 
 
-def _rollback_backups(backups: list[Path]):
-    for backup_path in backups:
-        if backup_path.exists():
-            original_path = backup_path.with_suffix("")
-            shutil.copy(backup_path, original_path)
-            backup_path.unlink()
+@dataclass(frozen=True)
+class _Change:
+    path: Path
+    original: str
+    new: str
+    count: int
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    """Temp file in the same directory, then os.replace: readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        shutil.copymode(path, tmp)
+        Path(tmp).replace(path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _commit(changes: list[_Change]) -> None:
+    """Write every change; on failure restore the files already written."""
+    written: list[_Change] = []
+    try:
+        for change in changes:
+            _write_atomic(change.path, change.new)
+            written.append(change)
+    except BaseException:
+        for change in reversed(written):
+            _write_atomic(change.path, change.original)
+        raise
 
 
 def _validate_and_resolve_files(
@@ -100,35 +143,70 @@ def _format_result(matched_count: int, changed_files: dict[str, int], total: int
     return msg
 
 
-def _process_replacement(file_path: Path, params: ReplaceParams) -> tuple[str, int] | ToolResult:
+def _replacer(params: ReplaceParams) -> Callable[[str], tuple[str, int]] | ToolResult:
+    if params.exact:
+
+        def exact(text: str) -> tuple[str, int]:
+            count = text.count(params.old)
+            return (text.replace(params.old, params.new, 1), 1) if count == 1 else (text, count)
+
+        return exact
+    try:
+        compiled = re.compile(params.old)
+    except re.error as e:
+        return ToolResult(outcome=f"Error: Invalid regex pattern '{params.old}': {e}", error=True)
+    return lambda text: compiled.subn(params.new, text)
+
+
+def _scan(
+    file_path: Path, params: ReplaceParams, apply: Callable[[str], tuple[str, int]]
+) -> _Change | ToolResult | None:
+    """Phase one: compute the replacement in memory. None when the file is unchanged."""
     try:
-        original_content = file_path.read_text(encoding="utf-8")
+        with file_path.open(encoding="utf-8", newline="") as f:
+            original = f.read()
     except UnicodeDecodeError:
-        return "", 0
+        return None
 
-    if params.exact:
-        occurrences = original_content.count(params.old)
-        if occurrences > 1:
-            return ToolResult(
-                outcome=f"Error: Exact string '{params.old}' found multiple times in '{file_path}'. Use exact=False for regex mode or refine 'old' string.",
-                error=True,
-            )
-        if occurrences == 1:
-            return original_content.replace(params.old, params.new, 1), 1
-        return original_content, 0
-    else:
-        try:
-            compiled_regex = re.compile(params.old)
-            new_content, count = compiled_regex.subn(params.new, original_content)
-            return new_content, count
-        except re.error as e:
-            return ToolResult(
-                outcome=f"Error: Invalid regex pattern '{params.old}': {e}",
-                error=True,
-            )
-
-
-@tool("Performs find-and-replace operations across multiple files matching a glob pattern.")
+    new, count = apply(original)
+    if params.exact and count > 1:
+        return ToolResult(
+            outcome=f"Error: Exact string '{params.old}' found multiple times in '{file_path}'. Use exact=False for regex mode or refine 'old' string.",
+            error=True,
+        )
+    # Matches that rewrite to the same text (old == new) leave the file untouched
+    return _Change(file_path, original, new, count) if new != original else None
+
+
+def _replace_files(matched_files: list[Path], params: ReplaceParams) -> ToolResult:
+    apply = _replacer(params)
+    if isinstance(apply, ToolResult):
+        return apply
+
+    with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(matched_files))) as pool:
+        scanned = list(pool.map(partial(_scan, params=params, apply=apply), matched_files))
+
+    changes: list[_Change] = []
+    for result in scanned:
+        if isinstance(result, ToolResult):
+            return result  # Nothing has been written yet
+        if result is not None:
+            changes.append(result)
+
+    _commit(changes)
+
+    changed_files = {str(change.path): change.count for change in changes}
+    total_replacements = sum(change.count for change in changes)
+    diffs = [_compute_diff(str(c.path), c.original, c.new) for c in changes]
+    outcome_msg = _format_result(len(matched_files), changed_files, total_replacements)
+    return ToolResult(outcome=outcome_msg, content="\n".join(diffs))
+
+
+@tool(
+    "Performs find-and-replace operations across multiple files matching a glob pattern.",
+    mutates=True,
+    cpu_bound=True,
+)
 @safe_execute
 async def replace(
     params: ReplaceParams,
@@ -141,46 +219,7 @@ async def replace(
         return files_or_error
     matched_files = files_or_error
 
-    changed_files: dict[str, int] = {}
-    all_backups: list[Path] = []
-    total_replacements = 0
-    all_diffs: list[str] = []
-
     try:
-        for file_path in matched_files:
-            backup_path = file_path.with_suffix(file_path.suffix + ".bak")
-            try:
-                original_content = file_path.read_text(encoding="utf-8")
-            except UnicodeDecodeError:
-                continue
-
-            shutil.copy(file_path, backup_path)
-            all_backups.append(backup_path)
-
-            result = _process_replacement(file_path, params)
-            if isinstance(result, ToolResult):
-                _rollback_backups(all_backups)
-                return result
-
-            new_content, replacements_in_file = result
-
-            if replacements_in_file > 0:
-                file_path.write_text(new_content, encoding="utf-8")
-                changed_files[str(file_path)] = replacements_in_file
-                total_replacements += replacements_in_file
-                diff = _compute_diff(str(file_path), original_content, new_content)
-                all_diffs.append(diff)
-            else:
-                backup_path.unlink()
-                all_backups.remove(backup_path)
-
-        outcome_msg = _format_result(len(matched_files), changed_files, total_replacements)
-        return ToolResult(outcome=outcome_msg, content="\n".join(all_diffs))
-
+        return await asyncio.to_thread(_replace_files, matched_files, params)
     except Exception as e:
-        _rollback_backups(all_backups)
         return ToolResult(outcome=f"An unexpected error occurred: {e}", error=True)
-    finally:
-        for backup in all_backups:
-            if backup.exists():
-                backup.unlink()
@@ -1,12 +1,17 @@
+import asyncio
 import logging
 import re
 from dataclasses import dataclass
 from typing import Annotated, Any
 from urllib.parse import urlparse
 
+import httpx
+
+from cogency.core.cache import WEB_TTL
 from cogency.core.protocols import ToolParam, ToolResult
 from cogency.core.security import safe_execute
 from cogency.core.tool import tool
+from cogency.lib import http
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +49,7 @@ def _extract_domain(url: str) -> str:
         return "unknown-domain"
 
 
-@tool("Scrape webpage. Extracts readable text (3KB limit).")
+@tool("Scrape webpage. Extracts readable text (3KB limit).", idempotent=True, ttl=WEB_TTL)
 @safe_execute
 async def scrape(
     params: ScrapeParams,
@@ -63,13 +68,23 @@ async def scrape(
             error=True,
         )
 
-    content = trafilatura.fetch_url(url)
-    if not content:
+    try:
+        response = await http.fetch(url)
+    except http.ResponseTooLarge:
+        return ToolResult(
+            outcome=f"Page too large to scrape (over {http.MAX_FETCH_BYTES // 1024 // 1024}MB): {url}",
+            error=True,
+        )
+    except httpx.HTTPError as e:
+        logger.debug(f"Fetch failed for {url}: {e}")
+        return ToolResult(outcome=f"Failed to fetch content from: {url}", error=True)
+    if not response.text:
         return ToolResult(outcome=f"Failed to fetch content from: {url}", error=True)
 
     domain = _extract_domain(url)
 
-    extracted = trafilatura.extract(content, include_tables=True)
+    # lxml parsing is CPU work; keep it off the event loop
+    extracted = await asyncio.to_thread(trafilatura.extract, response.text, include_tables=True)
     if not extracted:
         return ToolResult(outcome=f"Scraped {domain} (0KB)", content="No readable content found")
 
@@ -1,10 +1,107 @@
+"""Web search through a pluggable backend, with a process-wide TTL cache.
+
+The default backend is DDGS metasearch: its blocking client runs in worker
+threads (one reusable client per thread), never on the event loop. Results are
+cached by normalized query for SEARCH_TTL seconds and shared across users and
+conversations; concurrent identical searches share one backend call.
+
+Swap the backend with `set_backend`, e.g. a local index or a stub in tests.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Annotated, Any
+from typing import Annotated, Any, Protocol
 
+from cogency.core.cache import WEB_TTL
 from cogency.core.protocols import ToolParam, ToolResult
 from cogency.core.security import safe_execute
 from cogency.core.tool import tool
 
+RESULT_LIMIT = 5
+SEARCH_TTL = WEB_TTL
+SEARCH_CACHE = 256  # Queries kept
+
+Hit = dict[str, str]  # title, body, href
+
+
+class SearchBackend(Protocol):
+    async def search(self, query: str, limit: int) -> list[Hit]: ...
+
+
+class DDGSBackend:
+    """DDGS metasearch. Raises ImportError from search() when ddgs isn't installed."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def _text(self, query: str, limit: int) -> list[Hit]:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            from ddgs import DDGS  # type: ignore[reportUnknownVariableType]
+
+            client = self._local.client = DDGS()
+        return client.text(query, max_results=limit)
+
+    async def search(self, query: str, limit: int) -> list[Hit]:
+        return await asyncio.to_thread(self._text, query, limit)
+
+
+_backend: SearchBackend | None = None
+_cache: OrderedDict[tuple[str, int], tuple[float, list[Hit]]] = OrderedDict()
+_pending: dict[tuple[str, int], "asyncio.Task[list[Hit]]"] = {}
+
+
+def set_backend(backend: SearchBackend | None) -> None:
+    """Use `backend` for all searches (None restores DDGS). Clears cached results."""
+    global _backend
+    _backend = backend
+    _cache.clear()
+
+
+def _normalize(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+async def _fetch(backend: SearchBackend, key: tuple[str, int], query: str) -> list[Hit]:
+    try:
+        results = await backend.search(query, key[1])
+    finally:
+        if _pending.get(key) is asyncio.current_task():
+            del _pending[key]
+    if results:  # An empty page may be a transient failure; don't pin it
+        _cache[key] = (time.monotonic() + SEARCH_TTL, results)
+        while len(_cache) > SEARCH_CACHE:
+            _cache.popitem(last=False)
+    return results
+
+
+def _settled(task: "asyncio.Task[list[Hit]]") -> None:
+    if not task.cancelled():
+        task.exception()  # Retrieved even when every caller has gone
+
+
+async def _search(query: str, limit: int) -> list[Hit]:
+    global _backend
+    key = (_normalize(query), limit)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _cache.move_to_end(key)
+        return cached[1]
+
+    # The backend call runs as its own task, detached from whichever caller
+    # started it: cancelling one caller never cancels the others sharing it
+    task = _pending.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        if _backend is None:
+            _backend = DDGSBackend()
+        task = asyncio.ensure_future(_fetch(_backend, key, query))
+        task.add_done_callback(_settled)
+        _pending[key] = task
+    return await asyncio.shield(task)
+
 
 @dataclass
 class SearchParams:
@@ -13,7 +110,11 @@ class SearchParams:
     ]
 
 
-@tool("Search the web. Returns up to 5 results with title, body, and URL.")
+@tool(
+    "Search the web. Returns up to 5 results with title, body, and URL.",
+    idempotent=True,
+    ttl=WEB_TTL,
+)
 @safe_execute
 async def search(
     params: SearchParams,
@@ -23,16 +124,12 @@ async def search(
         return ToolResult(outcome="Search query cannot be empty", error=True)
 
     try:
-        from ddgs import DDGS  # type: ignore[reportUnknownVariableType]
+        results = await _search(params.query.strip(), RESULT_LIMIT)
     except ImportError:
         return ToolResult(
             outcome="DDGS metasearch not available. Install with: pip install ddgs", error=True
         )
 
-    effective_limit = 5
-
-    results: list[dict[str, str]] = DDGS().text(params.query.strip(), max_results=effective_limit)
-
     if not results:
         return ToolResult(
             outcome=f"Found 0 results for '{params.query}'", content="No results found"
@@ -48,7 +48,7 @@ def _format_result(result: subprocess.CompletedProcess[str]) -> ToolResult:
     return ToolResult(outcome="Success", content="\n".join(content_parts) if content_parts else "")
 
 
-@tool("Run shell command (30s timeout). Each call starts in project root.")
+@tool("Run shell command (30s timeout). Each call starts in project root.", mutates=True)
 @safe_execute
 async def shell(
     params: ShellParams,
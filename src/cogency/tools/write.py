@@ -9,12 +9,14 @@ from cogency.core.tool import tool
 
 @dataclass
 class WriteParams:
-    file: Annotated[str, ToolParam(description="File path to write (relative to project root)")]
+    file: Annotated[
+        str, ToolParam(description="File path to write (relative to project root)", path=True)
+    ]
     content: Annotated[str, ToolParam(description="File content to write")]
     overwrite: Annotated[bool, ToolParam(description="Overwrite file if exists")] = False
 
 
-@tool("Write file. Fails if file exists unless overwrite=true.")
+@tool("Write file. Fails if file exists unless overwrite=true.", mutates=True)
 @safe_execute
 async def write(
     params: WriteParams,
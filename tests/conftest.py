@@ -1,8 +1,12 @@
+import uuid
+from functools import partial
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from cogency.context import profile
 from cogency.core.protocols import LLM, Tool, ToolResult
+from cogency.lib import sqlite
 
 
 class TestStorage:
@@ -14,8 +18,10 @@ class TestStorage:
         self.base_dir = None
 
     async def save_message(self, conversation_id, user_id, type, content, timestamp=None, **_):
+        message_id = str(uuid.uuid4())
         self.messages.append(
             {
+                "message_id": message_id,
                 "conversation_id": conversation_id,
                 "user_id": user_id,
                 "type": type,
@@ -23,6 +29,7 @@ class TestStorage:
                 "timestamp": timestamp,
             }
         )
+        return message_id
 
     async def save_event(self, conversation_id, type, content, timestamp=None, **_):
         self.events.append(
@@ -46,17 +53,38 @@ class TestStorage:
         )
 
     async def load_messages(
-        self, conversation_id, user_id=None, include=None, exclude=None, limit=None
+        self,
+        conversation_id,
+        user_id=None,
+        include=None,
+        exclude=None,
+        limit=None,
+        *,
+        after_id=None,
+        after_timestamp=None,
     ):
-        messages = [
-            msg
-            for msg in self.messages
-            if msg["conversation_id"] == conversation_id
-            and (user_id is None or msg.get("user_id") == user_id)
-        ]
-        if limit is not None:
-            messages = messages[-limit:]
-        return messages
+        if after_id is not None and after_timestamp is not None:
+            raise ValueError("Pass after_id or after_timestamp, not both")
+        messages = [msg for msg in self.messages if msg["conversation_id"] == conversation_id]
+        if after_id is not None:
+            ids = [msg["message_id"] for msg in messages]
+            if after_id not in ids:
+                raise ValueError(f"Unknown message cursor: {after_id}")
+            messages = messages[ids.index(after_id) + 1 :]
+        elif after_timestamp is not None:
+            messages = [msg for msg in messages if (msg["timestamp"] or 0) > after_timestamp]
+        if user_id is not None:
+            messages = [msg for msg in messages if msg.get("user_id") == user_id]
+        if include:
+            messages = [msg for msg in messages if msg["type"] in include]
+        elif exclude:
+            messages = [msg for msg in messages if msg["type"] not in exclude]
+        if limit is None:
+            return messages
+        forward = after_id is not None or after_timestamp is not None
+        if forward:
+            return messages[:limit]
+        return messages[-limit:] if limit > 0 else []
 
     async def save_profile(self, user_id, profile):
         self.profiles[user_id] = profile
@@ -98,6 +126,17 @@ async def get_agent_response(agent, query, **kwargs):
 pytest_plugins = ["pytest_asyncio"]
 
 
+@pytest.fixture(autouse=True)
+def isolated_default_storage(tmp_path, monkeypatch):
+    """Agents built without storage write to tmp_path, never the repo's .cogency/store.db."""
+    default = partial(sqlite.default_storage, str(tmp_path / "store.db"))
+    monkeypatch.setattr("cogency.agent.default_storage", default)
+    monkeypatch.setattr(sqlite, "default_storage", default)
+    profile._default_storage.cache_clear()
+    yield
+    profile._default_storage.cache_clear()
+
+
 def mock_generator(items):
     async def async_gen():
         for item in items:
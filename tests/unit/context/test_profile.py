@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -97,3 +98,215 @@ def test_learn_disabled(mock_config):
         llm=mock_config.llm,
     )
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_get_caches_profile(tmp_path):
+    storage = SQLite(db_path=f"{tmp_path}/test.db")
+    await storage.save_profile("user1", {"who": "Alice"})
+
+    load = AsyncMock(wraps=storage.load_profile)
+    storage.load_profile = load
+
+    cached = await profile.get("user1", storage)
+    assert cached is not None
+    assert cached["who"] == "Alice"
+    assert (await profile.format("user1", storage)).startswith("USER PROFILE")
+    assert load.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_default_storage_shares_cache_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    profile._default_storage.cache_clear()
+    profile.cache.clear()
+    try:
+        await profile.get("user1")
+        await profile.get("user1")
+        assert len(profile.cache) == 1
+        assert profile._default_storage() is profile._default_storage()
+    finally:
+        profile._default_storage.cache_clear()
+        profile.cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_save_and_delete_invalidate_cache(tmp_path):
+    storage = SQLite(db_path=f"{tmp_path}/test.db")
+
+    assert await profile.get("user1", storage) == {}
+
+    await profile.save("user1", {"who": "Alice"}, storage=storage)
+    saved = await profile.get("user1", storage)
+    assert saved is not None
+    assert saved["who"] == "Alice"
+
+    await profile.delete("user1", storage=storage)
+    assert await profile.get("user1", storage) == {}
+
+
+def test_cache_is_bounded_and_expires(mock_storage):
+    cache = profile.ProfileCache(size=2, ttl=60.0)
+    cache.put(mock_storage, "a", {"who": "a"})
+    cache.put(mock_storage, "b", {"who": "b"})
+    cache.get(mock_storage, "a")
+    cache.put(mock_storage, "c", {"who": "c"})
+
+    assert len(cache) == 2
+    assert cache.get(mock_storage, "b") is None
+    assert cache.get(mock_storage, "a") == {"who": "a"}
+
+    expired = profile.ProfileCache(size=2, ttl=0.0)
+    expired.put(mock_storage, "a", {"who": "a"})
+    assert expired.get(mock_storage, "a") is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_coalesces_per_user(mock_storage, mock_llm):
+    scheduler = profile.ProfileScheduler(workers=1, batch_size=1)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = []
+
+    async def fake_learn(user_id, **kwargs):
+        calls.append(user_id)
+        started.set()
+        await release.wait()
+        return True
+
+    with patch("cogency.context.profile.learn_async", side_effect=fake_learn):
+        scheduler.submit("alice", storage=mock_storage, llm=mock_llm)
+        await started.wait()
+        # alice running: one follow-up job for alice, others coalesce into it
+        for _ in range(3):
+            scheduler.submit("alice", storage=mock_storage, llm=mock_llm)
+        scheduler.submit("bob", storage=mock_storage, llm=mock_llm)
+
+        stats = scheduler.stats()
+        assert stats["running"] == 1
+        assert stats["pending"] == 2
+        assert stats["coalesced"] == 2
+
+        release.set()
+        assert await scheduler.drain(timeout=1.0)
+
+    assert calls == ["alice", "alice", "bob"]
+    assert scheduler.stats()["completed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bounded_queue_and_workers(mock_storage, mock_llm):
+    scheduler = profile.ProfileScheduler(workers=2, max_pending=3, batch_size=1)
+    active = 0
+    peak = 0
+
+    async def fake_learn(user_id, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return True
+
+    with patch("cogency.context.profile.learn_async", side_effect=fake_learn):
+        accepted = [
+            scheduler.submit(f"user{i}", storage=mock_storage, llm=mock_llm) for i in range(5)
+        ]
+        assert await scheduler.drain(timeout=1.0)
+
+    assert accepted == [True, True, True, False, False]
+    assert peak == 2
+    assert scheduler.stats()["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_defers_to_foreground(mock_storage, mock_llm):
+    scheduler = profile.ProfileScheduler(max_defer=5.0)
+    calls = []
+
+    async def fake_learn(user_id, **kwargs):
+        calls.append(user_id)
+        return True
+
+    with patch("cogency.context.profile.learn_async", side_effect=fake_learn):
+        with scheduler.foreground():
+            scheduler.submit("alice", storage=mock_storage, llm=mock_llm)
+            await asyncio.sleep(0.02)
+            assert calls == []
+        assert await scheduler.drain(timeout=1.0)
+
+    assert calls == ["alice"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_records_failures(mock_storage, mock_llm):
+    scheduler = profile.ProfileScheduler()
+
+    with patch(
+        "cogency.context.profile.learn_async", new_callable=AsyncMock, side_effect=RuntimeError
+    ):
+        scheduler.submit("alice", storage=mock_storage, llm=mock_llm)
+        assert await scheduler.drain(timeout=1.0)
+
+    assert scheduler.stats()["failed"] == 1
+
+
+async def _seed_users(storage, users, count=5):
+    for user_id in users:
+        for i in range(count):
+            await storage.save_message(f"conv-{user_id}", user_id, "user", f"{user_id} msg {i}")
+
+
+@pytest.mark.asyncio
+async def test_learn_batch_single_llm_call(tmp_path, mock_llm):
+    storage = SQLite(db_path=f"{tmp_path}/test.db")
+    await _seed_users(storage, ["alice", "bob"])
+    mock_llm.generate.return_value = '{"u0": {"who": "Alice"}, "u1": {"who": "Bob"}}'
+
+    results = await profile.learn_batch([("alice", storage, 5), ("bob", storage, 5)], llm=mock_llm)
+
+    assert results == [True, True]
+    mock_llm.generate.assert_called_once()
+    prompt_text = mock_llm.generate.call_args[0][0][0]["content"]
+    assert "[u0]" in prompt_text
+    assert "alice msg 0" in prompt_text
+    assert "bob msg 4" in prompt_text
+    assert (await storage.load_profile("alice"))["who"] == "Alice"
+    assert (await storage.load_profile("bob"))["who"] == "Bob"
+
+
+@pytest.mark.asyncio
+async def test_learn_batch_falls_back_per_user(tmp_path, mock_llm):
+    storage = SQLite(db_path=f"{tmp_path}/test.db")
+    await _seed_users(storage, ["alice", "bob"])
+    await _seed_users(storage, ["carol"], count=1)  # below cadence
+    mock_llm.generate.side_effect = ['{"u0": {"who": "Alice"}}', '{"who": "Bob"}']
+
+    results = await profile.learn_batch(
+        [("alice", storage, 5), ("bob", storage, 5), ("carol", storage, 5)], llm=mock_llm
+    )
+
+    assert results == [True, True, False]
+    assert mock_llm.generate.call_count == 2
+    assert (await storage.load_profile("bob"))["who"] == "Bob"
+
+
+@pytest.mark.asyncio
+async def test_scheduler_batches_ready_users(mock_storage, mock_llm):
+    scheduler = profile.ProfileScheduler(workers=1, batch_size=8)
+    batches = []
+
+    async def fake_batch(users, *, llm):
+        batches.append([user_id for user_id, _, _ in users])
+        return [True] * len(users)
+
+    with patch("cogency.context.profile.learn_batch", side_effect=fake_batch):
+        with scheduler.foreground():
+            for user_id in ("alice", "bob", "carol"):
+                scheduler.submit(user_id, storage=mock_storage, llm=mock_llm)
+            await asyncio.sleep(0)
+        assert await scheduler.drain(timeout=1.0)
+
+    assert batches == [["alice", "bob", "carol"]]
+    assert scheduler.stats()["batches"] == 1
+    assert scheduler.stats()["completed"] == 3
@@ -0,0 +1,88 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from cogency.core.cache import ResultCache
+from cogency.core.config import Config, Security
+from cogency.core.executor import execute_tool
+from cogency.core.protocols import ToolCall, ToolResult
+from cogency.core.tool import tool
+from cogency.tools import read, write
+
+
+@dataclass
+class QueryParams:
+    query: str
+
+
+def _config(mock_llm, mock_storage, tools, tmp_path, **options):
+    security = Security(sandbox_dir=str(tmp_path))
+    return Config(llm=mock_llm, storage=mock_storage, tools=tools, security=security, **options)
+
+
+async def _call(config, name, conversation_id="conv", **args):
+    return await execute_tool(
+        ToolCall(name=name, args=args),
+        execution=config.execution,
+        user_id="user",
+        conversation_id=conversation_id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_cached_until_file_changes(mock_llm, mock_storage, tmp_path):
+    config = _config(mock_llm, mock_storage, [read, write], tmp_path, tool_cache=True)
+    cache = config.execution.cache
+    assert isinstance(cache, ResultCache)
+    (tmp_path / "notes.txt").write_text("one")
+
+    first = await _call(config, "read", file="notes.txt")
+    again = await _call(config, "read", file="notes.txt")
+    assert again.content == first.content
+    assert cache.stats["hits"] == 1
+    assert await _call(config, "read", "other-conv", file="notes.txt")
+    assert cache.stats["hits"] == 1  # Per conversation
+
+    # Changed outside the agent: the size fingerprint no longer matches
+    (tmp_path / "notes.txt").write_text("one two")
+    changed = await _call(config, "read", file="notes.txt")
+    assert "one two" in (changed.content or "")
+
+    # Written through the agent: mutating tools invalidate the conversation
+    await _call(config, "read", file="notes.txt")
+    hits = cache.stats["hits"]
+    await _call(config, "write", file="notes.txt", content="three", overwrite=True)
+    assert cache.stats["invalidations"] == 1
+    rewritten = await _call(config, "read", file="notes.txt")
+    assert cache.stats["hits"] == hits
+    assert "three" in (rewritten.content or "")
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_errors(mock_llm, mock_storage, tmp_path):
+    calls: list[str] = []
+
+    @tool("Fake web lookup", idempotent=True, ttl=0.05)
+    async def lookup(params: QueryParams) -> ToolResult:
+        calls.append(params.query)
+        if params.query == "bad":
+            return ToolResult(outcome="failed", error=True)
+        return ToolResult(outcome=f"found {len(calls)}")
+
+    config = _config(mock_llm, mock_storage, [lookup], tmp_path, tool_cache=True)
+
+    assert (await _call(config, "lookup", query="x")).outcome == "found 1"
+    assert (await _call(config, "lookup", query="x")).outcome == "found 1"
+    await asyncio.sleep(0.06)
+    assert (await _call(config, "lookup", query="x")).outcome == "found 2"
+
+    await _call(config, "lookup", query="bad")
+    await _call(config, "lookup", query="bad")
+    assert calls.count("bad") == 2  # Errors are never cached
+
+    uncached = _config(mock_llm, mock_storage, [lookup], tmp_path)
+    assert uncached.execution.cache is None
+    await _call(uncached, "lookup", query="y")
+    await _call(uncached, "lookup", query="y")
+    assert calls.count("y") == 2
@@ -1,10 +1,16 @@
 import asyncio
+from dataclasses import dataclass
 from unittest.mock import AsyncMock
 
 import pytest
 
+from cogency.core.config import Config, Execution, Security
 from cogency.core.executor import execute_tool, execute_tools
+from cogency.core.limiter import ToolLimiter
 from cogency.core.protocols import ToolCall, ToolResult
+from cogency.core.schedule import schedule
+from cogency.core.tool import tool
+from cogency.tools import read, shell, write
 
 
 @pytest.mark.asyncio
@@ -154,3 +160,144 @@ async def test_parallel_execution_is_concurrent(mock_config):
     assert max(start_indices) < min(end_indices), "Both tasks must start before either ends"
     assert results[0].outcome == "done_0.1"
     assert results[1].outcome == "done_0.05"
+
+
+class _SleepTool:
+    description = "Sleeps"
+    schema = {}
+
+    def __init__(self, name, delay=0.05):
+        self.name = name
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def execute(self, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return ToolResult(outcome=self.name)
+
+    def describe(self, args):
+        return self.name
+
+
+def _execution(mock_storage, tools, limiter):
+    return Execution(
+        storage=mock_storage,
+        tools=tuple(tools),
+        shell_timeout=30,
+        sandbox_dir=".cogency/sandbox",
+        access="sandbox",
+        limiter=limiter,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrency_caps(mock_storage):
+    scrape, read = _SleepTool("scrape"), _SleepTool("read")
+    limiter = ToolLimiter(max_concurrent=3, concurrency={"scrape": 2})
+    execution = _execution(mock_storage, [scrape, read], limiter)
+
+    calls = [ToolCall(name="scrape", args={}) for _ in range(6)]
+    calls += [ToolCall(name="read", args={}) for _ in range(4)]
+    results = await execute_tools(calls, execution=execution, user_id="u", conversation_id="c")
+
+    assert [r.outcome for r in results] == ["scrape"] * 6 + ["read"] * 4
+    assert scrape.peak == 2
+    assert limiter.stats["peak_running"] == 3
+    assert limiter.stats["peak_queued"] == 7
+    assert limiter.stats["calls"] == 10
+    assert limiter.queued == limiter.running == 0
+
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_straggler(mock_storage):
+    hung, fast = _SleepTool("scrape", delay=10), _SleepTool("read", delay=0)
+    limiter = ToolLimiter(max_concurrent=1, timeouts={"scrape": 0.05})
+    execution = _execution(mock_storage, [hung, fast], limiter)
+
+    calls = [ToolCall(name="scrape", args={}), ToolCall(name="read", args={})]
+    results = await asyncio.wait_for(
+        execute_tools(calls, execution=execution, user_id="u", conversation_id="c"), 2
+    )
+
+    assert results[0].error is True
+    assert "timed out after 0.05s" in results[0].outcome
+    assert results[1].outcome == "read"
+    assert hung.active == 0  # Cancelled, not left running
+    assert limiter.stats["timeouts"] == 1
+
+
+def test_security_limiter(mock_llm, mock_storage):
+    security = Security(shell_timeout=10, tool_timeout=60, tool_timeouts={"search": 5})
+    config = Config(llm=mock_llm, storage=mock_storage, tools=[], security=security)
+
+    limiter = config.execution.limiter
+    assert limiter is not None
+    assert limiter is config.execution.limiter  # Shared across executions
+    assert limiter.timeout_for("shell") == 15
+    assert limiter.timeout_for("search") == 5
+    assert limiter.timeout_for("read") == 60
+    # Default timeouts skip mutating tools: expiry can't stop a write mid-thread
+    assert limiter.timeout_for("edit", mutates=True) is None
+    assert limiter.timeout_for("shell", mutates=True) == 15
+    assert limiter.concurrency["scrape"] == 4
+
+    with pytest.raises(ValueError):
+        Security(max_concurrent_tools=0).limiter()
+
+
+@pytest.mark.asyncio
+async def test_batch_dedup_and_ordering(mock_llm, mock_storage, tmp_path):
+    @dataclass
+    class LookupParams:
+        query: str
+
+    lookups: list[str] = []
+
+    @tool("Lookup", idempotent=True)
+    async def lookup(params: LookupParams) -> ToolResult:
+        lookups.append(params.query)
+        await asyncio.sleep(0.01)
+        return ToolResult(outcome=params.query)
+
+    security = Security(sandbox_dir=str(tmp_path))
+    config = Config(
+        llm=mock_llm,
+        storage=mock_storage,
+        tools=[read, write, shell, lookup],
+        security=security,
+    )
+    (tmp_path / "a.txt").write_text("before")
+    calls = [
+        ToolCall(name="lookup", args={"query": "x"}),
+        ToolCall(name="read", args={"file": "a.txt"}),
+        ToolCall(name="lookup", args={"query": "x"}),
+        ToolCall(name="write", args={"file": "a.txt", "content": "after", "overwrite": True}),
+        ToolCall(name="read", args={"file": "a.txt"}),
+        ToolCall(name="read", args={"file": "b.txt"}),
+        ToolCall(name="shell", args={"command": "ls"}),
+        ToolCall(name="lookup", args={"query": "y"}),
+    ]
+
+    steps = schedule(calls, config.execution)
+    assert [s.leader for s in steps] == [None, None, 0, None, None, None, None, None]
+    assert steps[3].after == [1]  # Write waits for the earlier read of its file
+    assert steps[4].after == [3]  # The later read sees the write, not a shared result
+    assert steps[5].after == []  # Unrelated path stays parallel
+    assert steps[6].after == [0, 1, 3, 4, 5]  # Shell is a barrier
+    assert steps[7].after == [6]
+
+    results = await execute_tools(
+        calls, execution=config.execution, user_id="u", conversation_id="c"
+    )
+    assert lookups == ["x", "y"]
+    assert results[0].outcome == results[2].outcome == "x"
+    assert results[0] is not results[2]
+    assert "before" in (results[1].content or "")
+    assert "after" in (results[4].content or "")
+    assert results[5].error is True
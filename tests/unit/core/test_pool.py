@@ -0,0 +1,76 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from cogency.core.pool import run_cpu_bound
+from cogency.core.protocols import ToolResult
+from cogency.core.tool import tool
+from cogency.tools import find
+
+
+@dataclass
+class PidParams:
+    label: str
+
+
+@tool("Report the worker pid", cpu_bound=True)
+async def whoami(params: PidParams, **kwargs) -> ToolResult:
+    return ToolResult(outcome=params.label, content=f"{os.getpid()} {Path.cwd()} {sorted(kwargs)}")
+
+
+@pytest.mark.asyncio
+async def test_runs_in_worker_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    result = await run_cpu_bound(whoami, {"label": "hi", "storage": object(), "user_id": "u"})
+
+    pid, cwd, kwargs = (result.content or "").split(" ", 2)
+    assert result.outcome == "hi"
+    assert int(pid) != os.getpid()
+    assert cwd == str(tmp_path)  # Follows the caller's working directory
+    assert kwargs == "[]"  # Only named context ships; storage never has to pickle
+
+
+@pytest.mark.asyncio
+async def test_inline_fallback():
+    @tool("Not importable by reference", cpu_bound=True)
+    async def local(params: PidParams) -> ToolResult:
+        return ToolResult(outcome=str(os.getpid()))
+
+    result = await run_cpu_bound(local, {"label": "x"})
+    assert result.outcome == str(os.getpid())
+
+
+@pytest.mark.asyncio
+async def test_builtin_tool_in_worker(tmp_path):
+    (tmp_path / "notes.md").write_text("needle here\n")
+
+    args = {"content": "needle", "sandbox_dir": str(tmp_path), "access": "sandbox"}
+    assert await run_cpu_bound(find, args) == await find.execute(**args)
+
+
+@tool("Die in a worker, succeed inline", cpu_bound=True)
+async def fragile(params: PidParams) -> ToolResult:
+    if str(os.getpid()) != params.label:
+        os._exit(1)
+    return ToolResult(outcome="ran inline")
+
+
+@tool("Die in a worker, succeed inline", cpu_bound=True, mutates=True)
+async def fragile_write(params: PidParams) -> ToolResult:
+    if str(os.getpid()) != params.label:
+        os._exit(1)
+    return ToolResult(outcome="ran inline")
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_reruns_only_read_only_tools():
+    parent = str(os.getpid())
+
+    assert (await run_cpu_bound(fragile, {"label": parent})).outcome == "ran inline"
+
+    result = await run_cpu_bound(fragile_write, {"label": parent})
+    assert result.error
+    assert "did not complete" in result.outcome  # May have written; never applied twice
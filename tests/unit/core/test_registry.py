@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+
+import pytest
+
+from cogency.core.config import Config
+from cogency.core.executor import execute_tool
+from cogency.core.protocols import ToolCall, ToolResult
+from cogency.core.registry import ToolRegistry, accepted_context
+from cogency.core.tool import tool
+from cogency.tools import read, recall, shell
+
+CONTEXT = {"storage": "db", "sandbox_dir": "box", "access": "sandbox", "timeout": 30}
+
+
+@dataclass
+class Params:
+    message: str
+
+
+def test_injection_plans():
+    assert "timeout" in accepted_context(shell)
+    assert "timeout" not in accepted_context(read)
+    assert {"storage", "user_id", "conversation_id"} <= accepted_context(recall)
+
+    @tool("Takes only storage")
+    async def narrow(params: Params, storage: str) -> ToolResult:
+        return ToolResult(outcome=storage)
+
+    assert accepted_context(narrow) == {"storage"}
+
+    class Legacy:
+        name = "legacy"
+        description = "Class-based"
+        schema = {}
+
+        async def execute(self, **kwargs):
+            return ToolResult(outcome="ok")
+
+        def describe(self, args):
+            return "legacy"
+
+    assert accepted_context(Legacy()) == {
+        "storage",
+        "sandbox_dir",
+        "access",
+        "conversation_id",
+        "user_id",
+    }
+
+
+def test_registry_binding():
+    @tool("Echo")
+    async def echo(params: Params, storage: str, user_id: str | None = None) -> ToolResult:
+        return ToolResult(outcome=f"{params.message} {storage} {user_id}")
+
+    @tool("Shadowed")
+    async def shadow(params: Params) -> ToolResult:
+        return ToolResult(outcome="shadow")
+
+    shadow.name = "echo"
+    registry = ToolRegistry([echo, shadow], CONTEXT)
+
+    assert list(registry) == ["echo"]
+    assert registry["echo"].tool is echo
+    assert registry["echo"].kwargs({"message": "hi"}, "conv", "user") == {
+        "message": "hi",
+        "storage": "db",
+        "user_id": "user",
+    }
+    assert registry["echo"].kwargs({"message": "hi"}, "conv", "") == {
+        "message": "hi",
+        "storage": "db",
+    }
+
+
+@pytest.mark.asyncio
+async def test_execution_built_once(mock_llm, mock_storage):
+    @tool("Echo")
+    async def echo(params: Params) -> ToolResult:
+        return ToolResult(outcome=params.message)
+
+    config = Config(llm=mock_llm, storage=mock_storage, tools=[echo])
+    assert config.execution is config.execution
+
+    # Tools without context parameters no longer receive (and choke on) injected kwargs
+    result = await execute_tool(
+        ToolCall(name="echo", args={"message": "hi"}),
+        execution=config.execution,
+        user_id="user",
+        conversation_id="conv",
+    )
+    assert result.outcome == "hi"
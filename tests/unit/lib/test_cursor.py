@@ -0,0 +1,32 @@
+import pytest
+
+from cogency.lib.cursor import iter_messages
+from cogency.lib.memory import MemoryStorage
+from cogency.lib.sqlite import SQLite
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["sqlite", "memory", "fake"])
+async def test_iter_messages_pages_through_conversation(tmp_path, backend, mock_storage):
+    # "fake" is the conftest TestStorage, which must page like the real backends
+    backends = {"sqlite": lambda: SQLite(str(tmp_path / "store.db")), "memory": MemoryStorage}
+    storage = backends[backend]() if backend in backends else mock_storage
+    for i in range(7):
+        await storage.save_message("conv", "user1", "user", f"m{i}", 100.0)  # Timestamp ties
+        await storage.save_message("conv", "user1", "respond", f"r{i}", 100.5 + i)
+
+    rows = [row async for row in iter_messages(storage, "conv", "user1", page_size=3)]
+    assert len(rows) == 14
+    assert len({row["message_id"] for row in rows}) == 14
+
+    replies = [
+        row["content"]
+        async for row in iter_messages(storage, "conv", "user1", include=["respond"], page_size=2)
+    ]
+    assert replies == [f"r{i}" for i in range(7)]
+
+    resumed = [
+        row["content"]
+        async for row in iter_messages(storage, "conv", "user1", after_id=rows[9]["message_id"])
+    ]
+    assert resumed == [row["content"] for row in rows[10:]]
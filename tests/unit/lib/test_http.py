@@ -0,0 +1,36 @@
+import os
+import time
+
+from cogency.lib import http
+
+
+def _entry(directory, url, body, age):
+    http._store(url, directory, {"fetched_at": time.time()}, body)
+    meta_path, body_path = http._paths(url, directory)
+    stamp = time.time() - age
+    for path in (meta_path, body_path):
+        os.utime(path, (stamp, stamp))
+
+
+def test_mismatched_body_is_a_miss(tmp_path):
+    http._store("http://a", tmp_path, {"fetched_at": 1.0}, "first")
+    assert http._load("http://a", tmp_path) is not None
+
+    # A racing writer replaced the body but not the meta
+    http._paths("http://a", tmp_path)[1].write_text("second")
+    assert http._load("http://a", tmp_path) is None
+
+
+def test_sweep_evicts_stale_then_oldest(tmp_path):
+    _entry(tmp_path, "http://stale", "x" * 10, age=3600)
+    _entry(tmp_path, "http://old", "x" * 100, age=60)
+    _entry(tmp_path, "http://new", "x" * 100, age=0)
+    newest = sum(p.stat().st_size for p in http._paths("http://new", tmp_path))
+
+    removed = http.sweep(tmp_path, max_bytes=newest + 50, max_age=1800)
+
+    assert removed == 2
+    assert http._load("http://stale", tmp_path) is None
+    assert http._load("http://old", tmp_path) is None
+    assert http._load("http://new", tmp_path) is not None
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
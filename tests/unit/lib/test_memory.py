@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from cogency.core.protocols import Storage
+from cogency.lib.memory import MemoryStorage
+from cogency.lib.sqlite import SQLite
+
+
+def test_implements_storage_protocol():
+    assert isinstance(MemoryStorage(), Storage)
+
+
+async def _populate(storage: Storage) -> None:
+    await storage.save_message("conv-a", "user1", "user", "zebra in the park", 100.0)
+    await storage.save_message("conv-a", "user1", "respond", "nice zebra", 101.0)
+    await storage.save_message("conv-b", "user1", "user", "zebra zebra", 102.0)
+    await storage.save_message("conv-b", "user1", "think", "hmm", 103.0)
+    await storage.save_message("conv-c", "user2", "user", "zebra elsewhere", 104.0)
+    await storage.save_message("conv-a", "user1", "user", "late arrival", 99.0)
+    await storage.save_event("conv-a", "metric", json.dumps({"input": 1, "output": 2}), 105.0)
+
+
+@pytest.mark.asyncio
+async def test_matches_sqlite(tmp_path):
+    memory, sqlite = MemoryStorage(), SQLite(str(tmp_path / "store.db"))
+    for storage in (memory, sqlite):
+        await _populate(storage)
+
+    async def snapshot(storage: Storage) -> list[object]:
+        return [
+            await storage.load_messages("conv-a", "user1"),
+            await storage.load_messages("conv-a", "user1", include=["user"], limit=1),
+            await storage.load_messages("conv-b", "user1", exclude=["think"]),
+            await storage.load_messages("conv-a", "user1", after_timestamp=99.5, limit=1),
+            await storage.count_user_messages("user1", 99.5),
+            await storage.load_user_messages("user1", 0, limit=2),
+            await storage.load_messages_by_conversation_id("conv-a", 5),
+            await storage.search_messages("zebra", "user1", "conv-a", 3),
+            await storage.search_messages("zebra park", "user1", None, 3),
+            await storage.load_latest_metric("conv-a"),
+        ]
+
+    def strip_ids(rows: list[object]) -> list[object]:
+        # message_ids are generated per backend
+        return [
+            [{k: v for k, v in r.items() if k != "message_id"} for r in row]
+            if isinstance(row, list) and row and isinstance(row[0], dict)
+            else row
+            for row in rows
+        ]
+
+    assert strip_ids(await snapshot(memory)) == strip_ids(await snapshot(sqlite))
+
+
+@pytest.mark.asyncio
+async def test_profile_versions_bounded():
+    storage = MemoryStorage(profile_versions=2)
+    for i in range(5):
+        await storage.save_profile("user1", {"who": f"v{i}"})
+
+    assert await storage.load_profile("user1") == {"who": "v4"}
+    assert await storage.delete_profile("user1") == 2
+    assert await storage.load_profile("user1") == {}
+
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_written_conversation():
+    storage = MemoryStorage(max_conversations=2)
+    await storage.save_message("conv-1", "user1", "user", "first", 1.0)
+    await storage.save_message("conv-2", "user1", "user", "second", 2.0)
+    await storage.save_message("conv-1", "user1", "user", "again", 3.0)
+    await storage.save_message("conv-3", "user1", "user", "third", 4.0)
+
+    assert await storage.load_messages("conv-2", "user1") == []
+    assert len(await storage.load_messages("conv-1", "user1")) == 2
+    assert await storage.load_user_messages("user1") == ["first", "again", "third"]
+    assert await storage.count_user_messages("user1") == 3
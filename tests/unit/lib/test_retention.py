@@ -0,0 +1,191 @@
+import pytest
+
+from cogency.lib.retention import (
+    RetentionPolicy,
+    _drop_conversation,
+    apply_retention,
+    clear_events,
+    read_archive,
+)
+from cogency.lib.sqlite import DB, SQLite
+
+DAY = 86400.0
+NOW = 1_700_000_000.0  # 2023-11-14
+
+
+@pytest.mark.asyncio
+async def test_expired_conversations_archived_whole(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+    await storage.save_message("old", "user1", "user", "old question", NOW - 40 * DAY)
+    await storage.save_message("old", "user1", "respond", "old answer", NOW - 39 * DAY)
+    # Started long ago but still active: kept whole
+    await storage.save_message("active", "user1", "user", "first", NOW - 40 * DAY)
+    await storage.save_message("active", "user1", "user", "recent", NOW - DAY)
+
+    archive = tmp_path / "archive"
+    stats = await apply_retention(
+        RetentionPolicy(messages_ttl=30 * DAY, archive_dir=str(archive)), db_path, now=NOW
+    )
+
+    assert stats["conversations"] == 1
+    assert stats["messages"] == 2
+    assert await storage.load_messages("old", "user1") == []
+    assert len(await storage.load_messages("active", "user1")) == 2
+    assert await storage.count_user_messages("user1", 0) == 2
+
+    rows = read_archive(archive / "messages-2023-10.jsonl.gz")
+    assert [row["content"] for row in rows] == ["old question", "old answer"]
+
+
+@pytest.mark.asyncio
+async def test_long_conversation_dropped_in_batches(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+    for i in range(5):
+        await storage.save_message("long", "user1", "user", f"m{i}", NOW - 40 * DAY + i)
+
+    archive = tmp_path / "archive"
+    policy = RetentionPolicy(messages_ttl=30 * DAY, archive_dir=str(archive), batch_size=2)
+    stats = await apply_retention(policy, db_path, now=NOW)
+
+    assert stats["conversations"] == 1
+    assert stats["messages"] == 5
+    rows = read_archive(archive / "messages-2023-10.jsonl.gz")
+    assert [row["content"] for row in rows] == [f"m{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_expiry_keeps_learned_watermark(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+    for i in range(3):
+        await storage.save_message("old", "user1", "user", f"old {i}", NOW - 40 * DAY + i)
+    await storage.save_message("new", "user1", "user", "seen", NOW - 2 * DAY)
+    learned_at = NOW - DAY
+    await storage.save_profile("user1", {"who": "a", "_meta": {"last_learned_at": learned_at}})
+    await storage.save_message("new", "user1", "user", "unseen", NOW)
+
+    policy = RetentionPolicy(messages_ttl=30 * DAY, batch_size=2)
+    assert (await apply_retention(policy, db_path, now=NOW))["messages"] == 3
+
+    with DB.connect(db_path) as db:
+        row = db.execute(
+            "SELECT message_count, learned_at, learned_count FROM user_stats WHERE user_id = 'user1'"
+        ).fetchone()
+    assert row == (2, learned_at, 1)  # Decremented, watermark kept
+    assert await storage.count_user_messages("user1", learned_at) == 1
+
+
+@pytest.mark.asyncio
+async def test_conversation_resumed_after_selection_is_kept(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+    await storage.save_message("conv", "user1", "user", "old", NOW - 40 * DAY)
+    # Selected as stale, then resumed before the drop ran
+    await storage.save_message("conv", "user1", "user", "new", NOW)
+
+    assert _drop_conversation(db_path, "conv", NOW - 30 * DAY, RetentionPolicy()) == (0, 0)
+    assert len(await storage.load_messages("conv", "user1")) == 2
+
+
+@pytest.mark.asyncio
+async def test_event_ttls_per_type(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+    for i in range(5):
+        await storage.save_event("conv1", "metric", f"m{i}", NOW - 10 * DAY)
+        await storage.save_event("conv1", "think", f"t{i}", NOW - 10 * DAY)
+        await storage.save_event("conv1", "request", f"r{i}", NOW - 10 * DAY)
+
+    policy = RetentionPolicy(
+        events_ttl=7 * DAY, event_ttls={"metric": 30 * DAY, "request": None}, batch_size=2
+    )
+    stats = await apply_retention(policy, db_path, now=NOW)
+
+    assert stats["events"] == 5
+    with DB.connect(db_path) as db:
+        remaining = {row[0] for row in db.execute("SELECT DISTINCT type FROM events")}
+    assert remaining == {"metric", "request"}
+
+
+@pytest.mark.asyncio
+async def test_clear_events(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+    for i in range(3):
+        await storage.save_event("conv1", "think", f"t{i}", NOW)
+        await storage.save_event("conv1", "metric", f"m{i}", NOW)
+    await storage.save_event("conv2", "think", "other", NOW)
+
+    assert clear_events("conv1", db_path, types=["think"], batch_size=2) == 3
+    assert clear_events("conv1", db_path) == 3
+
+    with DB.connect(db_path) as db:
+        assert db.execute("SELECT conversation_id FROM events").fetchall() == [("conv2",)]
+
+
+@pytest.mark.asyncio
+async def test_clear_events_collects_blobs_and_links(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path, blob_threshold=1000)
+    prompt = '[{"role": "system", "content": "hi"}, {"role": "user", "content": "x"}]'
+    await storage.save_request("conv1", "user1", prompt, "reply", NOW)
+    await storage.save_event("conv1", "think", "T" * 5000, NOW)
+
+    assert clear_events("conv1", db_path) == 2
+
+    with DB.connect(db_path) as db:
+        assert db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 0
+        assert db.execute("SELECT COUNT(*) FROM prompt_links").fetchone()[0] == 0
+
+
+@pytest.mark.asyncio
+async def test_clear_events_keeps_shared_prompt_prefix(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+    short = '[{"role": "system", "content": "s"}, {"role": "user", "content": "a"}]'
+    longer = short[:-1] + ', {"role": "user", "content": "b"}]'
+    await storage.save_request("conv1", "user1", longer, "reply", NOW)
+    await storage.save_request("conv2", "user1", short, "reply", NOW)
+
+    def counts():
+        with DB.connect(db_path) as db:
+            return db.execute(
+                "SELECT (SELECT COUNT(*) FROM prompt_links), (SELECT COUNT(*) FROM blobs)"
+            ).fetchone()
+
+    assert counts() == (3, 3)
+    clear_events("conv2", db_path)  # Its whole chain is a prefix of conv1's
+    assert counts() == (3, 3)
+    assert [r["messages"] for r in await storage.load_requests("conv1")] == [longer]
+    clear_events("conv1", db_path)
+    assert counts() == (0, 0)
+
+    with DB.connect(db_path) as db:
+        plan = db.execute(
+            "EXPLAIN QUERY PLAN SELECT 1 FROM events WHERE encoding = 'chain' AND json_extract(content, '$.head') = ?",
+            ("x",),
+        ).fetchall()
+    assert "idx_events_chain_head" in str(plan)
+
+
+@pytest.mark.asyncio
+async def test_archive_decodes_compressed_content_and_collects_blobs(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path, compress_threshold=100, blob_threshold=1000)
+    medium, large = "m" * 500, "L" * 5000
+    await storage.save_message("old", "user1", "result", medium, NOW - 40 * DAY)
+    await storage.save_message("old", "user1", "result", large, NOW - 40 * DAY)
+    await storage.save_message("kept", "user1", "result", large, NOW - DAY)
+
+    archive = tmp_path / "archive"
+    stats = await apply_retention(
+        RetentionPolicy(messages_ttl=30 * DAY, archive_dir=str(archive)), db_path, now=NOW
+    )
+    assert stats["blobs"] == 0  # Still referenced by "kept"
+    rows = read_archive(archive / "messages-2023-10.jsonl.gz")
+    assert [row["content"] for row in rows] == [medium, large]
+
+    stats = await apply_retention(RetentionPolicy(messages_ttl=0), db_path, now=NOW)
+    assert stats["blobs"] == 1
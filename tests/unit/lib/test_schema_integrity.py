@@ -15,7 +15,15 @@ def test_no_phantom_table_references():
     }
     conn.close()
 
-    assert schema_tables == {"messages", "events", "profiles"}
+    assert schema_tables == {
+        "messages",
+        "events",
+        "profiles",
+        "user_stats",
+        "blobs",
+        "prompt_links",
+        "schema_version",
+    }
 
     repo_root = Path(__file__).parent.parent.parent.parent
 
@@ -48,6 +56,8 @@ def test_no_phantom_table_references():
                         "limit",
                         "group",
                         "values",
+                        "walk",  # recursive CTEs
+                        "live",
                     }:
                         violations.append(
                             f"{py_file.relative_to(repo_root)}:{line_num} - '{table}'"
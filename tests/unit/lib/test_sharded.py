@@ -0,0 +1,63 @@
+import pytest
+
+from cogency.core.protocols import Storage
+from cogency.lib.sharded import ShardedSQLite, shard_index
+
+
+def test_shard_index_is_stable():
+    assert shard_index("conv-1", 8) == shard_index("conv-1", 8)
+    assert {shard_index(f"conv-{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_implements_storage_protocol(tmp_path):
+    assert isinstance(ShardedSQLite(str(tmp_path)), Storage)
+
+
+@pytest.mark.asyncio
+async def test_conversations_spread_across_files(tmp_path):
+    storage = ShardedSQLite(str(tmp_path), shards=4)
+
+    for i in range(20):
+        await storage.save_message(f"conv-{i}", "user1", "user", f"hello {i}", 100.0 + i)
+
+    for i in range(20):
+        messages = await storage.load_messages(f"conv-{i}", "user1")
+        assert [m["content"] for m in messages] == [f"hello {i}"]
+
+    assert len(list(tmp_path.glob("store-*.db"))) == 4
+
+
+@pytest.mark.asyncio
+async def test_user_queries_fan_out(tmp_path):
+    storage = ShardedSQLite(str(tmp_path), shards=4)
+    for i in range(12):
+        await storage.save_message(f"conv-{i}", "user1", "user", f"zebra note {i}", 100.0 + i)
+    await storage.save_message("conv-x", "user1", "user", "zebra zebra zebra", 50.0)
+    await storage.save_message("conv-y", "user2", "user", "zebra elsewhere", 60.0)
+
+    assert await storage.count_user_messages("user1", 0) == 13
+    assert await storage.load_user_messages("user1", 105.0, limit=3) == [
+        "zebra note 6",
+        "zebra note 7",
+        "zebra note 8",
+    ]
+
+    matches = await storage.search_messages("zebra", "user1", "conv-0", limit=3)
+    assert matches[0].content == "zebra zebra zebra"
+    assert [m.content for m in matches[1:]] == ["zebra note 11", "zebra note 10"]
+
+
+@pytest.mark.asyncio
+async def test_profile_watermark_spans_shards(tmp_path):
+    storage = ShardedSQLite(str(tmp_path), shards=3)
+    for i in range(9):
+        await storage.save_message(f"conv-{i}", "user1", "user", f"m{i}", 100.0 + i)
+
+    await storage.save_profile("user1", {"who": "Alice", "_meta": {"last_learned_at": 104.5}})
+
+    assert (await storage.load_profile("user1"))["who"] == "Alice"
+    assert await storage.count_user_messages("user1", 104.5) == 4
+
+    assert await storage.delete_profile("user1") == 1
+    assert await storage.load_profile("user1") == {}
+    assert await storage.count_user_messages("user1", 0) == 9
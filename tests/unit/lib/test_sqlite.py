@@ -1,9 +1,19 @@
 import sqlite3
 import uuid
+import zlib
+from unittest.mock import Mock, patch
 
 import pytest
 
-from cogency.lib.sqlite import DB, SQLite
+from cogency.lib.sqlite import (
+    DB,
+    MIGRATIONS,
+    Migration,
+    SQLite,
+    _backfill_user_stats,
+    collect_blobs,
+    migrate,
+)
 
 
 @pytest.mark.asyncio
@@ -255,3 +265,386 @@ async def test_search_messages_user_isolation(tmp_path):
 
     assert len(results) == 1
     assert results[0].content == "user1 secret"
+
+
+@pytest.mark.asyncio
+async def test_user_stats_track_message_counts(tmp_path):
+    """count_user_messages matches a full scan and uses counters at the learned watermark."""
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+
+    for i in range(4):
+        await storage.save_message("conv1", "user1", "user", f"msg {i}", 100.0 + i)
+    await storage.save_message("conv1", "user1", "respond", "reply", 110.0)
+
+    assert await storage.count_user_messages("user1", 0) == 4
+    assert await storage.count_user_messages("user1", 101.5) == 2
+
+    await storage.save_profile("user1", {"who": "Alice", "_meta": {"last_learned_at": 102.0}})
+    await storage.save_message("conv1", "user1", "user", "late", 120.0)
+    await storage.save_message("conv1", "user1", "user", "backdated", 90.0)
+
+    with DB.connect(db_path) as db:
+        row = db.execute(
+            "SELECT message_count, learned_at, learned_count FROM user_stats WHERE user_id = ?",
+            ("user1",),
+        ).fetchone()
+    assert row == (6, 102.0, 4)
+    assert await storage.count_user_messages("user1", 102.0) == 2
+
+
+@pytest.mark.asyncio
+async def test_user_stats_rebuilt_when_missing(tmp_path):
+    """Databases without counters (or after delete) seed them from messages."""
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+    await storage.save_message("conv1", "user1", "user", "one", 100.0)
+    await storage.save_message("conv1", "user1", "user", "two", 200.0)
+    await storage.save_profile("user1", {"who": "Alice", "_meta": {"last_learned_at": 150.0}})
+
+    with DB.connect(db_path) as db:
+        db.execute("DELETE FROM user_stats")
+
+    await storage.save_message("conv1", "user1", "user", "three", 300.0)
+    assert await storage.count_user_messages("user1", 0) == 3
+
+    # The rebuilt watermark comes from the latest profile
+    with DB.connect(db_path) as db:
+        row = db.execute(
+            "SELECT learned_at, learned_count FROM user_stats WHERE user_id = 'user1'"
+        ).fetchone()
+    assert row == (150.0, 1)
+    assert await storage.count_user_messages("user1", 150.0) == 2
+
+    await storage.delete_profile("user1")
+    assert await storage.count_user_messages("user1", 0) == 3
+
+
+@pytest.mark.asyncio
+async def test_profile_versions_bounded(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path, profile_versions=3)
+
+    for i in range(10):
+        await storage.save_profile("user1", {"who": f"v{i}"})
+    await storage.save_profile("user2", {"who": "other"})
+
+    with DB.connect(db_path) as db:
+        versions = [
+            row[0]
+            for row in db.execute(
+                "SELECT version FROM profiles WHERE user_id = ? ORDER BY version", ("user1",)
+            )
+        ]
+    assert versions == [8, 9, 10]
+    assert (await storage.load_profile("user1"))["who"] == "v9"
+    assert (await storage.load_profile("user2"))["who"] == "other"
+
+
+@pytest.mark.asyncio
+async def test_prune_profiles_by_age_keeps_latest(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path, profile_versions=None, profile_max_age=3600)
+
+    for i in range(3):
+        await storage.save_profile("user1", {"who": f"v{i}"})
+    await storage.save_profile("user2", {"who": "solo"})
+
+    with DB.connect(db_path) as db:
+        db.execute("UPDATE profiles SET created_at = 0")
+
+    assert await storage.prune_profiles() == 2
+    assert (await storage.load_profile("user1"))["who"] == "v2"
+    assert (await storage.load_profile("user2"))["who"] == "solo"
+
+    await storage.optimize()
+    await storage.vacuum()
+
+
+@pytest.mark.asyncio
+async def test_storage_bypasses_default_executor(tmp_path, monkeypatch):
+    import asyncio
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("storage must not use asyncio.to_thread")
+
+    monkeypatch.setattr(asyncio, "to_thread", _fail)
+    storage = SQLite(db_path=tmp_path / "test.db")
+    await storage.save_message("conv", "user1", "user", "hello")
+    assert (await storage.load_messages("conv", "user1"))[0]["content"] == "hello"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_commits(tmp_path):
+    import asyncio
+
+    storage = SQLite(db_path=tmp_path / "test.db")
+    engine = storage._engine
+    before = dict(engine.stats)
+
+    await asyncio.gather(
+        *(storage.save_message("conv", "user1", "user", f"m{i}") for i in range(50))
+    )
+
+    writes = engine.stats["writes"] - before["writes"]
+    commits = engine.stats["commits"] - before["commits"]
+    assert writes == 50
+    assert commits < writes
+    assert len(await storage.load_messages("conv", "user1")) == 50
+
+
+@pytest.mark.asyncio
+async def test_failed_write_rolls_back_only_itself(tmp_path):
+    import asyncio
+
+    storage = SQLite(db_path=tmp_path / "test.db")
+    await storage.save_message("conv", "user1", "user", "seed")
+
+    def _broken(db: sqlite3.Connection):
+        db.execute(
+            "INSERT INTO events (event_id, conversation_id, type, content, timestamp) VALUES ('e', 'conv', 'x', 'y', 1)"
+        )
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        storage.save_message("conv", "user1", "user", "a"),
+        storage._engine.write(_broken),
+        storage.save_message("conv", "user1", "user", "b"),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[1], ValueError)
+    assert len(await storage.load_messages("conv", "user1")) == 3
+    with DB.connect(str(tmp_path / "test.db")) as db:
+        assert db.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_storage_persists_across_operations():
+    storage = SQLite(db_path=":memory:")
+    await storage.save_message("conv", "user1", "user", "kept")
+    await storage.save_profile("user1", {"who": "me"})
+
+    assert (await storage.load_messages("conv", "user1"))[0]["content"] == "kept"
+    assert await storage.load_profile("user1") == {"who": "me"}
+    assert await storage.count_user_messages("user1") == 1
+
+
+@pytest.mark.asyncio
+async def test_load_messages_after_cursor(tmp_path):
+    storage = SQLite(db_path=tmp_path / "test.db")
+    ids = [
+        await storage.save_message("conv", "user1", "user", f"m{i}", 100.0 + i) for i in range(5)
+    ]
+    await storage.save_message("other", "user1", "user", "elsewhere", 103.5)
+
+    after = await storage.load_messages("conv", "user1", after_id=ids[1])
+    assert [m["content"] for m in after] == ["m2", "m3", "m4"]
+    assert [m["message_id"] for m in after] == ids[2:]
+
+    page = await storage.load_messages("conv", "user1", after_id=ids[0], limit=2)
+    assert [m["content"] for m in page] == ["m1", "m2"]
+
+    since = await storage.load_messages("conv", "user1", after_timestamp=102.0)
+    assert [m["content"] for m in since] == ["m3", "m4"]
+
+    assert await storage.load_messages("conv", "user1", after_id=ids[-1]) == []
+    with pytest.raises(ValueError):
+        await storage.load_messages("conv", "user1", after_id="missing")
+
+
+def test_tuning_pragmas_applied(tmp_path):
+    from cogency.lib.sqlite import Tuning
+
+    tuning = Tuning(synchronous="normal", cache_size_kib=4096, mmap_size=1 << 20)
+    conn = DB.connect(str(tmp_path / "test.db"), tuning=tuning)
+    try:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -4096
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1 << 20
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    finally:
+        conn.close()
+
+    with pytest.raises(ValueError):
+        Tuning(synchronous="sometimes")
+
+
+@pytest.mark.asyncio
+async def test_periodic_optimize(tmp_path):
+    from cogency.lib.sqlite import Tuning
+
+    storage = SQLite(db_path=tmp_path / "test.db", tuning=Tuning(optimize_every=5))
+    for i in range(10):
+        await storage.save_message("conv", "user1", "user", f"m{i}")
+    assert storage._engine.stats["optimizes"] >= 1
+
+
+def test_query_shapes_share_sql_text():
+    from cogency.lib.sqlite import _load_messages_sql, _search_sql
+
+    assert _load_messages_sql(True, 2, False, None, True) is _load_messages_sql(
+        True, 2, False, None, True
+    )
+    assert _search_sql(3, True) is _search_sql(3, True)
+
+
+def test_migration_drops_legacy_indexes(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(db_path)
+    legacy.executescript(
+        """
+        CREATE TABLE messages (message_id TEXT PRIMARY KEY, conversation_id TEXT NOT NULL,
+            user_id TEXT, type TEXT NOT NULL, content TEXT NOT NULL, timestamp REAL NOT NULL);
+        CREATE INDEX idx_messages_type ON messages(type);
+        CREATE INDEX idx_messages_user ON messages(user_id);
+        CREATE INDEX idx_messages_user_type ON messages(user_id, type, timestamp);
+        INSERT INTO messages VALUES ('m1', 'conv', 'user1', 'user', 'kept', 1.0);
+        -- Owned by the application, not migrations: must not mark steps as applied
+        PRAGMA user_version = 7;
+        """
+    )
+    legacy.close()
+
+    with DB.connect(str(db_path)) as db:
+        indexes = {
+            row[0]
+            for row in db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'messages' AND sql IS NOT NULL"
+            )
+        }
+        assert indexes == {
+            "idx_messages_conversation",
+            "idx_messages_user_timeline",
+            "idx_messages_blob",
+        }
+        assert "encoding" in {row[1] for row in db.execute("PRAGMA table_info(messages)")}
+        versions = [row[0] for row in db.execute("SELECT version FROM schema_version")]
+        assert versions == [m.version for m in MIGRATIONS]
+        assert db.execute("SELECT content FROM messages").fetchone()[0] == "kept"
+        # Backfill seeded counters for existing users
+        assert (
+            db.execute("SELECT message_count FROM user_stats WHERE user_id = 'user1'").fetchone()[0]
+            == 1
+        )
+
+
+def test_migrations_backfill_in_batches_and_are_idempotent(tmp_path):
+    db = sqlite3.connect(tmp_path / "test.db")
+    db.executescript(DB._schema_sql())
+    db.executemany(
+        "INSERT INTO messages VALUES (?, 'conv', ?, 'user', 'hi', 1.0, NULL)",
+        [(f"m{i}", f"user{i}") for i in range(7)],
+    )
+    db.commit()
+
+    batches: list[int] = []
+
+    def backfill(conn: sqlite3.Connection, batch: int) -> int:
+        done = _backfill_user_stats(conn, batch)
+        batches.append(done)
+        return done
+
+    steps = (Migration(1, "indexes", ("CREATE INDEX IF NOT EXISTS idx_x ON events(type)",)),)
+    steps += (Migration(2, "stats", backfill=backfill),)
+
+    assert migrate(db, steps, batch_size=3) == [1, 2]
+    assert batches == [3, 3, 1]
+    assert db.execute("SELECT COUNT(*) FROM user_stats").fetchone()[0] == 7
+    assert migrate(db, steps, batch_size=3) == []
+    db.close()
+
+
+def test_schema_checked_once_per_process(tmp_path, monkeypatch):
+    calls: list[object] = []
+    original = DB._init_schema.__func__
+
+    def counting(cls, path):
+        calls.append(path)
+        return original(cls, path)
+
+    monkeypatch.setattr(DB, "_init_schema", classmethod(counting))
+    db_path = str(tmp_path / "test.db")
+    for _ in range(3):
+        DB.connect(db_path).close()
+    assert len(calls) == 1
+
+
+def test_queries_use_expected_indexes(tmp_path):
+    with DB.connect(str(tmp_path / "test.db")) as db:
+
+        def plan(sql: str, params: tuple[object, ...]) -> str:
+            return " ".join(row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+        assert "idx_messages_user_timeline" in plan(
+            "SELECT COUNT(*) FROM messages WHERE user_id = ? AND type = 'user' AND timestamp > ?",
+            ("u", 0),
+        )
+        assert "idx_events_conversation_type" in plan(
+            "SELECT content FROM events WHERE conversation_id = ? AND type = 'metric' ORDER BY timestamp DESC LIMIT 1",
+            ("c",),
+        )
+        assert "idx_messages_conversation" in plan(
+            "SELECT type FROM messages WHERE conversation_id = ? ORDER BY timestamp DESC LIMIT 10",
+            ("c",),
+        )
+
+
+@pytest.mark.asyncio
+async def test_large_content_compressed_and_deduplicated(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path, compress_threshold=100, blob_threshold=1000)
+    medium, large = "x" * 500, "file contents\n" * 200
+
+    await storage.save_message("conv", "user1", "user", medium)
+    await storage.save_message("conv", "user1", "result", medium)
+    await storage.save_message("conv", "user1", "result", large)
+    await storage.save_message("conv", "user1", "result", large)
+    await storage.save_event("conv", "request", large)
+
+    messages = await storage.load_messages("conv", "user1")
+    assert [m["content"] for m in messages] == [medium, medium, large, large]
+
+    with DB.connect(db_path) as db:
+        encodings = [row[0] for row in db.execute("SELECT encoding FROM messages ORDER BY rowid")]
+        assert encodings == [None, "zlib", "blob", "blob"]  # User messages stay searchable
+        assert db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 1
+        assert db.execute("SELECT encoding FROM events").fetchone()[0] == "blob"
+
+
+@pytest.mark.asyncio
+async def test_request_prompts_share_prefix_and_rebuild_exactly(tmp_path):
+    import json
+
+    db_path = str(tmp_path / "test.db")
+    storage = SQLite(db_path)
+    system = {"role": "system", "content": "You are helpful. " * 200}
+    prompt: list[dict[str, str]] = [system]
+    saved: list[str] = []
+    for i in range(10):
+        prompt.append({"role": "user", "content": f"turn {i} ✓"})
+        saved.append(json.dumps(prompt))
+        await storage.save_request("conv", "user1", saved[-1], f"reply {i}", 100.0 + i)
+    await storage.save_request("conv", "user1", "not json {", None, 200.0)
+
+    requests = await storage.load_requests("conv")
+    assert [r["messages"] for r in requests] == [*saved, "not json {"]
+    assert requests[3]["response"] == "reply 3"
+
+    # Stored prefixes are looked up, not recompressed
+    compress = Mock(wraps=zlib.compress)
+    with patch("cogency.lib.sqlite.zlib.compress", compress):
+        await storage.save_request("conv", "user1", saved[-1], None, 300.0)
+    compress.assert_not_called()
+
+    with DB.connect(db_path) as db:
+        # One link and one blob per distinct message: linear, not quadratic
+        assert db.execute("SELECT COUNT(*) FROM prompt_links").fetchone()[0] == 11
+        assert db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 11
+        db.execute("DELETE FROM events WHERE timestamp < 105")
+        collect_blobs(db)
+        assert db.execute("SELECT COUNT(*) FROM prompt_links").fetchone()[0] == 11
+        db.execute("DELETE FROM events")
+        collect_blobs(db)
+        assert db.execute("SELECT COUNT(*) FROM prompt_links").fetchone()[0] == 0
+        assert db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 0
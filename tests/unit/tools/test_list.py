@@ -1,9 +1,12 @@
+import importlib
 from pathlib import Path
 
 import pytest
 
 from cogency.tools import ls
 
+list_module = importlib.import_module("cogency.tools.list")
+
 
 @pytest.fixture
 def setup_test_dir(tmp_path):
@@ -205,3 +208,40 @@ async def test_rejects_traversal_in_project(tmp_path):
     result = await ls.execute(path="../../../etc", sandbox_dir=str(tmp_path), access="project")
     assert result.error is True
     assert "Invalid path" in result.outcome or "outside sandbox" in result.outcome
+
+
+# --- Output Caps ---
+
+
+@pytest.mark.asyncio
+async def test_caps_entries_per_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(list_module, "MAX_DIR_ENTRIES", 3)
+    (tmp_path / "sub").mkdir()
+    for i in range(5):
+        (tmp_path / f"f{i}.txt").write_text("x")
+
+    result = await ls.execute(path=str(tmp_path), access="system")
+
+    assert not result.error
+    assert result.content is not None
+    assert "sub/" in result.content
+    assert "f1.txt" in result.content
+    assert "f2.txt" not in result.content
+    assert "... 3 files not shown" in result.content
+    assert result.outcome == "Listed 3 items (1 dirs, 2 files)"
+
+
+@pytest.mark.asyncio
+async def test_stops_at_total_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(list_module, "MAX_TOTAL_ENTRIES", 4)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "file.txt").write_text("x")
+
+    result = await ls.execute(path=str(tmp_path), access="system")
+
+    assert not result.error
+    assert result.outcome.endswith("(truncated)")
+    assert result.content is not None
+    assert "c/" not in result.content
+    assert "Listing stopped at 4 entries" in result.content
@@ -1,3 +1,4 @@
+import importlib
 from pathlib import Path
 
 import pytest
@@ -62,3 +63,101 @@ async def test_read_file_not_found():
 
     assert result.error
     assert "not found" in result.outcome
+
+
+@pytest.fixture
+def small_limits(monkeypatch):
+    # cogency.tools re-exports the tool under the module's name
+    module = importlib.import_module("cogency.tools.read")
+    monkeypatch.setattr(module, "INDEX_STRIDE", 4)
+    monkeypatch.setattr(module, "MAX_READ_BYTES", 200)
+    monkeypatch.setattr(module, "HEAD_LINES", 3)
+    monkeypatch.setattr(module, "TAIL_LINES", 2)
+    return module
+
+
+@pytest.mark.asyncio
+async def test_read_pages_through_index(tmp_path: Path, small_limits):
+    file_path = tmp_path / "log.txt"
+    file_path.write_text("".join(f"Line {i}\r\n" for i in range(50)))
+
+    for start in (0, 3, 4, 5, 17, 48):
+        result = await read.execute(file=str(file_path), start=start, lines=2, access="system")
+        expected = [f"{i}: Line {i}" for i in range(start, min(start + 2, 50))]
+        assert (result.content or "").splitlines() == expected
+
+    beyond = await read.execute(file=str(file_path), start=50, access="system")
+    assert beyond.outcome == f"Read {file_path!s} (0 lines)"
+
+    # Open-ended pages stop at MAX_READ_BYTES and say where to continue
+    rest = await read.execute(file=str(file_path), start=10, access="system")
+    assert "Continue with start=" in (rest.content or "")
+
+    # The index is rebuilt when the file changes
+    file_path.write_text("".join(f"Row {i}\n" for i in range(50)))
+    changed = await read.execute(file=str(file_path), start=21, lines=1, access="system")
+    assert changed.content == "21: Row 21"
+
+
+@pytest.mark.asyncio
+async def test_read_pages_count_newlines_only(tmp_path: Path, small_limits):
+    # Form feeds and Unicode line separators are content, not line breaks
+    file_path = tmp_path / "odd.txt"
+    file_path.write_text("".join(f"a{i}\x0cb\u2028c\n" for i in range(10)), encoding="utf-8")
+
+    seen: list[str] = []
+    start = 0
+    while start < 10:
+        result = await read.execute(file=str(file_path), start=start, lines=3, access="system")
+        page = (result.content or "").split("\n")
+        assert result.outcome.endswith(f"({len(page)} lines)")
+        seen.extend(page)
+        start += len(page)
+
+    assert seen == [f"{i}: a{i}\x0cb\u2028c" for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_read_large_file_returns_head_and_tail(tmp_path: Path, small_limits):
+    file_path = tmp_path / "log.txt"
+    file_path.write_text("".join(f"Line {i}\n" for i in range(100)))
+
+    result = await read.execute(file=str(file_path), access="system")
+
+    lines = (result.content or "").splitlines()
+    assert result.outcome == f"Read {file_path!s} (100 lines)"
+    assert lines[:3] == ["0: Line 0", "1: Line 1", "2: Line 2"]
+    assert "showing lines 0-2 and 98-99" in lines[3]
+    assert lines[4:] == ["98: Line 98", "99: Line 99"]
+
+
+@pytest.mark.asyncio
+async def test_read_output_stays_within_limit(tmp_path: Path, small_limits):
+    # Line numbers and hints count against MAX_READ_BYTES, not just the file's bytes
+    file_path = tmp_path / "short.txt"
+    file_path.write_text("".join(f"{i % 10}\n" for i in range(500)))
+
+    start, seen = 0, 0
+    while start < 500:
+        result = await read.execute(file=str(file_path), start=start, access="system")
+        content = result.content or ""
+        assert len(content.encode()) <= small_limits.MAX_READ_BYTES
+        page = [line for line in content.split("\n") if not line.startswith("[Truncated")]
+        assert page[0] == f"{start}: {start % 10}"
+        seen += len(page)
+        start += len(page)
+    assert seen == 500
+
+    whole = await read.execute(file=str(file_path), access="system")
+    assert len((whole.content or "").encode()) <= small_limits.MAX_READ_BYTES
+
+
+@pytest.mark.asyncio
+async def test_read_rejects_binary_tail(tmp_path: Path, small_limits):
+    file_path = tmp_path / "dump.log"
+    file_path.write_bytes(b"text line\n" * 2000 + b"\x00\x01\xff" * 100)
+
+    result = await read.execute(file=str(file_path), access="system")
+
+    assert result.error
+    assert "binary" in result.outcome
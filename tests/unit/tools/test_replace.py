@@ -1,3 +1,4 @@
+import importlib
 from pathlib import Path
 
 import pytest
@@ -159,6 +160,26 @@ async def test_replace_regex_single_file_multiple_occurrences(setup_files):
     assert "Hello Python" not in file_path.read_text()
 
 
+@pytest.mark.asyncio
+async def test_replace_identity_leaves_files_untouched(setup_files):
+    file_path = setup_files["file1"]
+    mtime = file_path.stat().st_mtime_ns
+
+    result = await replace.execute(
+        pattern="**/*",
+        old=r"Hello (World)",
+        new=r"Hello \1",
+        exact=False,
+        sandbox_dir=str(setup_files["root"]),
+        access="sandbox",
+    )
+
+    assert not result.error
+    assert "Changed 0 files" in result.outcome
+    assert result.content == ""
+    assert file_path.stat().st_mtime_ns == mtime
+
+
 @pytest.mark.asyncio
 async def test_replace_regex_version_update(setup_files):
     file_path = setup_files["file3"]
@@ -338,6 +359,40 @@ async def test_replace_returns_diff_content(setup_files):
     assert "+import sys" in result.content
 
 
+@pytest.mark.asyncio
+async def test_replace_commit_failure_restores_written_files(setup_files, monkeypatch):
+    # cogency.tools re-exports the tool under the module's name
+    replace_module = importlib.import_module("cogency.tools.replace")
+
+    root = setup_files["root"]
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (root / name).write_text(f"{name} old\r\n")
+    real_write = replace_module._write_atomic
+    writes: list[str] = []
+
+    def flaky_write(path, content):
+        writes.append(path.name)
+        if len(writes) == 2:
+            raise OSError("disk full")
+        real_write(path, content)
+
+    monkeypatch.setattr(replace_module, "_write_atomic", flaky_write)
+    result = await replace.execute(
+        pattern="?.txt",
+        old="old",
+        new="new",
+        exact=True,
+        sandbox_dir=str(root),
+        access="sandbox",
+    )
+
+    assert result.error
+    assert "disk full" in result.outcome
+    for name in ("a.txt", "b.txt", "c.txt"):
+        assert (root / name).read_bytes() == f"{name} old\r\n".encode()  # Line endings kept
+    assert not [p for p in root.iterdir() if p.suffix in {".tmp", ".bak"}]
+
+
 # --- Access Scope Denial ---
 
 
@@ -1,9 +1,59 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from cogency.lib import http
 from cogency.tools import scrape
 
+PAGE = "<html><body><p>Test content</p></body></html>"
+
+
+class _Site(BaseHTTPRequestHandler):
+    """Stand-in web server: /page carries an ETag, /big* are 4 KB, anything else is a 404."""
+
+    requests: list[dict[str, str]] = []
+
+    def do_GET(self):
+        type(self).requests.append({"path": self.path, **dict(self.headers)})
+        if self.path in ("/big", "/big-unsized"):
+            self.send_response(200)
+            if self.path == "/big":
+                self.send_header("Content-Length", "4096")
+            self.end_headers()
+            self.wfile.write(b"x" * 4096)  # Unsized: the body ends when the connection closes
+            return
+        if self.path != "/page":
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = PAGE.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setattr(http, "CACHE_DIR", tmp_path / "http")
+    _Site.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Site)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", _Site.requests
+    server.shutdown()
+    server.server_close()
+
 
 @pytest.fixture
 def mock_trafilatura():
@@ -15,18 +65,17 @@ def mock_trafilatura():
 
 
 @pytest.mark.asyncio
-async def test_scrapes_content(mock_trafilatura):
-    mock_trafilatura.fetch_url.return_value = "<html><body><p>Test content</p></body></html>"
+async def test_scrapes_content(site, mock_trafilatura):
+    base, _ = site
     mock_trafilatura.extract.return_value = "Test content"
 
-    result = await scrape.execute(url="http://example.com")
+    result = await scrape.execute(url=f"{base}/page")
 
     assert not result.error
-    assert "Scraped example.com" in result.outcome
+    assert "Scraped 127.0.0.1" in result.outcome
     assert result.content is not None
     assert "Test content" in result.content
-    mock_trafilatura.fetch_url.assert_called_once_with("http://example.com")
-    mock_trafilatura.extract.assert_called_once()
+    mock_trafilatura.extract.assert_called_once_with(PAGE, include_tables=True)
 
 
 @pytest.mark.asyncio
@@ -38,38 +87,70 @@ async def test_empty_url():
 
 
 @pytest.mark.asyncio
-async def test_fetch_failure(mock_trafilatura):
-    mock_trafilatura.fetch_url.return_value = None
+async def test_fetch_failure(site, mock_trafilatura):
+    base, _ = site
 
-    result = await scrape.execute(url="http://example.com")
+    result = await scrape.execute(url=f"{base}/missing")
 
     assert result.error
-    assert "Failed to fetch content from: http://example.com" in result.outcome
+    assert f"Failed to fetch content from: {base}/missing" in result.outcome
+    mock_trafilatura.extract.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_no_readable_content(mock_trafilatura):
-    mock_trafilatura.fetch_url.return_value = "<html><body></body></html>"
+async def test_no_readable_content(site, mock_trafilatura):
+    base, _ = site
     mock_trafilatura.extract.return_value = None
 
-    result = await scrape.execute(url="http://example.com")
+    result = await scrape.execute(url=f"{base}/page")
 
     assert not result.error
-    assert "Scraped example.com" in result.outcome
+    assert "Scraped 127.0.0.1" in result.outcome
     assert result.content is not None
     assert "No readable content found" in result.content
 
 
 @pytest.mark.asyncio
-async def test_truncation(mock_trafilatura):
+async def test_truncation(site, mock_trafilatura):
+    base, _ = site
     long_content = "a" * 5000  # Exceeds SCRAPE_LIMIT (3000)
-    mock_trafilatura.fetch_url.return_value = "<html><body>" + long_content + "</body></html>"
     mock_trafilatura.extract.return_value = long_content
 
-    result = await scrape.execute(url="http://example.com")
+    result = await scrape.execute(url=f"{base}/page")
 
     assert not result.error
-    assert "Scraped example.com" in result.outcome
+    assert "Scraped 127.0.0.1" in result.outcome
     assert result.content is not None
     assert len(result.content) < len(long_content)
     assert "[Content continues...]" in result.content
+
+
+@pytest.mark.asyncio
+async def test_cache_then_revalidate(site, mock_trafilatura, monkeypatch):
+    base, requests = site
+    mock_trafilatura.extract.return_value = "Test content"
+
+    await scrape.execute(url=f"{base}/page")
+    await scrape.execute(url=f"{base}/page")
+    assert len(requests) == 1  # Fresh on disk: no request
+
+    monkeypatch.setattr(http, "CACHE_TTL", 0)
+    response = await http.fetch(f"{base}/page")
+    assert len(requests) == 2
+    assert requests[1]["If-None-Match"] == '"v1"'
+    assert response.cached is True
+    assert response.text == PAGE
+    await http.close()
+
+
+@pytest.mark.asyncio
+async def test_refuses_oversized_pages(site, mock_trafilatura, monkeypatch):
+    base, _ = site
+    monkeypatch.setattr(http, "MAX_FETCH_BYTES", 1024)
+
+    for path in ("/big", "/big-unsized"):  # Declared length, then counted while streaming
+        result = await scrape.execute(url=f"{base}{path}")
+        assert result.error
+        assert "too large" in result.outcome
+    mock_trafilatura.extract.assert_not_called()
+    await http.close()
@@ -1,9 +1,31 @@
+import asyncio
+import importlib
 from unittest.mock import patch
 
 import pytest
 
 from cogency.tools import search
 
+search_module = importlib.import_module("cogency.tools.search")
+
+
+class StubBackend:
+    def __init__(self, hits):
+        self.hits = hits
+        self.queries: list[str] = []
+
+    async def search(self, query, limit):
+        self.queries.append(query)
+        await asyncio.sleep(0.01)
+        return self.hits[:limit]
+
+
+@pytest.fixture(autouse=True)
+def fresh_backend():
+    search_module.set_backend(search_module.DDGSBackend())  # New client, empty cache
+    yield
+    search_module.set_backend(None)
+
 
 @pytest.fixture
 def mock_ddgs():
@@ -54,3 +76,46 @@ async def test_ddgs_import_error():
 
         assert result.error
         assert "DDGS metasearch not available" in result.outcome
+
+
+@pytest.mark.asyncio
+async def test_stub_backend_cached_by_normalized_query():
+    backend = StubBackend([{"title": "Local", "body": "Indexed", "href": "file:///doc"}])
+    search_module.set_backend(backend)
+
+    first, second = await asyncio.gather(
+        search.execute(query="Local  Docs"), search.execute(query="local docs")
+    )
+    again = await search.execute(query="  LOCAL docs ")
+
+    assert first.content == second.content == again.content
+    assert "file:///doc" in (first.content or "")
+    assert backend.queries == ["Local  Docs"]  # One backend call, shared by all three
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_caller_spares_the_others():
+    backend = StubBackend([{"title": "Shared", "body": "Hit", "href": "http://shared"}])
+    search_module.set_backend(backend)
+
+    leader = asyncio.ensure_future(search.execute(query="shared"))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(search.execute(query="shared"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    result = await follower
+    assert "http://shared" in (result.content or "")
+    assert leader.cancelled()
+    assert backend.queries == ["shared"]
+
+
+@pytest.mark.asyncio
+async def test_empty_results_not_cached():
+    backend = StubBackend([])
+    search_module.set_backend(backend)
+
+    await search.execute(query="nothing")
+    await search.execute(query="nothing")
+
+    assert len(backend.queries) == 2
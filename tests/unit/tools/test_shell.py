@@ -34,8 +34,10 @@ async def test_sandbox_ignored_when_not_sandbox(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_timeout_enforcement():
-    result = await shell.execute(command="/bin/sleep 5", timeout=1, access="sandbox")
+async def test_timeout_enforcement(tmp_path):
+    result = await shell.execute(
+        command="/bin/sleep 5", timeout=1, sandbox_dir=str(tmp_path), access="sandbox"
+    )
 
     assert result.error
     assert result.outcome is not None
@@ -62,7 +64,9 @@ async def test_cwd_absolute_blocked_in_sandbox(tmp_path):
     subdir = tmp_path / "custom"
     subdir.mkdir()
 
-    result = await shell.execute(command="pwd", cwd=str(subdir), access="sandbox")
+    result = await shell.execute(
+        command="pwd", cwd=str(subdir), sandbox_dir=str(tmp_path / "sandbox"), access="sandbox"
+    )
 
     assert result.error
     assert "Path outside sandbox" in result.outcome